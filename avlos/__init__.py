@@ -1,14 +1,30 @@
-from avlos.unit_field import get_registry
+__all__ = ["get_registry", "__version__"]
+
+
+def __getattr__(name):
+    # Resolved lazily, so that importing avlos does not
+    # pull in pint, marshmallow or setuptools_scm
+    if name == "get_registry":
+        from avlos.unit_field import get_registry
 
-try:
-    from avlos._version import __version__
-except ImportError:
-    # Package is not installed, version will be determined from git
+        return get_registry
+    if name == "__version__":
+        global __version__
+        __version__ = _get_version()
+        return __version__
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _get_version():
     try:
-        from setuptools_scm import get_version
+        from avlos._version import __version__
 
-        __version__ = get_version(root="..", relative_to=__file__)
-    except (ImportError, LookupError):
-        __version__ = "unknown"
+        return __version__
+    except ImportError:
+        # Package is not installed, version will be determined from git
+        try:
+            from setuptools_scm import get_version
 
-__all__ = ["get_registry", "__version__"]
+            return get_version(root="..", relative_to=__file__)
+        except (ImportError, LookupError):
+            return "unknown"
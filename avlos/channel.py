@@ -1,6 +1,23 @@
+from contextlib import nullcontext
 from functools import cached_property
 
 
+def unwrap_channel(channel):
+    """
+    Get the channel behind transparent wrappers. A wrapper
+    that forwards every call to the channel it wraps,
+    including transactions, such as InstrumentedChannel,
+    exposes that channel as its inner attribute.
+    Arguments:
+        channel: the channel, possibly wrapped
+    Returns:
+        The first channel without an inner attribute
+    """
+    while getattr(channel, "inner", None) is not None:
+        channel = channel.inner
+    return channel
+
+
 class BaseChannel:
     """
     Base Channel class to be implemented by
@@ -11,10 +28,13 @@ class BaseChannel:
         """
         Send data to endpoint ep_id. Implement this to
         send data contained in the data byte array, to
-        the endpoint with id ep_id
+        the endpoint with id ep_id. The data may be any
+        bytes-like object, including a memoryview of a
+        buffer that is reused after send returns, so it
+        must be copied if it is kept.
         Arguments:
-            data: a bytearray containing the data to
-                  be sent
+            data: a bytes-like object containing the data
+                  to be sent
             ep_id: an integer representing the endpoint
                    ID to send to
         """
@@ -36,6 +56,132 @@ class BaseChannel:
         """
         raise NotImplementedError
 
+    def recv_into(self, ep_id, buffer, timeout=0.1):
+        """
+        Receive data from endpoint ep_id into a caller
+        supplied buffer. Override this to receive frames
+        without allocating, e.g. with socket.recv_into.
+        The default implementation copies the data
+        returned by recv.
+        Arguments:
+            ep_id: an integer representing the endpoint ID
+                   to listen to for data
+            buffer: a writable bytes-like object of at
+                    least max_packet_size bytes
+            timeout: an integer indicating a timeout for
+                     receiving any data
+        Returns:
+            The number of bytes received
+        """
+        data = self.recv(ep_id, timeout)
+        size = len(data)
+        buffer[:size] = data
+        return size
+
+    def send_many(self, requests):
+        """
+        Send several requests back to back. Override this
+        if the underlying transport can queue multiple
+        frames in a single operation. The default
+        implementation calls send for each request.
+        Arguments:
+            requests: an iterable of (data, ep_id) tuples
+        """
+        for data, ep_id in requests:
+            self.send(data, ep_id)
+
+    def recv_many(self, ep_ids, timeout=0.1):
+        """
+        Receive the responses of several endpoints, in the
+        order of ep_ids. Override this if the underlying
+        transport can collect multiple frames in a single
+        operation. The default implementation calls recv
+        for each endpoint.
+        Arguments:
+            ep_ids: an iterable of endpoint IDs to listen to
+            timeout: an integer indicating a timeout for
+                     receiving each response
+        Returns:
+            A list of bytearrays containing the received data
+        """
+        return [self.recv(ep_id, timeout) for ep_id in ep_ids]
+
+    def send_seq(self, data, ep_id, seq):
+        """
+        Send data to endpoint ep_id, tagged with a sequence
+        number. Override this if the transport can carry a
+        sequence number, e.g. in the CAN_SEQ_MASK bits of
+        the arbitration ID. The default implementation
+        ignores seq and calls send.
+        Arguments:
+            data: a bytearray containing the data to
+                  be sent
+            ep_id: an integer representing the endpoint
+                   ID to send to
+            seq: an integer sequence number
+        """
+        self.send(data, ep_id)
+
+    def recv_seq(self, ep_id, seq, timeout=0.1):
+        """
+        Receive the response of endpoint ep_id to the request
+        tagged with seq. Override together with send_seq.
+        The default implementation ignores seq and calls recv.
+        Arguments:
+            ep_id: an integer representing the endpoint ID
+                   to listen to for data
+            seq: the sequence number of the request
+            timeout: an integer indicating a timeout for
+                     receiving any data
+        Returns:
+            A bytearray containing the received data
+        """
+        return self.recv(ep_id, timeout)
+
+    def recv_frame(self, timeout=0.1):
+        """
+        Receive the next frame from any endpoint. Implement
+        this to use the channel with a DispatchingChannel,
+        which routes frames to their readers.
+        Arguments:
+            timeout: an integer indicating a timeout for
+                     receiving any data
+        Returns:
+            An (ep_id, data) tuple, or None if no frame was
+            received before the timeout
+        """
+        raise NotImplementedError
+
+    def transaction(self, *ep_ids):
+        """
+        Return a context manager that is held by remote
+        objects across a request to the endpoints ep_ids
+        and its response. Override this to guard
+        concurrent access, as LockingChannel does. The
+        default implementation does not lock.
+        Arguments:
+            ep_ids: the endpoint IDs taking part in the
+                    transaction
+        Returns:
+            A context manager
+        """
+        return nullcontext()
+
+    @property
+    def chunked_transfers(self):
+        """
+        Whether the transport carries chunked transfers, see
+        avlos.chunked. If so, values of string endpoints may
+        span several frames of max_packet_size bytes, tagged
+        with send_seq/recv_seq. Override this to return True,
+        e.g. with a class attribute, if the device implements
+        the chunked transfer scheme. By default each value is
+        sent in a single frame.
+        Returns:
+            A boolean, False by default
+        """
+        return False
+
     @cached_property
     def max_ep_id(self):
         """
@@ -65,3 +211,125 @@ class BaseChannel:
             The data codec instance
         """
         raise NotImplementedError
+
+
+class AsyncBaseChannel:
+    """
+    Base Channel class for asyncio clients, to be
+    implemented by the client. Used by the aget_value,
+    aset_value, acall and aread counterparts of the
+    blocking remote object API.
+    """
+
+    async def send(self, data, ep_id):
+        """
+        Send data to endpoint ep_id.
+        Arguments:
+            data: a bytearray containing the data to
+                  be sent
+            ep_id: an integer representing the endpoint
+                   ID to send to
+        """
+        raise NotImplementedError
+
+    async def recv(self, ep_id, timeout=0.1):
+        """
+        Receive data from endpoint ep_id. The implementation
+        should timeout after a period equal to timeout has
+        elapsed.
+        Arguments:
+            ep_id: an integer representing the endpoint ID
+                   to listen to for data
+            timeout: an integer indicating a timeout for
+                     receiving any data
+        Returns:
+            A bytearray containing the received data
+        """
+        raise NotImplementedError
+
+    async def send_many(self, requests):
+        """
+        Send several requests back to back. The default
+        implementation awaits send for each request.
+        Arguments:
+            requests: an iterable of (data, ep_id) tuples
+        """
+        for data, ep_id in requests:
+            await self.send(data, ep_id)
+
+    async def recv_many(self, ep_ids, timeout=0.1):
+        """
+        Receive the responses of several endpoints, in the
+        order of ep_ids. The default implementation awaits
+        recv for each endpoint.
+        Arguments:
+            ep_ids: an iterable of endpoint IDs to listen to
+            timeout: an integer indicating a timeout for
+                     receiving each response
+        Returns:
+            A list of bytearrays containing the received data
+        """
+        return [await self.recv(ep_id, timeout) for ep_id in ep_ids]
+
+    async def send_seq(self, data, ep_id, seq):
+        """
+        Send data to endpoint ep_id, tagged with a sequence
+        number. Override this if the transport can carry a
+        sequence number. The default implementation ignores
+        seq and awaits send.
+        Arguments:
+            data: a bytearray containing the data to
+                  be sent
+            ep_id: an integer representing the endpoint
+                   ID to send to
+            seq: an integer sequence number
+        """
+        await self.send(data, ep_id)
+
+    async def recv_seq(self, ep_id, seq, timeout=0.1):
+        """
+        Receive the response of endpoint ep_id to the request
+        tagged with seq. Override together with send_seq.
+        The default implementation ignores seq and awaits recv.
+        Arguments:
+            ep_id: an integer representing the endpoint ID
+                   to listen to for data
+            seq: the sequence number of the request
+            timeout: an integer indicating a timeout for
+                     receiving any data
+        Returns:
+            A bytearray containing the received data
+        """
+        return await self.recv(ep_id, timeout)
+
+    @property
+    def chunked_transfers(self):
+        """
+        Whether the transport carries chunked transfers, see
+        BaseChannel.chunked_transfers. False by default.
+        """
+        return False
+
+    @cached_property
+    def max_ep_id(self):
+        """
+        Get the max value that the endpoint can get for
+        this channel.
+        """
+        raise NotImplementedError
+
+    @cached_property
+    def max_packet_size(self):
+        """
+        Get the max size in bytes of the packet that this
+        channel can transmit/receive.
+        """
+        raise NotImplementedError
+
+    @cached_property
+    def serializer(self):
+        """
+        Return a data codec appropriate for this channel.
+        The codec itself is synchronous.
+        """
+        raise NotImplementedError
@@ -0,0 +1,108 @@
+"""
+Chunked transfer of payloads larger than one frame, such as
+strings. The payload is split in frames of max_packet_size
+bytes, each tagged with its chunk index as sequence number,
+and sent back to back without waiting for acknowledgement.
+A frame shorter than max_packet_size, which may be empty,
+ends the transfer. A payload shorter than one frame is thus
+sent as a single frame with sequence number 0.
+
+This matches the Avlos_Transfer helpers of the generated C
+code, and Node::send_chunked/recv_chunked of the generated
+C++ code. asend_chunks and arecv_chunks are the counterparts
+for an AsyncBaseChannel.
+"""
+
+from avlos.pipeline import DEFAULT_SEQ_SIZE
+
+MAX_CHUNKS = 1 << DEFAULT_SEQ_SIZE
+
+
+def split_chunks(data, size):
+    """
+    Split a payload in frames.
+
+    Args:
+        data: The payload, a bytes-like object
+        size: The max number of bytes per frame
+
+    Returns:
+        List of frames, the last of which is shorter than size
+    """
+    view = memoryview(data)
+    chunks = [view[offset : offset + size] for offset in range(0, len(view) + 1, size)]
+    if len(chunks) > MAX_CHUNKS:
+        raise ValueError("Payload of {} bytes exceeds {} frames".format(len(view), MAX_CHUNKS))
+    return chunks
+
+
+def send_chunks(channel, data, ep_id):
+    """
+    Send a payload to endpoint ep_id as a burst of frames.
+
+    Args:
+        channel: The BaseChannel to send to
+        data: The payload, a bytes-like object
+        ep_id: The endpoint ID
+    """
+    for seq, chunk in enumerate(split_chunks(data, channel.max_packet_size)):
+        channel.send_seq(chunk, ep_id, seq)
+
+
+def recv_chunks(channel, ep_id, timeout=0.1):
+    """
+    Receive and reassemble a payload from endpoint ep_id.
+
+    Args:
+        channel: The BaseChannel to receive from
+        ep_id: The endpoint ID
+        timeout: The timeout for receiving each frame
+
+    Returns:
+        The reassembled payload as bytes
+    """
+    size = channel.max_packet_size
+    payload = bytearray()
+    for seq in range(MAX_CHUNKS):
+        chunk = channel.recv_seq(ep_id, seq, timeout)
+        payload += chunk
+        if len(chunk) < size:
+            return bytes(payload)
+    raise ValueError("Payload of endpoint {} exceeds {} frames".format(ep_id, MAX_CHUNKS))
+
+
+async def asend_chunks(channel, data, ep_id):
+    """
+    Send a payload to endpoint ep_id as a burst of frames
+    over an AsyncBaseChannel.
+
+    Args:
+        channel: The AsyncBaseChannel to send to
+        data: The payload, a bytes-like object
+        ep_id: The endpoint ID
+    """
+    for seq, chunk in enumerate(split_chunks(data, channel.max_packet_size)):
+        await channel.send_seq(chunk, ep_id, seq)
+
+
+async def arecv_chunks(channel, ep_id, timeout=0.1):
+    """
+    Receive and reassemble a payload from endpoint ep_id
+    over an AsyncBaseChannel.
+
+    Args:
+        channel: The AsyncBaseChannel to receive from
+        ep_id: The endpoint ID
+        timeout: The timeout for receiving each frame
+
+    Returns:
+        The reassembled payload as bytes
+    """
+    size = channel.max_packet_size
+    payload = bytearray()
+    for seq in range(MAX_CHUNKS):
+        chunk = await channel.recv_seq(ep_id, seq, timeout)
+        payload += chunk
+        if len(chunk) < size:
+            return bytes(payload)
+    raise ValueError("Payload of endpoint {} exceeds {} frames".format(ep_id, MAX_CHUNKS))
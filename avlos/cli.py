@@ -10,16 +10,10 @@ Options:
 """
 
 import logging
-import urllib.request
 from typing import Dict
 
-import pkg_resources
-import yaml
 from docopt import docopt
 
-from avlos.deserializer import deserialize
-from avlos.processor import process_with_config_file
-
 shell_name = "Avlos"
 
 
@@ -27,8 +21,16 @@ def run_cli():
     """
     Runs the Avlos CLI
     """
-    version: str = pkg_resources.require("avlos")[0].version
-    arguments: Dict[str, str] = docopt(__doc__, version=shell_name + " " + str(version))
+    from avlos import __version__
+
+    arguments: Dict[str, str] = docopt(__doc__, version=shell_name + " " + str(__version__))
+
+    # Imported here so that --help and --version do not
+    # pay for loading the spec and generator machinery
+    import yaml
+
+    from avlos.deserializer import deserialize
+    from avlos.processor import process_with_config_file
 
     logger = configure_logging()
 
@@ -39,6 +41,8 @@ def run_cli():
             obj = deserialize(yaml.safe_load(device_desc_stream))
             process_with_config_file(obj, config_path, traverse_path=True)
     elif arguments["<spec_url>"]:
+        import urllib.request
+
         device_desc_string = urllib.request.urlopen(arguments["<spec_url>"]).read()
         obj = deserialize(yaml.safe_load(device_desc_string))
         process_with_config_file(obj, config_path, traverse_path=True)
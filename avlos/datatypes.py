@@ -35,6 +35,14 @@ class DataType(Enum):
     def size(self):
         return datatype_sizes[self]
 
+    @property
+    def struct_format(self):
+        return struct_format_map[self]
+
+    @property
+    def numpy_format(self):
+        return numpy_format_map[self]
+
     @property
     def is_void(self):
         return DataType.VOID == self
@@ -94,6 +102,38 @@ datatype_sizes = {
     DataType.STR: -1,
 }
 
+struct_format_map = {
+    DataType.VOID: "",
+    DataType.BOOL: "?",
+    DataType.INT8: "b",
+    DataType.UINT8: "B",
+    DataType.INT16: "h",
+    DataType.UINT16: "H",
+    DataType.INT32: "i",
+    DataType.UINT32: "I",
+    DataType.INT64: "q",
+    DataType.UINT64: "Q",
+    DataType.FLOAT: "f",
+    DataType.DOUBLE: "d",
+    DataType.STR: None,
+}
+
+numpy_format_map = {
+    DataType.VOID: None,
+    DataType.BOOL: "?",
+    DataType.INT8: "i1",
+    DataType.UINT8: "u1",
+    DataType.INT16: "<i2",
+    DataType.UINT16: "<u2",
+    DataType.INT32: "<i4",
+    DataType.UINT32: "<u4",
+    DataType.INT64: "<i8",
+    DataType.UINT64: "<u8",
+    DataType.FLOAT: "<f4",
+    DataType.DOUBLE: "<f8",
+    DataType.STR: None,
+}
+
 
 datatype_names = {
     "void": DataType.VOID,
@@ -1,3 +1,4 @@
+from avlos.definitions.endpoint_index import EndpointIndex
 from avlos.definitions.remote_attribute import RemoteAttribute
 from avlos.definitions.remote_bitmask import RemoteBitmask
 from avlos.definitions.remote_enum import RemoteEnum
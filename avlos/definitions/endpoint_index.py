@@ -0,0 +1,45 @@
+from types import MappingProxyType
+
+
+class EndpointIndex:
+    """
+    Immutable flat index of the endpoints of a device tree,
+    built in a single traversal. Endpoints are kept in tree
+    order, which is also the order of endpoint IDs.
+    """
+
+    def __init__(self, root):
+        """
+        Build the index of the tree under root.
+
+        Args:
+            root: The node whose descendants are indexed
+        """
+        endpoints = []
+
+        def traverse(nodes):
+            for node in nodes:
+                if hasattr(node, "getter_name") or hasattr(node, "setter_name") or hasattr(node, "caller_name"):
+                    endpoints.append(node)
+                elif hasattr(node, "remote_attributes"):
+                    traverse(node.remote_attributes.values())
+
+        traverse(root.remote_attributes.values())
+        by_ep_id = {}
+        by_name = {}
+        for ep in endpoints:
+            # Keep the first endpoint on conflicts, validation reports duplicates
+            by_ep_id.setdefault(ep.ep_id, ep)
+            by_name.setdefault(ep.full_name, ep)
+        self.endpoints = tuple(endpoints)
+        self.by_ep_id = MappingProxyType(by_ep_id)
+        self.by_name = MappingProxyType(by_name)
+        self.enums = tuple(ep for ep in endpoints if hasattr(ep, "options"))
+        self.bitmasks = tuple(ep for ep in endpoints if hasattr(ep, "bitmask"))
+        self.functions = tuple(ep for ep in endpoints if hasattr(ep, "caller_name"))
+
+    def __len__(self):
+        return len(self.endpoints)
+
+    def __iter__(self):
+        return iter(self.endpoints)
@@ -4,6 +4,7 @@ from avlos.mixins.func_attr_node import FuncAttrNode
 from avlos.mixins.impex_node import ImpexNode
 from avlos.mixins.meta_node import MetaNode
 from avlos.mixins.named_node import NamedNode
+from avlos.unit_field import to_magnitude
 
 
 class RemoteAttribute(CommNode, NamedNode, MetaNode, ImpexNode, FuncAttrNode):
@@ -46,13 +47,24 @@ class RemoteAttribute(CommNode, NamedNode, MetaNode, ImpexNode, FuncAttrNode):
             The deserialized value, optionally with unit attached
         """
         assert self.getter_name, "No getter function available"
-        self.channel.send([], self.ep_id)
-        data = self.channel.recv(self.ep_id)
-        value, *_ = self.channel.serializer.deserialize(data, self.dtype)
-        try:
-            return value * self.unit
-        except TypeError:
+        return self.read_data(self.decode_value)
+
+    def decode_value(self, data):
+        """
+        Deserialize raw data received from the remote endpoint.
+        Attaches the unit if the attribute has one, unless the root
+        node is in raw values mode.
+
+        Args:
+            data: The raw response data, as returned by the channel
+
+        Returns:
+            The deserialized value, optionally with unit attached
+        """
+        value = self.channel.serializer.deserialize(data, self.dtype)[0]
+        if self.unit is None or self.raw_values:
             return value
+        return get_registry().Quantity(value, self.unit)
 
     def set_value(self, __value):
         """
@@ -63,12 +75,44 @@ class RemoteAttribute(CommNode, NamedNode, MetaNode, ImpexNode, FuncAttrNode):
             __value: The value to set, optionally with units attached
         """
         assert self.setter_name, "No setter function available"
-        try:
-            __value = __value.to(self.unit).magnitude
-        except AttributeError:
-            pass
-        data = self.channel.serializer.serialize([__value], self.dtype)
-        self.channel.send(data, self.ep_id)
+        self.write_data(encode=lambda: self.encode_value(__value))
+
+    def encode_value(self, __value):
+        """
+        Serialize a value to be sent to the remote endpoint.
+        Converts units if necessary.
+
+        Args:
+            __value: The value to encode, optionally with units attached
+
+        Returns:
+            The serialized data, as accepted by the channel
+        """
+        data = self.serialize((to_magnitude(__value, self.unit),), self.dtype)
+        if self.chunked:
+            # The firmware setter expects a terminated string
+            data = bytes(data) + b"\0"
+        return data
+
+    async def aget_value(self):
+        """
+        Retrieve the current value from the remote endpoint over an AsyncBaseChannel.
+
+        Returns:
+            The deserialized value, optionally with unit attached
+        """
+        assert self.getter_name, "No getter function available"
+        return self.decode_value(await self.aread_data())
+
+    async def aset_value(self, __value):
+        """
+        Set a new value on the remote endpoint over an AsyncBaseChannel.
+
+        Args:
+            __value: The value to set, optionally with units attached
+        """
+        assert self.setter_name, "No setter function available"
+        await self.awrite_data(self.encode_value(__value))
 
     def set_value_with_string(self, __str_value):
         """
@@ -86,7 +130,18 @@ class RemoteAttribute(CommNode, NamedNode, MetaNode, ImpexNode, FuncAttrNode):
         Returns:
             A formatted string showing the attribute name, data type, and current value
         """
-        value = self.get_value()
+        return self.str_dump_value(self.get_value())
+
+    def str_dump_value(self, value):
+        """
+        Generate a formatted string representation of the attribute and the given value.
+
+        Args:
+            value: A value previously read from the attribute
+
+        Returns:
+            A formatted string showing the attribute name, data type, and value
+        """
         if isinstance(value, (int, float)):
             format_str = "{0} [{1}]: {2:.6g}"
         else:
@@ -47,9 +47,19 @@ class RemoteBitmask(CommNode, NamedNode, MetaNode, ImpexNode):
             The bitmask object representing the active flags
         """
         assert self.getter_name
-        self.channel.send([], self.ep_id)
-        data = self.channel.recv(self.ep_id)
-        value, *_ = self.channel.serializer.deserialize(data, self.flag_type)
+        return self.read_data(self.decode_value)
+
+    def decode_value(self, data):
+        """
+        Deserialize raw data received from the remote endpoint and convert it to the corresponding bitmask object.
+
+        Args:
+            data: The raw response data, as returned by the channel
+
+        Returns:
+            The bitmask object corresponding to the remote value
+        """
+        value = self.channel.serializer.deserialize(data, self.flag_type)[0]
         return self.bitmask(value)
 
     def set_value(self, __value):
@@ -61,6 +71,25 @@ class RemoteBitmask(CommNode, NamedNode, MetaNode, ImpexNode):
         """
         raise NotImplementedError
 
+    async def aget_value(self):
+        """
+        Retrieve the current bitmask value from the remote endpoint over an AsyncBaseChannel.
+
+        Returns:
+            The bitmask object representing the active flags
+        """
+        assert self.getter_name
+        return self.decode_value(await self.aread_data())
+
+    async def aset_value(self, __value):
+        """
+        Setting bitmask values is not currently supported.
+
+        Raises:
+            NotImplementedError: Always raised as this operation is not implemented
+        """
+        raise NotImplementedError
+
     def export_flags(self, namespace):
         """
         Export the members of the bitmask to the
@@ -90,10 +119,21 @@ class RemoteBitmask(CommNode, NamedNode, MetaNode, ImpexNode):
         Returns:
             A formatted string showing the attribute name and active flags, or indication of no flags
         """
-        val = self.get_value()
+        return self.str_dump_value(self.get_value())
+
+    def str_dump_value(self, value):
+        """
+        Generate a formatted string representation of the bitmask attribute and the given value.
+
+        Args:
+            value: A value previously read from the attribute
+
+        Returns:
+            A formatted string showing the attribute name and active flags, or indication of no flags
+        """
         return "{0}: {1}".format(
             self.name,
-            str(val) if val > 0 else "(no flags)",
+            str(value) if value > 0 else "(no flags)",
         )
 
     @property
@@ -47,9 +47,19 @@ class RemoteEnum(CommNode, NamedNode, MetaNode, ImpexNode):
             The enum member corresponding to the remote value
         """
         assert self.getter_name
-        self.channel.send([], self.ep_id)
-        data = self.channel.recv(self.ep_id)
-        value, *_ = self.channel.serializer.deserialize(data, self.enum_type)
+        return self.read_data(self.decode_value)
+
+    def decode_value(self, data):
+        """
+        Deserialize raw data received from the remote endpoint and convert it to the corresponding enum member.
+
+        Args:
+            data: The raw response data, as returned by the channel
+
+        Returns:
+            The enum member corresponding to the remote value
+        """
+        value = self.channel.serializer.deserialize(data, self.enum_type)[0]
         return self.options(value)
 
     def set_value(self, __value):
@@ -64,6 +74,21 @@ class RemoteEnum(CommNode, NamedNode, MetaNode, ImpexNode):
             ValueError: If the value cannot be converted to a valid enum member
         """
         assert self.setter_name
+        self.write_data(encode=lambda: self.encode_value(__value))
+
+    def encode_value(self, __value):
+        """
+        Serialize an enum value to be sent to the remote endpoint.
+
+        Args:
+            __value: The value to encode (int, enum member, or string name)
+
+        Returns:
+            The serialized data, as accepted by the channel
+
+        Raises:
+            ValueError: If the value cannot be converted to a valid enum member
+        """
         # Check if the value is already an integer and within the range of the enum
         if isinstance(__value, int) and __value in self.options._value2member_map_:
             value = __value
@@ -80,8 +105,27 @@ class RemoteEnum(CommNode, NamedNode, MetaNode, ImpexNode):
             raise ValueError(
                 f"Invalid value: {__value}. Expected an integer, an enum member, or a string corresponding to an enum member."
             )
-        data = self.channel.serializer.serialize([value], self.dtype)
-        self.channel.send(data, self.ep_id)
+        return self.serialize((value,), self.dtype)
+
+    async def aget_value(self):
+        """
+        Retrieve the current enum value from the remote endpoint over an AsyncBaseChannel.
+
+        Returns:
+            The enum member corresponding to the remote value
+        """
+        assert self.getter_name
+        return self.decode_value(await self.aread_data())
+
+    async def aset_value(self, __value):
+        """
+        Set a new enum value on the remote endpoint over an AsyncBaseChannel.
+
+        Args:
+            __value: The value to set (int, enum member, or string name)
+        """
+        assert self.setter_name
+        await self.awrite_data(self.encode_value(__value))
 
     def export_options(self, namespace):
         """
@@ -112,8 +156,19 @@ class RemoteEnum(CommNode, NamedNode, MetaNode, ImpexNode):
         Returns:
             A formatted string showing the attribute name and current enum member
         """
-        val = self.get_value()
-        return "{0}: {1}".format(self.name, str(val))
+        return self.str_dump_value(self.get_value())
+
+    def str_dump_value(self, value):
+        """
+        Generate a formatted string representation of the enum attribute and the given value.
+
+        Args:
+            value: A value previously read from the attribute
+
+        Returns:
+            A formatted string showing the attribute name and enum member
+        """
+        return "{0}: {1}".format(self.name, str(value))
 
     @property
     def endpoint_function_name(self) -> str:
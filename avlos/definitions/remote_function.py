@@ -1,3 +1,5 @@
+from functools import cached_property
+
 from marshmallow import Schema, fields, post_load
 
 from avlos.datatypes import DataTypeField
@@ -5,7 +7,7 @@ from avlos.mixins.comm_node import CommNode
 from avlos.mixins.func_attr_node import FuncAttrNode
 from avlos.mixins.meta_node import MetaNode
 from avlos.mixins.named_node import NamedNode
-from avlos.unit_field import UnitField
+from avlos.unit_field import UnitField, get_registry, to_magnitude
 
 
 class RemoteFunction(CommNode, NamedNode, MetaNode):
@@ -40,22 +42,74 @@ class RemoteFunction(CommNode, NamedNode, MetaNode):
         self.ep_id = ep_id
 
     def __call__(self, *args):
-        mags = []
-        for arg_val, arg_obj in zip(args, self.arguments):
-            try:
-                mags.append(arg_val.to(arg_obj.unit).magnitude)
-            except AttributeError:
-                mags.append(arg_val)
-        data = self.channel.serializer.serialize(mags, *[arg.dtype for arg in self.arguments])
-        self.channel.send(data, self.ep_id)
+        self.flush_writes()
+        value = None
+        # Arguments and return value may use the scratch buffer,
+        # so they are only handled while the transaction is held
+        with self.transaction(self.ep_id):
+            self.channel.send(self.encode_arguments(*args), self.ep_id)
+            if not self.dtype.is_void:
+                value = self.decode_value(self.recv_data())
+        if self.meta.get("reload_data", False):
+            # The device reloaded its data, e.g. after a reset
+            self.invalidate_cache()
+        return value
+
+    async def acall(self, *args):
+        """
+        Call the remote function over an AsyncBaseChannel.
+
+        Args:
+            *args: The function arguments, optionally with units attached
+
+        Returns:
+            The return value, optionally with unit attached, or None for void functions
+        """
+        await self.aflush_writes()
+        value = None
+        await self.asend_data(self.encode_arguments(*args))
         if not self.dtype.is_void:
-            data = self.channel.recv(self.ep_id)
-            value, *_ = self.channel.serializer.deserialize(data, self.dtype)
-            try:
-                return value * self.unit
-            except TypeError:
-                pass
+            value = self.decode_value(await self.arecv_data())
+        if self.meta.get("reload_data", False):
+            # The device reloaded its data, e.g. after a reset
+            self.invalidate_cache()
+        return value
+
+    def encode_arguments(self, *args):
+        """
+        Serialize function arguments, converting units if necessary.
+
+        Args:
+            *args: The function arguments, optionally with units attached
+
+        Returns:
+            The serialized data, as accepted by the channel
+        """
+        mags = [to_magnitude(arg_val, arg_obj.unit) for arg_val, arg_obj in zip(args, self.arguments)]
+        return self.serialize(mags, *self.arg_dtypes)
+
+    @cached_property
+    def arg_dtypes(self):
+        """
+        The tuple of argument datatypes, i.e. the signature used
+        by the codec to serialize the arguments.
+        """
+        return tuple(arg.dtype for arg in self.arguments)
+
+    def decode_value(self, data):
+        """
+        Deserialize the return value received from the remote function.
+
+        Args:
+            data: The raw response data, as returned by the channel
+
+        Returns:
+            The deserialized value, optionally with unit attached
+        """
+        value = self.channel.serializer.deserialize(data, self.dtype)[0]
+        if self.unit is None or self.raw_values:
             return value
+        return get_registry().Quantity(value, self.unit)
 
     def str_dump(self):
         return "{}({}) -> {}".format(
@@ -85,24 +85,137 @@ class RemoteNode(CommNode, NamedNode, ImpexNode):
             except AttributeError:
                 pass
 
-    def str_dump(self, indent, depth):
+    def resolve(self, path):
+        """
+        Find a descendant of this node by its dotted path.
+
+        Args:
+            path: Dotted path relative to this node, e.g. "controller.mode"
+
+        Returns:
+            The remote attribute, function or node at the given path
+
+        Raises:
+            AttributeError: If no descendant exists at the given path
+        """
+        node = self
+        for name in path.split("."):
+            try:
+                node = node.remote_attributes[name]
+            except (AttributeError, KeyError):
+                raise AttributeError(path)
+        return node
+
+    def readable_endpoints(self, depth=None):
+        """
+        Collect the endpoints with a getter in this node and its descendants.
+
+        Args:
+            depth: Optional number of node levels to descend into. Endpoints
+                   of this node are at depth 1. Defaults to the whole subtree.
+
+        Returns:
+            List of (relative path, endpoint) tuples in tree order
+        """
+        if depth is not None and depth <= 0:
+            return []
+        eps = []
+        for key, val in self.remote_attributes.items():
+            if isinstance(val, RemoteNode):
+                child_depth = None if depth is None else depth - 1
+                eps.extend((key + "." + path, ep) for path, ep in val.readable_endpoints(child_depth))
+            elif getattr(val, "getter_name", None):
+                eps.append((key, val))
+        return eps
+
+    def read_many(self, paths):
+        """
+        Read several remote attributes in a single batch. All requests
+        are sent before any response is collected.
+
+        Args:
+            paths: List of dotted paths relative to this node
+
+        Returns:
+            List of values, in the order of paths
+        """
+        return self.read_endpoints([self.resolve(path) for path in paths])
+
+    async def aread(self, paths):
+        """
+        Read several remote attributes in a single batch over an AsyncBaseChannel.
+
+        Args:
+            paths: List of dotted paths relative to this node
+
+        Returns:
+            List of values, in the order of paths
+        """
+        return await self.aread_endpoints([self.resolve(path) for path in paths])
+
+    def snapshot(self):
+        """
+        Read every readable attribute in this node and its descendants
+        in a single batch.
+
+        Returns:
+            Ordered dictionary mapping relative dotted paths to values
+        """
+        eps = self.readable_endpoints()
+        values = self.read_endpoints([ep for _, ep in eps])
+        return OrderedDict((path, value) for (path, _), value in zip(eps, values))
+
+    def subscribe(self, paths=None, rate_hz=10, callback=None, buffer_size=1024):
+        """
+        Read remote attributes periodically from a background thread.
+
+        Args:
+            paths: Optional list of dotted paths relative to this node.
+                   Defaults to all readable endpoints with the dynamic meta flag.
+            rate_hz: The number of reads per second
+            callback: Optional callable, called from the subscription thread
+                      with each (timestamp, values) sample
+            buffer_size: The max number of samples kept in the ring buffer
+
+        Returns:
+            The started Subscription. Call its stop method, or use it as a
+            context manager, to end it.
+        """
+        from avlos.subscription import Subscription
+
+        if paths is None:
+            endpoints = [(path, ep) for path, ep in self.readable_endpoints() if ep.meta.get("dynamic", False)]
+        else:
+            endpoints = [(path, self.resolve(path)) for path in paths]
+        subscription = Subscription(self, endpoints, rate_hz, callback, buffer_size)
+        subscription.start()
+        return subscription
+
+    def str_dump(self, indent, depth, values=None):
         """
         Generate a formatted string representation of the node and its children.
-        Recursively traverses child nodes up to the specified depth.
+        Recursively traverses child nodes up to the specified depth. The values of
+        all displayed attributes are read in a single batch.
 
         Args:
             indent: String used for indentation at the current level
             depth: Maximum recursion depth for displaying nested nodes
+            values: Optional dictionary of already read values keyed by endpoint
 
         Returns:
             Formatted multi-line string representation of the node hierarchy
         """
         if depth <= 0:
             return "..."
+        if values is None:
+            eps = [ep for _, ep in self.readable_endpoints(depth)]
+            values = dict(zip(eps, self.read_endpoints(eps)))
         lines = []
         for key, val in self.remote_attributes.items():
             if isinstance(val, RemoteNode):
-                val_str = indent + key + (": " if depth == 1 else ":\n") + val.str_dump(indent + "  ", depth - 1)
+                val_str = indent + key + (": " if depth == 1 else ":\n") + val.str_dump(indent + "  ", depth - 1, values)
+            elif val in values:
+                val_str = indent + val.str_dump_value(values[val])
             else:
                 val_str = indent + val.str_dump()
             lines.append(val_str)
@@ -117,6 +230,29 @@ class RemoteNode(CommNode, NamedNode, ImpexNode):
     def __dir__(self):
         return self.remote_attributes.keys()
 
+    def clone(self, parent=None):
+        """
+        Copy this node and its descendants for another device.
+
+        Args:
+            parent: The parent node of the copy, None for a root node
+
+        Returns:
+            The copy
+        """
+        clone = super().clone(parent)
+        children = OrderedDict((name, child.clone(clone)) for name, child in self.remote_attributes.items())
+        clone.__dict__["remote_attributes"] = children
+        return clone
+
+    def __getstate__(self):
+        return self.__dict__
+
+    def __setstate__(self, state):
+        # Restore state directly, as remote_attributes is not
+        # available to __getattr__ before this point
+        self.__dict__.update(state)
+
 
 class RemoteNodeSchema(Schema):
     """
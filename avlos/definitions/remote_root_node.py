@@ -1,8 +1,9 @@
+from contextlib import asynccontextmanager, contextmanager
 from functools import cached_property
 
 from marshmallow import fields, post_load
 
-from avlos.definitions import RemoteNode, RemoteNodeSchema
+from avlos.definitions import EndpointIndex, RemoteNode, RemoteNodeSchema
 
 
 class RootNode(RemoteNode):
@@ -11,6 +12,18 @@ class RootNode(RemoteNode):
     Extend from the RemoteNode class.
     """
 
+    # Set to True to skip Pint quantity construction on reads,
+    # e.g. in tight control loops
+    raw_values = False
+
+    # The ValueCache of the device, see enable_cache
+    value_cache = None
+
+    # The WriteBatch of the device while a batch is open
+    write_batch = None
+
+    _bound_state = RemoteNode._bound_state + ("endpoint_index", "value_cache", "write_batch")
+
     def __init__(self, version=None, *args, **kwargs):
         """
         Initialize a new instance of the RootNode.
@@ -32,6 +45,132 @@ class RootNode(RemoteNode):
         """
         return self
 
+    @cached_property
+    def endpoint_index(self):
+        """
+        Cached property that returns the flat index of all endpoints,
+        for lookups by endpoint ID or full name. Built on first access.
+
+        Returns:
+            EndpointIndex: The index of the endpoints of the device.
+        """
+        return EndpointIndex(self)
+
+    def enable_cache(self, ttl=0.0):
+        """
+        Enable the client-side value cache. Values of endpoints
+        without the dynamic meta flag are cached until written,
+        or until a function with the reload_data meta flag is
+        called. Values of dynamic endpoints are cached for ttl
+        seconds.
+
+        Args:
+            ttl (float, optional): Time in seconds to cache the values
+                of dynamic endpoints for. Defaults to 0, which disables
+                caching of dynamic endpoints.
+        """
+        from avlos.value_cache import ValueCache
+
+        self.value_cache = ValueCache(ttl)
+
+    def disable_cache(self):
+        """
+        Disable the client-side value cache.
+        """
+        self.__dict__.pop("value_cache", None)
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager that gathers the writes to the device and sends
+        them in a single burst on exit. Only the last write to each endpoint
+        is sent. Pending writes are flushed before any read or function call
+        within the batch, and discarded if the block raises. Nested batches
+        join the outermost batch.
+
+        Yields:
+            WriteBatch: The batch of pending writes.
+        """
+        if self.write_batch is not None:
+            yield self.write_batch
+            return
+        from avlos.write_batch import WriteBatch
+
+        self.write_batch = batch = WriteBatch(self)
+        try:
+            yield batch
+        except BaseException:
+            batch.discard()
+            raise
+        finally:
+            del self.write_batch
+        batch.flush()
+
+    @asynccontextmanager
+    async def abatch(self):
+        """
+        Asynchronous counterpart of batch, for an AsyncBaseChannel.
+        Pending writes are flushed before any read or function call
+        through the awaitable API within the batch.
+
+        Yields:
+            WriteBatch: The batch of pending writes.
+        """
+        if self.write_batch is not None:
+            yield self.write_batch
+            return
+        from avlos.write_batch import WriteBatch
+
+        self.write_batch = batch = WriteBatch(self)
+        try:
+            yield batch
+        except BaseException:
+            batch.discard()
+            raise
+        finally:
+            del self.write_batch
+        await batch.aflush()
+
+    def instrument(self):
+        """
+        Start collecting per-endpoint call counts, timings, timeouts and
+        bytes moved. Until then, no instrumentation code runs.
+
+        Returns:
+            Instrumentation: The attached instrumentation. Export its
+                statistics with to_dict or to_prometheus, and call its
+                detach method to stop.
+        """
+        from avlos.instrumentation import Instrumentation
+
+        instrumentation = Instrumentation()
+        instrumentation.attach(self)
+        return instrumentation
+
+    def resolve(self, path):
+        """
+        Find a descendant by its dotted path, looking endpoints
+        up in the endpoint index.
+
+        Args:
+            path: Dotted path, e.g. "controller.mode"
+
+        Returns:
+            The remote attribute, function or node at the given path
+        """
+        try:
+            return self.endpoint_index.by_name[path]
+        except KeyError:
+            return super().resolve(path)
+
+    def __getstate__(self):
+        # The index is rebuilt on demand, cached values are stale
+        state = dict(self.__dict__)
+        state.pop("endpoint_index", None)
+        state.pop("value_cache", None)
+        state.pop("write_batch", None)
+        return state
+
 
 class RootNodeSchema(RemoteNodeSchema):
     """
@@ -1,20 +1,117 @@
+import enum
 import hashlib
 import json
 
-from avlos.counter import make_counter
-from avlos.definitions import RootNodeSchema
+from avlos.counter import Counter, make_counter
+from avlos.datatypes import datatype_names
+from avlos.definitions import (
+    RemoteArgument,
+    RemoteAttribute,
+    RemoteBitmask,
+    RemoteEnum,
+    RemoteFunction,
+    RemoteNode,
+    RootNode,
+    RootNodeSchema,
+)
+from avlos.unit_field import get_registry
 
 
-def deserialize(device_description):
-    make_counter()
-    device_schema = RootNodeSchema()
-    device_obj = device_schema.load(device_description)
+def deserialize(device_description, cache_dir=None, validate=True):
+    """
+    Deserialize a device description into a tree of remote objects.
+
+    Args:
+        device_description: The device spec, as loaded from YAML
+        cache_dir: Optional directory of the compiled spec cache. If
+                   given, a spec that is already in the cache is loaded
+                   from there, and a new spec is added to it.
+        validate: Whether to validate the spec against the schema. Pass
+                  False only for trusted specs, to build the objects
+                  directly from the spec dictionary.
+
+    Returns:
+        The root node of the device
+    """
     dev_desc = json.dumps(device_description)
-    device_obj.hash_string = hash_string_from_string(dev_desc)
-    device_obj.hash_uint32 = hash_int_from_string(dev_desc)
+    hash_uint32 = hash_int_from_string(dev_desc)
+    if cache_dir is not None:
+        from avlos import spec_cache
+
+        device_obj = spec_cache.load(cache_dir, hash_uint32)
+        if device_obj is not None:
+            return device_obj
+    if validate:
+        make_counter()
+        device_schema = RootNodeSchema()
+        device_obj = device_schema.load(device_description)
+    else:
+        device_obj = fast_load(device_description)
+    device_obj.hash_string = hex(hash_uint32)
+    device_obj.hash_uint32 = hash_uint32
+    if cache_dir is not None:
+        try:
+            spec_cache.store(cache_dir, device_obj)
+        except OSError:
+            # The cache is an optimization, loading must not fail with it
+            pass
     return device_obj
 
 
+def fast_load(device_description):
+    """
+    Build the tree of remote objects directly from a trusted
+    device description, without schema validation. Produces
+    the same objects and endpoint IDs as the schema.
+
+    Args:
+        device_description: The device spec, as loaded from YAML
+
+    Returns:
+        The root node of the device
+    """
+    return _build_node(device_description, Counter(), RootNode)
+
+
+def _build_node(description, counter, node_class=RemoteNode):
+    data = {key: _field_converters.get(key, _identity)(value) for key, value in description.items()}
+    if "remote_attributes" in data:
+        data["remote_attributes"] = [_build_node(child, counter) for child in data["remote_attributes"]]
+        node = node_class(**data)
+        for child in node.remote_attributes.values():
+            child._parent = node
+        return node
+    # Same precedence as RemoteNodeSchema.make_remote_node
+    for key, endpoint_class in _endpoint_classes:
+        if key in data:
+            data["ep_id"] = counter.next()
+            return endpoint_class(**data)
+
+
+def _build_argument(description):
+    return RemoteArgument(**{key: _field_converters.get(key, _identity)(value) for key, value in description.items()})
+
+
+def _identity(value):
+    return value
+
+
+_field_converters = {
+    "dtype": datatype_names.__getitem__,
+    "unit": lambda value: get_registry().Unit(value),
+    "flags": lambda value: enum.IntFlag("flags", value),
+    "options": lambda value: enum.IntEnum("options", value, start=0),
+    "arguments": lambda value: [_build_argument(arg) for arg in value],
+}
+
+_endpoint_classes = [
+    ("caller_name", RemoteFunction),
+    ("dtype", RemoteAttribute),
+    ("flags", RemoteBitmask),
+    ("options", RemoteEnum),
+]
+
+
 def hash_string_from_string(input_string):
     return hex(hash_int_from_string(input_string))
 
@@ -0,0 +1,204 @@
+import time
+from collections import defaultdict, deque
+from threading import Condition
+
+from avlos.channel import BaseChannel
+
+
+class DispatchingChannel(BaseChannel):
+    """
+    Channel wrapper that reads frames from the wrapped
+    channel once, and routes them by endpoint ID to
+    per-endpoint queues and listeners. Concurrent readers
+    of different endpoints never drop each other's frames,
+    and the responses to several requests in flight to the
+    same endpoint are returned in order of arrival.
+
+    Frames are only queued for endpoints with a request
+    awaiting its response, or a reader waiting in recv.
+    Other frames, e.g. streamed to listeners, or replies
+    arriving after their request timed out, are passed to
+    the listeners only. Requests that get no response,
+    such as writes, are considered awaiting a response
+    for reply_timeout seconds.
+
+    The wrapped channel must implement recv_frame.
+    """
+
+    def __init__(self, channel, root=None, queue_size=16, reply_timeout=1.0):
+        """
+        Arguments:
+            channel: the BaseChannel instance to wrap
+            root: optional root node. If given, frames for
+                  endpoint IDs missing from its endpoint
+                  index are passed to the unsolicited frame
+                  handlers instead of being queued
+            queue_size: the max number of frames kept per
+                        endpoint
+            reply_timeout: the time in seconds after which a
+                           request without a response is no
+                           longer awaited
+        """
+        self.channel = channel
+        self.root = root
+        self.reply_timeout = reply_timeout
+        self._queues = defaultdict(lambda: deque(maxlen=queue_size))
+        # Deadlines of the requests awaiting a response, per endpoint
+        self._requests = defaultdict(deque)
+        self._waiting = defaultdict(int)
+        self._listeners = defaultdict(list)
+        self._unsolicited_handlers = []
+        self._cond = Condition()
+        self._reading = False
+
+    def add_listener(self, ep_id, callback):
+        """
+        Register a callback that is called with the data
+        of every frame received from endpoint ep_id
+        """
+        with self._cond:
+            self._listeners[ep_id].append(callback)
+
+    def remove_listener(self, ep_id, callback):
+        with self._cond:
+            self._listeners[ep_id].remove(callback)
+
+    def add_unsolicited_handler(self, callback):
+        """
+        Register a callback that is called with (ep_id, data)
+        for frames that do not belong to a known endpoint
+        """
+        with self._cond:
+            self._unsolicited_handlers.append(callback)
+
+    def send(self, data, ep_id):
+        self._add_request(ep_id)
+        self.channel.send(data, ep_id)
+
+    def recv(self, ep_id, timeout=0.1):
+        return self._recv(ep_id, timeout)
+
+    def _recv(self, ep_id, timeout, is_last=None):
+        # is_last tells from a frame whether it is the last
+        # response to its request, by default every frame is
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._waiting[ep_id] += 1
+            try:
+                while True:
+                    queue = self._queues.get(ep_id)
+                    if queue:
+                        data = queue.popleft()
+                        if is_last is None or is_last(data):
+                            self._pop_request(ep_id)
+                        return data
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        # A late response is no longer awaited
+                        self._pop_request(ep_id)
+                        raise TimeoutError("No response from endpoint {}".format(ep_id))
+                    if self._reading:
+                        # Another reader is receiving, and will notify
+                        # when it has routed a frame
+                        self._cond.wait(remaining)
+                    else:
+                        self._read_frame(remaining)
+            finally:
+                self._waiting[ep_id] -= 1
+
+    def send_seq(self, data, ep_id, seq):
+        # The frames of a chunked transfer make up a single request
+        if seq == 0:
+            self._add_request(ep_id)
+        self.channel.send_seq(data, ep_id, seq)
+
+    def recv_seq(self, ep_id, seq, timeout=0.1):
+        # Frames of an endpoint are queued in order of arrival,
+        # so the frames of a chunked transfer come in sequence.
+        # The request is awaited until its last, short frame.
+        try:
+            size = self.channel.max_packet_size
+        except NotImplementedError:
+            return self.recv(ep_id, timeout)
+        return self._recv(ep_id, timeout, lambda data: len(data) < size)
+
+    def poll(self, timeout=0.1):
+        """
+        Receive and route a single frame, e.g. to drive
+        listeners when there are no pending reads
+        """
+        with self._cond:
+            if not self._reading:
+                self._read_frame(timeout)
+
+    def _live_requests(self, ep_id):
+        # Called with the condition held
+        requests = self._requests.get(ep_id)
+        if requests is None:
+            return None
+        now = time.monotonic()
+        while requests and requests[0] <= now:
+            requests.popleft()
+        return requests
+
+    def _add_request(self, ep_id):
+        with self._cond:
+            if not self._live_requests(ep_id):
+                # Frames received before the request are stale
+                self._queues.pop(ep_id, None)
+            self._requests[ep_id].append(time.monotonic() + self.reply_timeout)
+
+    def _pop_request(self, ep_id):
+        # Called with the condition held
+        requests = self._live_requests(ep_id)
+        if requests:
+            requests.popleft()
+
+    def _read_frame(self, timeout):
+        # Called with the condition held. The lock is released
+        # while blocking on the wrapped channel, and while calling
+        # the callbacks, which may access the channel themselves.
+        self._reading = True
+        self._cond.release()
+        try:
+            frame = self.channel.recv_frame(timeout)
+        finally:
+            self._cond.acquire()
+            self._reading = False
+        callbacks = self._route(*frame) if frame is not None else []
+        self._cond.notify_all()
+        if callbacks:
+            self._cond.release()
+            try:
+                for callback, args in callbacks:
+                    callback(*args)
+            finally:
+                self._cond.acquire()
+
+    def _route(self, ep_id, data):
+        # Returns the callbacks to call with the frame
+        if self.root is not None and ep_id not in self.root.endpoint_index.by_ep_id:
+            return [(handler, (ep_id, data)) for handler in self._unsolicited_handlers]
+        requests = self._live_requests(ep_id)
+        # A waiting reader usually awaits the response to a request
+        awaited = max(len(requests or ()), self._waiting.get(ep_id, 0))
+        queue = self._queues.get(ep_id)
+        if awaited > len(queue or ()):
+            self._queues[ep_id].append(data)
+        return [(callback, (data,)) for callback in self._listeners.get(ep_id, ())]
+
+    @property
+    def chunked_transfers(self):
+        return self.channel.chunked_transfers
+
+    @property
+    def max_ep_id(self):
+        return self.channel.max_ep_id
+
+    @property
+    def max_packet_size(self):
+        return self.channel.max_packet_size
+
+    @property
+    def serializer(self):
+        return self.channel.serializer
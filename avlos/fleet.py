@@ -0,0 +1,124 @@
+from collections import OrderedDict
+from collections.abc import Mapping
+from contextlib import ExitStack
+
+from avlos.mixins.comm_node import _detach
+
+
+class Fleet:
+    """
+    A set of devices sharing a single parsed spec. Each
+    device is a lightweight copy of the spec tree, bound
+    to its own channel. The copies share all spec data,
+    such as data types, units and enums, so that the
+    spec is deserialized only once.
+    """
+
+    def __init__(self, spec, channels=None):
+        """
+        Args:
+            spec: The root node of a deserialized spec, used
+                  as a template. It is not bound to any channel.
+            channels: Optional mapping of device keys, e.g. node
+                      IDs, to channels
+        """
+        self.spec = spec
+        self.devices = OrderedDict()
+        for key, channel in (channels or {}).items():
+            self.add(key, channel)
+
+    def add(self, key, channel):
+        """
+        Add a device to the fleet.
+
+        Args:
+            key: A key identifying the device, e.g. its node ID
+            channel: The channel of the device
+
+        Returns:
+            The root node of the new device
+        """
+        device = self.spec.clone()
+        device.set_channel(channel)
+        self.devices[key] = device
+        return device
+
+    def remove(self, key):
+        """
+        Remove a device from the fleet.
+
+        Args:
+            key: The key of the device
+        """
+        del self.devices[key]
+
+    def __getitem__(self, key):
+        return self.devices[key]
+
+    def __contains__(self, key):
+        return key in self.devices
+
+    def __iter__(self):
+        return iter(self.devices)
+
+    def __len__(self):
+        return len(self.devices)
+
+    def read(self, path):
+        """
+        Read the same remote attribute of every device. All
+        requests are sent before any response is collected,
+        so that the transfers overlap on the bus. As with
+        get_value, pending writes of an open batch are sent
+        first, and cached values are not requested.
+
+        Args:
+            path: Dotted path of the attribute, e.g. "controller.mode"
+
+        Returns:
+            Ordered dictionary mapping device keys to values
+        """
+        endpoints = self._resolve(path)
+        values = {}
+        missing = []
+        for key, ep in endpoints.items():
+            assert ep.getter_name, "No getter function available"
+            ep.flush_writes()
+            cache = ep.value_cache
+            data = cache.get(ep) if cache is not None else None
+            if data is None:
+                missing.append((key, ep))
+            else:
+                values[key] = ep.decode_value(data)
+        with ExitStack() as stack:
+            for _, ep in missing:
+                stack.enter_context(ep.transaction(ep.ep_id))
+            for _, ep in missing:
+                ep.channel.send([], ep.ep_id)
+            for key, ep in missing:
+                data = ep.recv_data()
+                cache = ep.value_cache
+                if cache is not None:
+                    cache.put(ep, _detach(data))
+                values[key] = ep.decode_value(data)
+        return OrderedDict((key, values[key]) for key in endpoints)
+
+    def write(self, path, values):
+        """
+        Write the same remote attribute of several devices
+        with set_value. Writes to a device with an open batch
+        are sent when its batch is flushed.
+
+        Args:
+            path: Dotted path of the attribute, e.g. "controller.mode"
+            values: Mapping of device keys to values, or a single
+                    value to write to every device
+        """
+        endpoints = self._resolve(path)
+        if not isinstance(values, Mapping):
+            values = dict.fromkeys(endpoints, values)
+        for key, value in values.items():
+            endpoints[key].set_value(value)
+
+    def _resolve(self, path):
+        return OrderedDict((key, device.resolve(path)) for key, device in self.devices.items())
@@ -2,13 +2,30 @@
 Code formatting utilities for generated code.
 """
 
+import os
 import shutil
 import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+# Max number of files per clang-format call, keeping command lines short
+MAX_BATCH_SIZE = 64
+
+# Timeout per formatted file, in seconds
+TIMEOUT = 10
+
+
+@lru_cache(maxsize=None)
+def clang_format_path() -> Optional[str]:
+    """Find clang-format on the system. The result is cached."""
+    return shutil.which("clang-format")
 
 
 def is_clang_format_available() -> bool:
     """Check if clang-format is installed on the system."""
-    return shutil.which("clang-format") is not None
+    return clang_format_path() is not None
 
 
 def format_c_code(file_path: str, style: str = "LLVM") -> bool:
@@ -22,30 +39,137 @@ def format_c_code(file_path: str, style: str = "LLVM") -> bool:
     Returns:
         True if formatting succeeded, False if clang-format not available or failed
     """
+    return format_files([file_path], style)[file_path]
+
+
+def format_c_source(source: str, file_path: str, style: str = "LLVM") -> Optional[str]:
+    """
+    Format C/C++ source code in memory using clang-format.
+
+    Args:
+        source: The code to format
+        file_path: Path the code will be written to, from which clang-format
+                   infers the language
+        style: clang-format style
+
+    Returns:
+        The formatted code, or None if clang-format is not available or failed
+    """
     if not is_clang_format_available():
-        return False
+        return None
 
     try:
         result = subprocess.run(
-            ["clang-format", "-i", f"--style={style}", file_path], capture_output=True, timeout=10, check=False
+            [clang_format_path(), f"--style={style}", f"--assume-filename={file_path}"],
+            input=source,
+            capture_output=True,
+            text=True,
+            timeout=TIMEOUT,
+            check=False,
         )
-        return result.returncode == 0
     except (subprocess.TimeoutExpired, subprocess.SubprocessError):
-        return False
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout
 
 
-def format_files(file_paths: list, style: str = "LLVM") -> dict:
+def format_files(file_paths: list, style: str = "LLVM", max_workers: Optional[int] = None) -> dict:
     """
-    Format multiple C/C++ files.
+    Format multiple C/C++ files in place. The files are split
+    in batches, each formatted by a single clang-format call,
+    and the batches run in parallel.
 
     Args:
         file_paths: List of file paths to format
         style: clang-format style
+        max_workers: Max number of concurrent clang-format calls,
+                     by default the number of CPUs
 
     Returns:
         Dictionary mapping file path to success status
     """
+    if not is_clang_format_available():
+        return {path: False for path in file_paths}
+    results = {}
+    batches = _batches(list(file_paths), max_workers)
+    with ThreadPoolExecutor(max_workers=max(len(batches), 1)) as executor:
+        for batch_results in executor.map(lambda batch: _format_batch(batch, style), batches):
+            results.update(batch_results)
+    return results
+
+
+def format_c_sources(sources: Dict[str, str], style: str = "LLVM", max_workers: Optional[int] = None) -> dict:
+    """
+    Format several C/C++ sources in memory, before they are written.
+    The sources are staged in a temporary directory under the file
+    names they will be written to, and formatted with format_files.
+    With the "file" style, which looks up .clang-format files next
+    to the outputs, each source is formatted on its own instead.
+
+    Args:
+        sources: Dictionary mapping the path each source will be
+                 written to, to the source
+        style: clang-format style
+        max_workers: Max number of concurrent clang-format calls
+
+    Returns:
+        Dictionary mapping file path to the formatted source, or
+        to None if formatting failed
+    """
+    if not is_clang_format_available():
+        return {path: None for path in sources}
+    if style.startswith("file"):
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            formatted = executor.map(lambda item: format_c_source(item[1], item[0], style), sources.items())
+            return dict(zip(sources, formatted))
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="avlos-format-") as tmp_dir:
+        staged = {}
+        for index, (path, source) in enumerate(sources.items()):
+            # One directory per source, as outputs may share a file name
+            staged_path = os.path.join(tmp_dir, str(index), os.path.basename(path))
+            os.mkdir(os.path.dirname(staged_path))
+            with open(staged_path, "w") as staged_file:
+                staged_file.write(source)
+            staged[staged_path] = path
+        for staged_path, success in format_files(list(staged), style, max_workers).items():
+            if success:
+                with open(staged_path) as staged_file:
+                    results[staged[staged_path]] = staged_file.read()
+            else:
+                results[staged[staged_path]] = None
+    return results
+
+
+def _batches(file_paths: List[str], max_workers: Optional[int]) -> List[List[str]]:
+    """
+    Split files in as few batches as possible, one per worker,
+    with at most MAX_BATCH_SIZE files each
+    """
+    if not file_paths:
+        return []
+    workers = max_workers or os.cpu_count() or 1
+    count = max(min(workers, len(file_paths)), -(-len(file_paths) // MAX_BATCH_SIZE))
+    return [file_paths[index::count] for index in range(count)]
+
+
+def _format_batch(file_paths: List[str], style: str) -> Dict[str, bool]:
+    try:
+        result = subprocess.run(
+            [clang_format_path(), "-i", f"--style={style}", *file_paths],
+            capture_output=True,
+            timeout=TIMEOUT * len(file_paths),
+            check=False,
+        )
+    except (subprocess.TimeoutExpired, subprocess.SubprocessError):
+        return {path: False for path in file_paths}
+    if result.returncode == 0:
+        return {path: True for path in file_paths}
+    if len(file_paths) == 1:
+        return {file_paths[0]: False}
+    # Retry file by file, to find out which ones failed
     results = {}
     for path in file_paths:
-        results[path] = format_c_code(path, style)
+        results.update(_format_batch([path], style))
     return results
@@ -8,7 +8,8 @@ def avlos_endpoints(input) -> List:
     Traverse remote dictionary and return list of remote endpoints.
 
     Recursively walks the tree of RemoteNode objects and collects all endpoint
-    objects (those with getter_name, setter_name, or caller_name).
+    objects (those with getter_name, setter_name, or caller_name). For root
+    nodes, the cached endpoint index is used instead of walking the tree.
 
     Args:
         input: Root RemoteNode to traverse
@@ -16,6 +17,8 @@ def avlos_endpoints(input) -> List:
     Returns:
         Flat list of all endpoint objects found in the tree
     """
+    if hasattr(input, "endpoint_index"):
+        return list(input.endpoint_index.endpoints)
 
     def traverse_endpoint_list(ep_list, ep_out_list: List) -> None:
         """Helper function to recursively traverse endpoint tree."""
@@ -41,6 +44,8 @@ def avlos_enum_eps(input) -> List:
     Returns:
         List of RemoteEnum objects
     """
+    if hasattr(input, "endpoint_index"):
+        return list(input.endpoint_index.enums)
     return [ep for ep in avlos_endpoints(input) if hasattr(ep, "options")]
 
 
@@ -54,6 +59,8 @@ def avlos_bitmask_eps(input) -> List:
     Returns:
         List of RemoteBitmask objects
     """
+    if hasattr(input, "endpoint_index"):
+        return list(input.endpoint_index.bitmasks)
     return [ep for ep in avlos_endpoints(input) if hasattr(ep, "bitmask")]
 
 
@@ -1,131 +1,101 @@
 import os
-import sys
+from functools import lru_cache
 from pathlib import Path
 
 from jinja2 import Environment, PackageLoader, select_autoescape
 
-from avlos.formatting import format_c_code, is_clang_format_available
 from avlos.generators.filters import avlos_bitmask_eps, avlos_enum_eps, capitalize_first, file_from_path
-from avlos.validation import ValidationError, validate_all
+from avlos.incremental import IncrementalWriter
+from avlos.validation import validate_for_generation
 
-env = Environment(loader=PackageLoader("avlos"), autoescape=select_autoescape())
-
-
-def process(instance, config):
-    # Validate before generation
-    validation_errors = validate_all(instance)
-    if validation_errors:
-        error_msg = "Validation failed:\n" + "\n".join(f"  - {err}" for err in validation_errors)
-        raise ValidationError(error_msg)
 
+@lru_cache(maxsize=None)
+def get_env():
+    """
+    Create the Jinja environment on first use
+    """
+    env = Environment(loader=PackageLoader("avlos"), autoescape=select_autoescape())
     env.filters["enum_eps"] = avlos_enum_eps
     env.filters["bitmask_eps"] = avlos_bitmask_eps
     env.filters["file_from_path"] = file_from_path
     env.filters["capitalize_first"] = capitalize_first
-    process_helpers(instance, config)
-    process_header(instance, config)
-    process_impl(instance, config)
+    return env
 
 
-def process_helpers(instance, config):
-    template = env.get_template("tm_helpers.hpp.jinja")
-    file_path = config["paths"]["output_helpers"]
-    os.makedirs(os.path.dirname(config["paths"]["output_helpers"]), exist_ok=True)
-    with open(file_path, "w") as output_file:
-        print(
-            template.render(instance=instance),
-            file=output_file,
-        )
-    # Format the generated file
-    format_c_code(file_path, config.get("format_style", "LLVM"))
+def process(instance, config):
+    # Validate before generation
+    validate_for_generation(instance)
 
+    writer = IncrementalWriter(instance, config, "generator_cpp")
+    writer.render_many(render_jobs(instance, config), config.get("max_workers"))
+    writer.close()
 
-def process_header(instance, config):
-    template = env.get_template("device.hpp.jinja")
-    file_path = config["paths"]["output_header"]
-    helper_file = config["paths"]["output_helpers"]
-    try:
-        includes = config["header_includes"]
-    except KeyError:
-        includes = []
-    os.makedirs(os.path.dirname(config["paths"]["output_header"]), exist_ok=True)
-    with open(file_path, "w") as output_file:
-        print(
-            template.render(
-                instance=instance,
-                includes=includes,
-                helper_file=helper_file,
-                device_name=Path(config["paths"]["output_header"]).stem,
-            ),
-            file=output_file,
-        )
-    # Format the generated file
-    format_c_code(file_path, config.get("format_style", "LLVM"))
 
-    for attr in instance.remote_attributes.values():
-        if hasattr(attr, "remote_attributes"):
-            recurse_header(attr, config)
+def render_jobs(instance, config):
+    """
+    List the files to generate, one header and one implementation
+    for the device and for each of its nodes.
 
+    Args:
+        instance: The root node of the device
+        config: The generator config
 
-def recurse_header(remote_object, config):
-    template = env.get_template("remote_object.hpp.jinja")
-    file_path = os.path.join(
-        os.path.dirname(config["paths"]["output_header"]),
-        remote_object.name + ".hpp",
-    )
+    Returns:
+        List of (file path, template, template context) tuples
+    """
     helper_file = config["paths"]["output_helpers"]
-    os.makedirs(os.path.dirname(config["paths"]["output_header"]), exist_ok=True)
-    with open(file_path, "w") as output_file:
-        print(
-            template.render(instance=remote_object, helper_file=helper_file),
-            file=output_file,
-        )
-    # Format the generated file
-    format_c_code(file_path, config.get("format_style", "LLVM"))
-
-    for attr in remote_object.remote_attributes.values():
-        if hasattr(attr, "remote_attributes"):
-            recurse_header(attr, config)
-
-
-def process_impl(instance, config):
-    template = env.get_template("device.cpp.jinja")
-    file_path = config["paths"]["output_impl"]
+    device_name = Path(config["paths"]["output_header"]).stem
     try:
-        includes = config["impl_includes"]
+        header_includes = config["header_includes"]
     except KeyError:
-        includes = []
-    includes.append(Path(config["paths"]["output_header"]).name)
-    os.makedirs(os.path.dirname(config["paths"]["output_impl"]), exist_ok=True)
-    with open(file_path, "w") as output_file:
-        print(
-            template.render(
-                instance=instance,
-                includes=includes,
-                device_name=Path(config["paths"]["output_header"]).stem,
-            ),
-            file=output_file,
+        header_includes = []
+    try:
+        # Copied, so that the config is not modified
+        impl_includes = list(config["impl_includes"])
+    except KeyError:
+        impl_includes = []
+    impl_includes.append(Path(config["paths"]["output_header"]).name)
+
+    jobs = [
+        (helper_file, get_env().get_template("tm_helpers.hpp.jinja"), dict(instance=instance)),
+        (
+            config["paths"]["output_header"],
+            get_env().get_template("device.hpp.jinja"),
+            dict(instance=instance, includes=header_includes, helper_file=helper_file, device_name=device_name),
+        ),
+        (
+            config["paths"]["output_impl"],
+            get_env().get_template("device.cpp.jinja"),
+            dict(instance=instance, includes=impl_includes, device_name=device_name),
+        ),
+    ]
+    header_dir = os.path.dirname(config["paths"]["output_header"])
+    impl_dir = os.path.dirname(config["paths"]["output_impl"])
+    for remote_object in _subnodes(instance):
+        jobs.append(
+            (
+                os.path.join(header_dir, remote_object.name + ".hpp"),
+                get_env().get_template("remote_object.hpp.jinja"),
+                dict(instance=remote_object, helper_file=helper_file),
+            )
         )
-    # Format the generated file
-    format_c_code(file_path, config.get("format_style", "LLVM"))
-
-    for attr in instance.remote_attributes.values():
-        if hasattr(attr, "remote_attributes"):
-            recurse_impl(attr, config)
-
+        jobs.append(
+            (
+                os.path.join(impl_dir, remote_object.name + ".cpp"),
+                get_env().get_template("remote_object.cpp.jinja"),
+                dict(instance=remote_object),
+            )
+        )
+    return jobs
 
-def recurse_impl(remote_object, config):
-    template = env.get_template("remote_object.cpp.jinja")
-    file_path = os.path.join(
-        os.path.dirname(config["paths"]["output_impl"]),
-        remote_object.name + ".cpp",
-    )
-    os.makedirs(os.path.dirname(config["paths"]["output_impl"]), exist_ok=True)
-    with open(file_path, "w") as output_file:
-        print(template.render(instance=remote_object), file=output_file)
-    # Format the generated file
-    format_c_code(file_path, config.get("format_style", "LLVM"))
 
-    for attr in remote_object.remote_attributes.values():
+def _subnodes(node):
+    """
+    Collect the nodes below node that hold remote attributes, in tree order
+    """
+    nodes = []
+    for attr in node.remote_attributes.values():
         if hasattr(attr, "remote_attributes"):
-            recurse_impl(attr, config)
+            nodes.append(attr)
+            nodes.extend(_subnodes(attr))
+    return nodes
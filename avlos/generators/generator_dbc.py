@@ -1,16 +1,23 @@
 import os
+from functools import lru_cache
 
 from jinja2 import Environment, PackageLoader, select_autoescape
 
 from avlos.generators.filters import avlos_endpoints
 
-env = Environment(loader=PackageLoader("avlos"), autoescape=select_autoescape())
 
-
-def process(instance, config):
+@lru_cache(maxsize=None)
+def get_env():
+    """
+    Create the Jinja environment on first use
+    """
+    env = Environment(loader=PackageLoader("avlos"), autoescape=select_autoescape())
     env.filters["endpoints"] = avlos_endpoints
+    return env
 
-    template = env.get_template("device.dbc.jinja")
+
+def process(instance, config):
+    template = get_env().get_template("device.dbc.jinja")
     os.makedirs(os.path.dirname(config["paths"]["output_file"]), exist_ok=True)
     with open(config["paths"]["output_file"], "w") as output_file:
         print(
@@ -0,0 +1,278 @@
+"""
+Incremental writing of generated files. Each output directory
+holds a manifest recording, per output file, the hashes of the
+spec, template and generator config it was rendered from, and
+of the content that was written. Outputs whose inputs and
+content are unchanged are not rendered again, and files are
+only rewritten when their content changes, so that their
+modification times stay stable for downstream builds.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+import avlos
+from avlos.formatting import format_c_source, format_c_sources, is_clang_format_available
+
+MANIFEST_NAME = ".avlos-manifest.json"
+
+# Locks of the manifests being updated, by real directory path
+_manifest_locks = {}
+_manifest_locks_lock = Lock()
+
+
+def content_hash(content):
+    """
+    Get the hex SHA-256 digest of a string
+    """
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def write_if_changed(file_path, content):
+    """
+    Write content to a file, unless the file already holds
+    exactly that content.
+
+    Args:
+        file_path: Path of the file
+        content: The text to write
+
+    Returns:
+        True if the file was written, False if it was unchanged
+    """
+    try:
+        with open(file_path) as existing_file:
+            if existing_file.read() == content:
+                return False
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    with open(file_path, "w") as output_file:
+        output_file.write(content)
+    return True
+
+
+def _replace_if_changed(file_path, content):
+    """
+    Like write_if_changed, but the file is replaced atomically,
+    so that readers never see a partly written file
+    """
+    try:
+        with open(file_path) as existing_file:
+            if existing_file.read() == content:
+                return False
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+    directory = os.path.dirname(file_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=directory, prefix=MANIFEST_NAME, delete=False) as temp_file:
+        temp_file.write(content)
+    try:
+        os.replace(temp_file.name, file_path)
+    except OSError:
+        os.unlink(temp_file.name)
+        raise
+    return True
+
+
+def _load_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def _manifest_lock(directory):
+    key = os.path.realpath(directory)
+    with _manifest_locks_lock:
+        return _manifest_locks.setdefault(key, Lock())
+
+
+def _config_hash(config):
+    def default(obj):
+        # Configs loaded in code may hold sets of includes
+        if isinstance(obj, (set, frozenset)):
+            return sorted(obj)
+        return str(obj)
+
+    return content_hash(json.dumps(config, sort_keys=True, default=default))
+
+
+class IncrementalWriter:
+    """
+    Renders templates to files of a generator run, skipping
+    outputs that are up to date. Call close at the end of the
+    run to store the manifests. Files may be rendered from
+    several threads at once.
+
+    Several writers, e.g. of generators running concurrently,
+    may share an output directory. Each only updates the
+    manifest entries of its own files.
+    """
+
+    def __init__(self, instance, config, name=None):
+        """
+        Arguments:
+            instance: the root node of the device
+            config: the generator config
+            name: the name of the generator, recorded in the
+                  manifest entries. When given, entries of this
+                  generator for files it no longer renders are
+                  dropped on close.
+        """
+        self.spec_hash = getattr(instance, "hash_string", None)
+        self.config_hash = _config_hash(config)
+        self.format_style = config.get("format_style", "LLVM") if is_clang_format_available() else None
+        self.name = name
+        self.written = []
+        self.skipped = []
+        # The manifests as loaded, and the entries of this run
+        self._manifests = {}
+        self._entries = {}
+        self._template_hashes = {}
+        self._lock = Lock()
+
+    def render(self, file_path, template, **context):
+        """
+        Render a template to a file, unless the file is up to date.
+
+        Args:
+            file_path: Path of the output file
+            template: The Jinja template
+            context: The template variables
+
+        Returns:
+            True if the file was written
+        """
+        output = self._prepare(file_path, template, context)
+        if output is None:
+            return False
+        if self.format_style is not None:
+            output[-1] = self._formatted(file_path, output[-1], format_c_source(output[-1], file_path, self.format_style))
+        return self._store(*output)
+
+    def render_many(self, jobs, max_workers=None):
+        """
+        Render several files on a thread pool. Each file is
+        rendered independently, so the outputs do not depend
+        on the order in which the jobs complete. The rendered
+        files are then formatted in batches, and each is written
+        once, after formatting.
+
+        Args:
+            jobs: Iterable of (file_path, template, context dict) tuples
+            max_workers: The max number of threads, by default
+                         chosen by ThreadPoolExecutor
+
+        Returns:
+            List of whether each file was written, in job order
+
+        Raises:
+            The error of the first failed job, in job order
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            outputs = list(executor.map(lambda job: self._prepare(*job), jobs))
+        pending = [output for output in outputs if output is not None]
+        if self.format_style is not None and pending:
+            formatted = format_c_sources({output[0]: output[-1] for output in pending}, self.format_style, max_workers)
+            for output in pending:
+                output[-1] = self._formatted(output[0], output[-1], formatted[output[0]])
+        return [output is not None and self._store(*output) for output in outputs]
+
+    def close(self):
+        """
+        Store the manifests of the output directories. Each
+        manifest is read again and merged with the entries of
+        this run, so that the entries of other writers of the
+        directory are kept.
+        """
+        for directory, entries in self._entries.items():
+            with _manifest_lock(directory):
+                manifest = _load_manifest(directory)
+                if self.name is not None:
+                    for file_name, entry in list(manifest.items()):
+                        if entry.get("generator") == self.name and file_name not in entries:
+                            del manifest[file_name]
+                manifest.update(entries)
+                _replace_if_changed(
+                    os.path.join(directory, MANIFEST_NAME), json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+                )
+
+    def _prepare(self, file_path, template, context):
+        """
+        Render a template, unless its output is up to date.
+
+        Returns:
+            None if the output is up to date, otherwise a list of the
+            file path, manifest entry and unformatted content
+        """
+        entry = {
+            "spec": self.spec_hash,
+            "template": self._template_hash(template),
+            "config": self.config_hash,
+            "format": self.format_style,
+            "avlos": str(avlos.__version__),
+            "generator": self.name,
+        }
+        with self._lock:
+            previous = self._manifest(os.path.dirname(file_path)).get(os.path.basename(file_path))
+        if self.spec_hash is not None and previous is not None and all(previous.get(k) == v for k, v in entry.items()):
+            if previous.get("output") == _file_hash(file_path):
+                self._add_entry(file_path, previous)
+                self._record(self.skipped, file_path)
+                return None
+        return [file_path, entry, template.render(**context) + "\n"]
+
+    def _formatted(self, file_path, content, formatted):
+        if formatted is None:
+            print(f"Warning: clang-format failed for {file_path}", file=sys.stderr)
+            return content
+        return formatted
+
+    def _store(self, file_path, entry, content):
+        entry["output"] = content_hash(content)
+        self._add_entry(file_path, entry)
+        if write_if_changed(file_path, content):
+            self._record(self.written, file_path)
+            return True
+        self._record(self.skipped, file_path)
+        return False
+
+    def _record(self, paths, file_path):
+        with self._lock:
+            paths.append(file_path)
+
+    def _add_entry(self, file_path, entry):
+        with self._lock:
+            self._entries.setdefault(os.path.dirname(file_path), {})[os.path.basename(file_path)] = entry
+
+    def _manifest(self, directory):
+        try:
+            return self._manifests[directory]
+        except KeyError:
+            manifest = self._manifests[directory] = _load_manifest(directory)
+            return manifest
+
+    def _template_hash(self, template):
+        with self._lock:
+            try:
+                return self._template_hashes[template.name]
+            except KeyError:
+                source = template.environment.loader.get_source(template.environment, template.name)[0]
+                digest = self._template_hashes[template.name] = content_hash(source)
+                return digest
+
+
+def _file_hash(file_path):
+    try:
+        with open(file_path) as output_file:
+            return content_hash(output_file.read())
+    except (OSError, UnicodeDecodeError):
+        return None
@@ -0,0 +1,418 @@
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import nullcontext
+from threading import Lock
+
+from avlos.channel import AsyncBaseChannel, BaseChannel
+
+# Upper bounds in seconds of the response latency histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5)
+
+# Endpoint methods that are wrapped to time serialization
+_CODEC_METHODS = ("encode_value", "encode_arguments", "decode_value")
+
+# Cached properties that depend on the channel
+_CHANNEL_PROPERTIES = ("channel", "scratch_buffer", "chunked")
+
+_COUNTERS = (
+    ("requests", "Frames sent to the endpoint"),
+    ("responses", "Frames received from the endpoint"),
+    ("timeouts", "Receive timeouts of the endpoint"),
+    ("bytes_sent", "Payload bytes sent to the endpoint"),
+    ("bytes_received", "Payload bytes received from the endpoint"),
+    ("serialize_count", "Values serialized for the endpoint"),
+    ("deserialize_count", "Values deserialized from the endpoint"),
+    ("send_seconds", "Time spent sending to the endpoint"),
+    ("recv_seconds", "Time spent receiving from the endpoint"),
+    ("serialize_seconds", "Time spent serializing values of the endpoint"),
+    ("deserialize_seconds", "Time spent deserializing values of the endpoint"),
+)
+
+
+class EndpointStats:
+    """
+    Counters and timings of a single endpoint
+    """
+
+    __slots__ = tuple(name for name, _ in _COUNTERS) + ("latency_buckets",)
+
+    def __init__(self):
+        for name, _ in _COUNTERS:
+            setattr(self, name, 0)
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe_latency(self, seconds):
+        self.latency_buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def as_dict(self):
+        stats = {name: getattr(self, name) for name, _ in _COUNTERS}
+        bounds = LATENCY_BUCKETS + (float("inf"),)
+        stats["latency_buckets"] = dict(zip(bounds, self.latency_buckets))
+        return stats
+
+
+class Instrumentation:
+    """
+    Per-endpoint instrumentation of a device. While attached,
+    the channel of the device is wrapped in an InstrumentedChannel,
+    and the codec methods of its endpoints in timing wrappers.
+    Nothing is wrapped while detached, so that instrumentation
+    has no cost when it is not in use.
+    """
+
+    def __init__(self):
+        self.endpoints = defaultdict(EndpointStats)
+        self.names = {}
+        self.root = None
+        self._channel = None
+        self._lock = Lock()
+
+    def attach(self, root):
+        """
+        Start instrumenting a device.
+
+        Args:
+            root: The root node of the device
+        """
+        assert self.root is None, "Instrumentation already attached"
+        self.root = root
+        self.names = {ep_id: ep.full_name for ep_id, ep in root.endpoint_index.by_ep_id.items()}
+        self._channel = root._channel
+        if isinstance(self._channel, AsyncBaseChannel):
+            root._channel = AsyncInstrumentedChannel(self._channel, self)
+        else:
+            root._channel = InstrumentedChannel(self._channel, self)
+        _clear_channel_properties(root)
+        for ep in root.endpoint_index:
+            for method in _CODEC_METHODS:
+                if hasattr(ep, method):
+                    setattr(ep, method, self._timed(ep, method))
+
+    def detach(self):
+        """
+        Stop instrumenting the device, restoring its channel. The
+        collected statistics are kept.
+        """
+        root = self.root
+        if root is None:
+            return
+        for ep in root.endpoint_index:
+            for method in _CODEC_METHODS:
+                ep.__dict__.pop(method, None)
+        root._channel = self._channel
+        _clear_channel_properties(root)
+        self.root = None
+        self._channel = None
+
+    def reset(self):
+        """
+        Clear the collected statistics.
+        """
+        with self._lock:
+            self.endpoints.clear()
+
+    def record(self, ep_id, **increments):
+        with self._lock:
+            stats = self.endpoints[ep_id]
+            for name, value in increments.items():
+                setattr(stats, name, getattr(stats, name) + value)
+
+    def observe_latency(self, ep_id, seconds):
+        with self._lock:
+            stats = self.endpoints[ep_id]
+            stats.responses += 1
+            stats.recv_seconds += seconds
+            stats.observe_latency(seconds)
+
+    def to_dict(self):
+        """
+        Export the statistics.
+
+        Returns:
+            Dictionary mapping endpoint IDs to dictionaries of counters,
+            including the endpoint name and the latency histogram
+        """
+        with self._lock:
+            result = {}
+            for ep_id, stats in sorted(self.endpoints.items()):
+                result[ep_id] = dict(name=self.names.get(ep_id), **stats.as_dict())
+            return result
+
+    def to_prometheus(self, prefix="avlos"):
+        """
+        Export the statistics in the Prometheus text exposition format.
+
+        Args:
+            prefix: Prefix of the metric names
+
+        Returns:
+            The metrics as a string
+        """
+        with self._lock:
+            items = sorted(self.endpoints.items())
+            labels = {ep_id: 'ep_id="{}",name="{}"'.format(ep_id, self.names.get(ep_id, "")) for ep_id, _ in items}
+            lines = []
+            for counter, help_text in _COUNTERS:
+                metric = "{}_{}_total".format(prefix, counter)
+                lines.append("# HELP {} {}".format(metric, help_text))
+                lines.append("# TYPE {} counter".format(metric))
+                for ep_id, stats in items:
+                    lines.append("{}{{{}}} {}".format(metric, labels[ep_id], getattr(stats, counter)))
+            metric = "{}_response_latency_seconds".format(prefix)
+            lines.append("# HELP {} Time from receive call to response per endpoint".format(metric))
+            lines.append("# TYPE {} histogram".format(metric))
+            for ep_id, stats in items:
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), stats.latency_buckets):
+                    cumulative += count
+                    lines.append('{}_bucket{{{},le="{}"}} {}'.format(metric, labels[ep_id], bound, cumulative))
+                lines.append("{}_sum{{{}}} {}".format(metric, labels[ep_id], stats.recv_seconds))
+                lines.append("{}_count{{{}}} {}".format(metric, labels[ep_id], stats.responses))
+            return "\n".join(lines) + "\n"
+
+    def _timed(self, ep, method):
+        func = getattr(ep, method)
+        ep_id = ep.ep_id
+        if method == "decode_value":
+            time_name, count_name = "deserialize_seconds", "deserialize_count"
+        else:
+            time_name, count_name = "serialize_seconds", "serialize_count"
+
+        def timed(*args):
+            start = time.perf_counter()
+            result = func(*args)
+            self.record(ep_id, **{time_name: time.perf_counter() - start, count_name: 1})
+            return result
+
+        return timed
+
+
+class _ChannelProxy:
+    """
+    Attributes shared by the instrumented channel wrappers. Any
+    attribute beyond the channel API, e.g. submit of a
+    PipelinedChannel, is looked up on the wrapped channel.
+    """
+
+    def __init__(self, channel, instrumentation):
+        """
+        Arguments:
+            channel: the channel to wrap
+            instrumentation: the Instrumentation recording
+                             the statistics
+        """
+        self.channel = channel
+        self.instrumentation = instrumentation
+
+    def __getattr__(self, name):
+        if name == "channel":
+            # Not set yet, e.g. while unpickling
+            raise AttributeError(name)
+        return getattr(self.channel, name)
+
+    @property
+    def inner(self):
+        # The channel behind this transparent wrapper, see unwrap_channel
+        return self.channel
+
+    @property
+    def chunked_transfers(self):
+        # Duck-typed channels do not carry chunked transfers
+        return getattr(self.channel, "chunked_transfers", False)
+
+    @property
+    def max_ep_id(self):
+        return self.channel.max_ep_id
+
+    @property
+    def max_packet_size(self):
+        return self.channel.max_packet_size
+
+    @property
+    def serializer(self):
+        return self.channel.serializer
+
+    def _record_send(self, ep_id, data, seconds):
+        self.instrumentation.record(ep_id, requests=1, bytes_sent=_size(data), send_seconds=seconds)
+
+    def _record_recv(self, ep_id, data, seconds):
+        self.instrumentation.observe_latency(ep_id, seconds)
+        self.instrumentation.record(ep_id, bytes_received=_size(data))
+
+    def _record_timeouts(self, ep_ids):
+        for ep_id in ep_ids:
+            self.instrumentation.record(ep_id, timeouts=1)
+
+
+class InstrumentedChannel(_ChannelProxy, BaseChannel):
+    """
+    Channel wrapper recording the number of frames and bytes
+    moved, the time spent sending and receiving, and the
+    receive timeouts of each endpoint. Duck-typed channels
+    offering only send and recv are supported. Timings of
+    send_many and recv_many batches are split evenly across
+    the endpoints of the batch.
+    """
+
+    def __init__(self, channel, instrumentation):
+        """
+        Arguments:
+            channel: the channel to wrap
+            instrumentation: the Instrumentation recording
+                             the statistics
+        """
+        super().__init__(channel, instrumentation)
+        self._is_base = isinstance(channel, BaseChannel)
+
+    def send(self, data, ep_id):
+        start = time.perf_counter()
+        self.channel.send(data, ep_id)
+        self._record_send(ep_id, data, time.perf_counter() - start)
+
+    def recv(self, ep_id, timeout=0.1):
+        if self._is_base:
+            return self._timed_recv(ep_id, self.channel.recv, ep_id, timeout)
+        return self._timed_recv(ep_id, self.channel.recv, ep_id)
+
+    def recv_into(self, ep_id, buffer, timeout=0.1):
+        if not self._is_base:
+            return super().recv_into(ep_id, buffer, timeout)
+        start = time.perf_counter()
+        try:
+            size = self.channel.recv_into(ep_id, buffer, timeout)
+        except TimeoutError:
+            self._record_timeouts([ep_id])
+            raise
+        self._record_recv(ep_id, buffer[:size], time.perf_counter() - start)
+        return size
+
+    def send_many(self, requests):
+        # Timings of a batch are split evenly across its requests
+        if not self._is_base:
+            return super().send_many(requests)
+        requests = list(requests)
+        start = time.perf_counter()
+        self.channel.send_many(requests)
+        seconds = (time.perf_counter() - start) / max(len(requests), 1)
+        for data, ep_id in requests:
+            self._record_send(ep_id, data, seconds)
+
+    def recv_many(self, ep_ids, timeout=0.1):
+        if not self._is_base:
+            return super().recv_many(ep_ids, timeout)
+        ep_ids = list(ep_ids)
+        start = time.perf_counter()
+        try:
+            responses = self.channel.recv_many(ep_ids, timeout)
+        except TimeoutError:
+            self._record_timeouts(ep_ids)
+            raise
+        seconds = (time.perf_counter() - start) / max(len(ep_ids), 1)
+        for ep_id, data in zip(ep_ids, responses):
+            self._record_recv(ep_id, data, seconds)
+        return responses
+
+    def send_seq(self, data, ep_id, seq):
+        if not self._is_base:
+            return self.send(data, ep_id)
+        start = time.perf_counter()
+        self.channel.send_seq(data, ep_id, seq)
+        self._record_send(ep_id, data, time.perf_counter() - start)
+
+    def recv_seq(self, ep_id, seq, timeout=0.1):
+        if not self._is_base:
+            return self.recv(ep_id, timeout)
+        return self._timed_recv(ep_id, self.channel.recv_seq, ep_id, seq, timeout)
+
+    def transaction(self, *ep_ids):
+        if self._is_base:
+            return self.channel.transaction(*ep_ids)
+        return nullcontext()
+
+    def recv_frame(self, timeout=0.1):
+        return self.channel.recv_frame(timeout)
+
+    def _timed_recv(self, ep_id, func, *args):
+        start = time.perf_counter()
+        try:
+            data = func(*args)
+        except TimeoutError:
+            self._record_timeouts([ep_id])
+            raise
+        self._record_recv(ep_id, data, time.perf_counter() - start)
+        return data
+
+
+class AsyncInstrumentedChannel(_ChannelProxy, AsyncBaseChannel):
+    """
+    Counterpart of InstrumentedChannel wrapping an
+    AsyncBaseChannel. Times include the time spent
+    awaiting the wrapped channel.
+    """
+
+    async def send(self, data, ep_id):
+        start = time.perf_counter()
+        await self.channel.send(data, ep_id)
+        self._record_send(ep_id, data, time.perf_counter() - start)
+
+    async def recv(self, ep_id, timeout=0.1):
+        return await self._timed_recv(ep_id, self.channel.recv(ep_id, timeout))
+
+    async def send_many(self, requests):
+        requests = list(requests)
+        start = time.perf_counter()
+        await self.channel.send_many(requests)
+        seconds = (time.perf_counter() - start) / max(len(requests), 1)
+        for data, ep_id in requests:
+            self._record_send(ep_id, data, seconds)
+
+    async def recv_many(self, ep_ids, timeout=0.1):
+        ep_ids = list(ep_ids)
+        start = time.perf_counter()
+        try:
+            responses = await self.channel.recv_many(ep_ids, timeout)
+        except TimeoutError:
+            self._record_timeouts(ep_ids)
+            raise
+        seconds = (time.perf_counter() - start) / max(len(ep_ids), 1)
+        for ep_id, data in zip(ep_ids, responses):
+            self._record_recv(ep_id, data, seconds)
+        return responses
+
+    async def send_seq(self, data, ep_id, seq):
+        start = time.perf_counter()
+        await self.channel.send_seq(data, ep_id, seq)
+        self._record_send(ep_id, data, time.perf_counter() - start)
+
+    async def recv_seq(self, ep_id, seq, timeout=0.1):
+        return await self._timed_recv(ep_id, self.channel.recv_seq(ep_id, seq, timeout))
+
+    async def _timed_recv(self, ep_id, awaitable):
+        start = time.perf_counter()
+        try:
+            data = await awaitable
+        except TimeoutError:
+            self._record_timeouts([ep_id])
+            raise
+        self._record_recv(ep_id, data, time.perf_counter() - start)
+        return data
+
+
+def _size(data):
+    try:
+        return len(data)
+    except TypeError:
+        # Codecs of duck-typed channels may pass plain values
+        return 0
+
+
+def _clear_channel_properties(root):
+    nodes = [root]
+    while nodes:
+        node = nodes.pop()
+        for name in _CHANNEL_PROPERTIES:
+            node.__dict__.pop(name, None)
+        children = node.__dict__.get("remote_attributes")
+        if children is not None:
+            nodes.extend(children.values())
@@ -0,0 +1,108 @@
+from contextlib import ExitStack, contextmanager
+from threading import Lock, RLock
+
+from avlos.channel import BaseChannel
+
+
+class LockingChannel(BaseChannel):
+    """
+    Channel wrapper that makes a channel safe to share
+    between threads. Each endpoint, or any other
+    transaction key, has its own lock, so that requests
+    to independent endpoints proceed in parallel, while
+    the send/recv pairs of a single endpoint never
+    interleave.
+
+    The wrapped channel must be able to receive the
+    responses of different endpoints concurrently, e.g.
+    a DispatchingChannel.
+    """
+
+    def __init__(self, channel):
+        """
+        Arguments:
+            channel: the BaseChannel instance to wrap
+        """
+        self.channel = channel
+        self._locks = {}
+        self._locks_lock = Lock()
+        self._send_lock = Lock()
+
+    def lock(self, key):
+        """
+        Get the reentrant lock of a transaction key. Keys
+        are usually endpoint IDs, but any hashable value,
+        e.g. a transaction id, may be used.
+        Arguments:
+            key: the transaction key
+        Returns:
+            The RLock instance of the key
+        """
+        try:
+            return self._locks[key]
+        except KeyError:
+            with self._locks_lock:
+                return self._locks.setdefault(key, RLock())
+
+    @contextmanager
+    def transaction(self, *keys):
+        """
+        Hold the locks of keys for the duration of the
+        context. Locks are acquired in a fixed order, so
+        that overlapping transactions cannot deadlock.
+        Arguments:
+            keys: the transaction keys, usually endpoint IDs
+        """
+        with ExitStack() as stack:
+            for key in sorted(set(keys), key=repr):
+                stack.enter_context(self.lock(key))
+            yield
+
+    def send(self, data, ep_id):
+        # Frames of concurrent transactions must not be
+        # interleaved within a single transport call
+        with self._send_lock:
+            self.channel.send(data, ep_id)
+
+    def recv(self, ep_id, timeout=0.1):
+        return self.channel.recv(ep_id, timeout)
+
+    def recv_into(self, ep_id, buffer, timeout=0.1):
+        return self.channel.recv_into(ep_id, buffer, timeout)
+
+    def send_many(self, requests):
+        with self._send_lock:
+            self.channel.send_many(requests)
+
+    def recv_many(self, ep_ids, timeout=0.1):
+        return self.channel.recv_many(ep_ids, timeout)
+
+    def send_seq(self, data, ep_id, seq):
+        with self._send_lock:
+            self.channel.send_seq(data, ep_id, seq)
+
+    def recv_seq(self, ep_id, seq, timeout=0.1):
+        # The frames of a chunked transfer are received under
+        # the endpoint's lock, so that they are not taken by
+        # another transaction of the endpoint
+        with self.lock(ep_id):
+            return self.channel.recv_seq(ep_id, seq, timeout)
+
+    def recv_frame(self, timeout=0.1):
+        return self.channel.recv_frame(timeout)
+
+    @property
+    def chunked_transfers(self):
+        return self.channel.chunked_transfers
+
+    @property
+    def max_ep_id(self):
+        return self.channel.max_ep_id
+
+    @property
+    def max_packet_size(self):
+        return self.channel.max_packet_size
+
+    @property
+    def serializer(self):
+        return self.channel.serializer
@@ -1,7 +1,25 @@
+from contextlib import nullcontext
 from functools import cached_property
+from itertools import groupby
+
+from avlos.channel import AsyncBaseChannel, BaseChannel
 
 
 class CommNode:
+    # Cached properties and wrappers that depend on the device
+    # that a node is bound to, or on its position in the tree.
+    # They are recomputed on demand, and not copied by clone.
+    _bound_state = (
+        "parent",
+        "root",
+        "channel",
+        "scratch_buffer",
+        "chunked",
+        "encode_value",
+        "encode_arguments",
+        "decode_value",
+    )
+
     def __init__(self):
         self._parent = None
         self._channel = None
@@ -23,3 +41,421 @@ class CommNode:
 
     def set_channel(self, channel):
         self._channel = channel
+
+    @cached_property
+    def scratch_buffer(self):
+        """
+        Preallocated buffer of max_packet_size bytes, reused by this
+        endpoint to serialize and receive values. It is None unless the
+        channel is a BaseChannel with a known max_packet_size, and its
+        serializer implements serialize_into.
+        """
+        channel = self.channel
+        if not isinstance(channel, BaseChannel) or not hasattr(channel.serializer, "serialize_into"):
+            return None
+        try:
+            return memoryview(bytearray(channel.max_packet_size))
+        except NotImplementedError:
+            return None
+
+    @cached_property
+    def chunked(self):
+        """
+        Whether values of this endpoint are transferred in chunks that
+        may span several frames, see avlos.chunked. True for string
+        endpoints on a BaseChannel or AsyncBaseChannel that opts in
+        with chunked_transfers, and has a known max_packet_size.
+        """
+        if not getattr(self, "is_string_type", False):
+            return False
+        channel = self.channel
+        if not isinstance(channel, (BaseChannel, AsyncBaseChannel)) or not channel.chunked_transfers:
+            return False
+        try:
+            channel.max_packet_size
+        except NotImplementedError:
+            return False
+        return True
+
+    def clone(self, parent=None):
+        """
+        Copy this node for another device. The copy shares the spec
+        data of this node, such as data types and units, but none of
+        its _bound_state, and is not bound to any channel.
+
+        Args:
+            parent: The parent node of the copy, None for a root node
+
+        Returns:
+            The copy
+        """
+        # Unlike copy.copy, this avoids RemoteNode.__getattr__ on the bare instance
+        clone = object.__new__(type(self))
+        clone.__dict__.update((k, v) for k, v in self.__dict__.items() if k not in self._bound_state)
+        clone.__dict__.update(_parent=parent, _channel=None)
+        return clone
+
+    def __getstate__(self):
+        # Buffers are reallocated on demand, instrumentation
+        # wrappers are not kept
+        state = dict(self.__dict__)
+        for name in ("scratch_buffer", "encode_value", "encode_arguments", "decode_value"):
+            state.pop(name, None)
+        return state
+
+    @property
+    def raw_values(self):
+        """
+        Whether values are exchanged as plain magnitudes,
+        without constructing Pint quantities. Set this
+        on the root node.
+        """
+        try:
+            return self.root.raw_values
+        except AttributeError:
+            return False
+
+    @property
+    def value_cache(self):
+        """
+        The ValueCache of the device, or None if caching is
+        not enabled. Enable it on the root node.
+        """
+        try:
+            return self.root.value_cache
+        except AttributeError:
+            return None
+
+    @property
+    def write_batch(self):
+        """
+        The WriteBatch of the device, or None if no batch is
+        open. Open one with the batch context manager of the
+        root node.
+        """
+        try:
+            return self.root.write_batch
+        except AttributeError:
+            return None
+
+    def flush_writes(self):
+        """
+        Send the pending writes of the open batch, if any.
+        """
+        batch = self.write_batch
+        if batch is not None:
+            batch.flush()
+
+    async def aflush_writes(self):
+        """
+        Send the pending writes of the open batch, if any,
+        over an AsyncBaseChannel.
+        """
+        batch = self.write_batch
+        if batch is not None:
+            await batch.aflush()
+
+    def invalidate_cache(self):
+        """
+        Drop all cached values of the device.
+        """
+        cache = self.value_cache
+        if cache is not None:
+            cache.invalidate()
+
+    def transaction(self, *ep_ids):
+        """
+        Context manager guarding a request to the endpoints
+        ep_ids and its response on the channel.
+
+        Args:
+            ep_ids: The endpoint IDs taking part in the transaction
+
+        Returns:
+            The channel's transaction context manager
+        """
+        channel = self.channel
+        if isinstance(channel, BaseChannel):
+            return channel.transaction(*ep_ids)
+        return nullcontext()
+
+    def serialize(self, values, *dtypes):
+        """
+        Serialize values for this endpoint, into the scratch buffer
+        if available. Call within a transaction of this endpoint,
+        and send the data before it ends.
+
+        Args:
+            values: Sequence of values to serialize
+            dtypes: The data types of the values
+
+        Returns:
+            The serialized data, as accepted by the channel. When the
+            scratch buffer is used, this is a view that is only valid
+            until the next transaction of this endpoint.
+        """
+        buffer = self.scratch_buffer
+        if buffer is None or self.chunked:
+            return self.channel.serializer.serialize(values, *dtypes)
+        return buffer[: self.channel.serializer.serialize_into(buffer, values, *dtypes)]
+
+    def recv_data(self):
+        """
+        Receive the response of this endpoint, into the scratch
+        buffer if available. Call within a transaction.
+
+        Returns:
+            The raw response data. When the scratch buffer is used, this
+            is a view that is only valid within the current transaction.
+        """
+        if self.chunked:
+            from avlos.chunked import recv_chunks
+
+            return recv_chunks(self.channel, self.ep_id)
+        buffer = self.scratch_buffer
+        if buffer is None:
+            return self.channel.recv(self.ep_id)
+        return buffer[: self.channel.recv_into(self.ep_id, buffer)]
+
+    async def arecv_data(self):
+        """
+        Receive the response of this endpoint over an AsyncBaseChannel.
+
+        Returns:
+            The raw response data
+        """
+        if self.chunked:
+            from avlos.chunked import arecv_chunks
+
+            return await arecv_chunks(self.channel, self.ep_id)
+        return await self.channel.recv(self.ep_id)
+
+    async def asend_data(self, data):
+        """
+        Send data to this endpoint over an AsyncBaseChannel.
+
+        Args:
+            data: The serialized data, as accepted by the channel
+        """
+        if self.chunked:
+            from avlos.chunked import asend_chunks
+
+            await asend_chunks(self.channel, data, self.ep_id)
+        else:
+            await self.channel.send(data, self.ep_id)
+
+    def read_data(self, decode=None):
+        """
+        Request the current value of this endpoint. The value is
+        served from the value cache, if enabled and present.
+
+        Args:
+            decode: Optional callable applied to the response while
+                    the transaction of the endpoint is still held, as
+                    needed to consume a view of the scratch buffer
+
+        Returns:
+            The response decoded with decode if given, otherwise the
+            raw response data, as returned by the channel
+        """
+        self.flush_writes()
+        cache = self.value_cache
+        if cache is not None:
+            data = cache.get(self)
+            if data is not None:
+                return data if decode is None else decode(data)
+        with self.transaction(self.ep_id):
+            self.channel.send([], self.ep_id)
+            data = self.recv_data()
+            if cache is not None:
+                cache.put(self, _detach(data))
+            if decode is not None:
+                return decode(data)
+            # The scratch buffer is reused by the next transaction
+            return _detach(data)
+
+    def write_data(self, data=None, encode=None):
+        """
+        Send a new value to this endpoint, dropping its cached value.
+        If a batch is open, the value is sent when the batch is flushed.
+
+        Args:
+            data: The serialized value, as accepted by the channel
+            encode: Alternatively, a callable returning the serialized
+                    value, called while the transaction of the endpoint
+                    is held, as needed to serialize into the scratch
+                    buffer
+        """
+        batch = self.write_batch
+        with self.transaction(self.ep_id):
+            if encode is not None:
+                data = encode()
+            if batch is not None:
+                batch.add(self, data)
+                return
+            if self.chunked:
+                from avlos.chunked import send_chunks
+
+                send_chunks(self.channel, data, self.ep_id)
+            else:
+                self.channel.send(data, self.ep_id)
+        cache = self.value_cache
+        if cache is not None:
+            cache.invalidate(self)
+
+    async def aread_data(self):
+        """
+        Request the current value of this endpoint over an
+        AsyncBaseChannel. The value is served from the value
+        cache, if enabled and present.
+
+        Returns:
+            The raw response data, as returned by the channel
+        """
+        await self.aflush_writes()
+        cache = self.value_cache
+        if cache is not None:
+            data = cache.get(self)
+            if data is not None:
+                return data
+        await self.channel.send([], self.ep_id)
+        data = await self.arecv_data()
+        if cache is not None:
+            cache.put(self, data)
+        return data
+
+    async def awrite_data(self, data):
+        """
+        Send a new value to this endpoint over an AsyncBaseChannel,
+        dropping its cached value. If a batch is open, the value is
+        sent when the batch is flushed.
+
+        Args:
+            data: The serialized value, as accepted by the channel
+        """
+        batch = self.write_batch
+        if batch is not None:
+            batch.add(self, data)
+            return
+        await self.asend_data(data)
+        cache = self.value_cache
+        if cache is not None:
+            cache.invalidate(self)
+
+    def read_endpoints(self, endpoints, flush=True):
+        """
+        Read the values of several endpoints in a single batch.
+        All requests are sent before any response is collected,
+        so that the transfers overlap on the channel. Chunked
+        responses are reassembled in the order of endpoints.
+        Cached values are not requested.
+
+        Args:
+            endpoints: List of readable endpoint objects
+            flush: Whether to send the pending writes of the open
+                   batch first. Background readers pass False, so as
+                   not to flush a batch that is still being filled.
+
+        Returns:
+            List of decoded values, in the order of endpoints
+        """
+        if flush:
+            self.flush_writes()
+        cache = self.value_cache
+        if cache is not None:
+            cached = [cache.get(ep) for ep in endpoints]
+            missing = [ep for ep, data in zip(endpoints, cached) if data is None]
+        else:
+            missing = endpoints
+        channel = self.channel
+        ep_ids = [ep.ep_id for ep in missing]
+        if isinstance(channel, BaseChannel):
+            with channel.transaction(*ep_ids):
+                _send_requests(channel, missing)
+                responses = _recv_many(channel, missing)
+        else:
+            # Duck-typed channels only offer send/recv
+            for ep_id in ep_ids:
+                channel.send([], ep_id)
+            responses = [channel.recv(ep_id) for ep_id in ep_ids]
+        if cache is not None:
+            for ep, data in zip(missing, responses):
+                cache.put(ep, data)
+            responses = iter(responses)
+            responses = [next(responses) if data is None else data for data in cached]
+        return [ep.decode_value(data) for ep, data in zip(endpoints, responses)]
+
+    async def aread_endpoints(self, endpoints):
+        """
+        Read the values of several endpoints in a single batch
+        over an AsyncBaseChannel. Chunked responses are reassembled
+        in the order of endpoints. Cached values are not requested.
+
+        Args:
+            endpoints: List of readable endpoint objects
+
+        Returns:
+            List of decoded values, in the order of endpoints
+        """
+        await self.aflush_writes()
+        cache = self.value_cache
+        if cache is not None:
+            cached = [cache.get(ep) for ep in endpoints]
+            missing = [ep for ep, data in zip(endpoints, cached) if data is None]
+        else:
+            missing = endpoints
+        channel = self.channel
+        await channel.send_many([([], ep.ep_id) for ep in missing])
+        responses = []
+        for chunked, group in groupby(missing, key=lambda ep: ep.chunked):
+            if chunked:
+                responses += [await ep.arecv_data() for ep in group]
+            else:
+                responses += await channel.recv_many([ep.ep_id for ep in group])
+        if cache is not None:
+            for ep, data in zip(missing, responses):
+                cache.put(ep, data)
+            responses = iter(responses)
+            responses = [next(responses) if data is None else data for data in cached]
+        return [ep.decode_value(data) for ep, data in zip(endpoints, responses)]
+
+
+def _send_requests(channel, endpoints):
+    """
+    Send read requests to several endpoints in order, in bursts
+    of send_many. Requests of chunked endpoints are sent with send,
+    as their responses are collected with recv_seq rather than
+    recv_many.
+    """
+    for chunked, group in groupby(endpoints, key=lambda ep: ep.chunked):
+        if chunked:
+            for ep in group:
+                channel.send([], ep.ep_id)
+        else:
+            channel.send_many([([], ep.ep_id) for ep in group])
+
+
+def _recv_many(channel, endpoints):
+    """
+    Receive the responses of several endpoints in order, collecting
+    runs of single frame responses with recv_many, and chunked
+    responses with recv_chunks
+    """
+    responses = []
+    for chunked, group in groupby(endpoints, key=lambda ep: ep.chunked):
+        if chunked:
+            from avlos.chunked import recv_chunks
+
+            responses += [recv_chunks(channel, ep.ep_id) for ep in group]
+        else:
+            responses += channel.recv_many([ep.ep_id for ep in group])
+    return responses
+
+
+def _detach(data):
+    """
+    Copy a view of a scratch buffer, so that it outlives the transaction
+    """
+    if isinstance(data, memoryview):
+        return bytes(data)
+    return data
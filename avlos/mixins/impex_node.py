@@ -17,14 +17,36 @@ class ImpexNode:
             if "export" in self.meta and self.meta["export"] == True:
                 return self.get_value()
         except AttributeError:
+            # Read all exportable values of the subtree in a single batch
+            paths, eps = [], []
+            for path, ep in self.exportable_endpoints():
+                paths.append(path)
+                eps.append(ep)
             values = {}
-            for name, node in self.remote_attributes.items():
-                try:
-                    val = node.export_values()
-                    if val != None:
-                        values[name] = val
-                except AttributeError:
-                    pass
+            for path, val in zip(paths, self.read_endpoints(eps)):
+                if val != None:
+                    target = values
+                    for name in path[:-1]:
+                        target = target.setdefault(name, {})
+                    target[path[-1]] = val
             if len(values) > 0:
                 return values
             return None
+
+    def exportable_endpoints(self):
+        """
+        Collect the endpoints marked for export in this
+        node and its descendants, as (path tuple, endpoint)
+        pairs in tree order
+        """
+        eps = []
+        for name, node in self.remote_attributes.items():
+            try:
+                if "export" in node.meta and node.meta["export"] == True:
+                    eps.append(((name,), node))
+            except AttributeError:
+                try:
+                    eps.extend(((name,) + path, ep) for path, ep in node.exportable_endpoints())
+                except AttributeError:
+                    pass
+        return eps
@@ -0,0 +1,207 @@
+from collections import defaultdict, deque
+from concurrent.futures import Future
+from threading import RLock
+
+from avlos.channel import BaseChannel
+
+# Matches CAN_SEQ_SIZE in the generated C++ helpers
+DEFAULT_SEQ_SIZE = 9
+
+
+class PipelineFuture(Future):
+    """
+    Future representing a request in flight on a
+    PipelinedChannel. Waiting on the result drives
+    the pipeline until the response has arrived.
+    """
+
+    def __init__(self, pipeline, decode=None):
+        super().__init__()
+        self._pipeline = pipeline
+        self._decode = decode
+
+    def result(self, timeout=None):
+        self._pipeline.wait(self)
+        return super().result(timeout)
+
+    def exception(self, timeout=None):
+        self._pipeline.wait(self)
+        return super().exception(timeout)
+
+    def _complete(self, data):
+        try:
+            self.set_result(data if self._decode is None else self._decode(data))
+        except Exception as e:
+            self.set_exception(e)
+
+
+class PipelinedChannel(BaseChannel):
+    """
+    Channel wrapper that keeps up to window requests
+    in flight on the wrapped channel. Responses are
+    matched to requests by endpoint ID and sequence
+    number, and are exposed as futures.
+    """
+
+    def __init__(self, channel, window=8, seq_size=DEFAULT_SEQ_SIZE, timeout=0.1):
+        """
+        Arguments:
+            channel: the BaseChannel instance to wrap
+            window: the max number of requests awaiting
+                    a response at any time
+            seq_size: the number of bits available for
+                      sequence numbers
+            timeout: the timeout for receiving each response
+        """
+        assert window > 0, "Window must be at least 1"
+        self.channel = channel
+        self.window = window
+        self.timeout = timeout
+        self._seq_mask = (1 << seq_size) - 1
+        self._seq = 0
+        self._in_flight = deque()
+        self._pending = defaultdict(deque)
+        self._lock = RLock()
+
+    def submit(self, data, ep_id, expect_response=True, decode=None):
+        """
+        Send a request to endpoint ep_id without waiting
+        for its response. If the window is full, the
+        oldest requests are completed first.
+        Arguments:
+            data: a bytearray containing the data to
+                  be sent
+            ep_id: an integer representing the endpoint
+                   ID to send to
+            expect_response: whether the endpoint replies
+                             to this request
+            decode: optional callable applied to the
+                    received data, e.g. an endpoint's
+                    decode_value
+        Returns:
+            A PipelineFuture resolving to the (decoded)
+            response, or None if no response is expected
+        """
+        future = PipelineFuture(self, decode)
+        with self._lock:
+            while len(self._in_flight) >= self.window:
+                self._complete_oldest()
+            seq = self._seq
+            self._seq = (seq + 1) & self._seq_mask
+            self.channel.send_seq(data, ep_id, seq)
+            if expect_response:
+                self._in_flight.append((future, ep_id, seq))
+            else:
+                future.set_result(None)
+        return future
+
+    def wait(self, future):
+        """
+        Drive the pipeline until future is done
+        """
+        with self._lock:
+            while not future.done() and self._in_flight:
+                self._complete_oldest()
+
+    def flush(self):
+        """
+        Collect the responses of all requests in flight
+        """
+        with self._lock:
+            while self._in_flight:
+                self._complete_oldest()
+
+    def _complete_oldest(self):
+        future, ep_id, seq = self._in_flight.popleft()
+        try:
+            data = self.channel.recv_seq(ep_id, seq, self.timeout)
+        except Exception as e:
+            # No response will arrive for this request
+            self._discard(future, ep_id)
+            if not future.cancelled():
+                future.set_exception(e)
+        else:
+            # The response of a cancelled request is dropped
+            if future.cancelled():
+                self._discard(future, ep_id)
+            else:
+                future._complete(data)
+
+    def _discard(self, future, ep_id):
+        """
+        Remove a future from the requests awaiting recv_many
+        """
+        queue = self._pending.get(ep_id)
+        if queue is None:
+            return
+        try:
+            queue.remove(future)
+        except ValueError:
+            pass
+        if not queue:
+            del self._pending[ep_id]
+
+    def send(self, data, ep_id):
+        with self._lock:
+            self.flush()
+            self.channel.send(data, ep_id)
+
+    def recv(self, ep_id, timeout=0.1):
+        with self._lock:
+            self.flush()
+            return self.channel.recv(ep_id, timeout)
+
+    def send_seq(self, data, ep_id, seq):
+        with self._lock:
+            self.flush()
+            self.channel.send_seq(data, ep_id, seq)
+
+    def recv_seq(self, ep_id, seq, timeout=0.1):
+        with self._lock:
+            self.flush()
+            return self.channel.recv_seq(ep_id, seq, timeout)
+
+    def send_many(self, requests):
+        with self._lock:
+            submitted = []
+            try:
+                for data, ep_id in requests:
+                    future = self.submit(data, ep_id)
+                    self._pending[ep_id].append(future)
+                    submitted.append((future, ep_id))
+            except Exception:
+                # The responses of a failed batch are never collected
+                for future, ep_id in submitted:
+                    future.cancel()
+                    self._discard(future, ep_id)
+                raise
+
+    def recv_many(self, ep_ids, timeout=0.1):
+        with self._lock:
+            futures = []
+            for ep_id in ep_ids:
+                queue = self._pending.get(ep_id)
+                futures.append(queue.popleft() if queue else None)
+                if queue is not None and not queue:
+                    del self._pending[ep_id]
+        for ep_id, future in zip(ep_ids, futures):
+            if future is None:
+                # The request timed out or failed, and was discarded
+                raise TimeoutError("No response from endpoint {}".format(ep_id))
+        return [future.result() for future in futures]
+
+    @property
+    def chunked_transfers(self):
+        return self.channel.chunked_transfers
+
+    @property
+    def max_ep_id(self):
+        return self.channel.max_ep_id
+
+    @property
+    def max_packet_size(self):
+        return self.channel.max_packet_size
+
+    @property
+    def serializer(self):
+        return self.channel.serializer
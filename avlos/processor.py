@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from importlib import import_module
 from os.path import basename, dirname, join, realpath
 
@@ -35,8 +36,19 @@ def process_with_config_file(device_instance, avlos_config_path, traverse_path=F
 def process_with_config_object(device_instance, avlos_config):
     """
     Process a device spec using an output config object.
+    Enabled generators run concurrently on a thread pool,
+    sized by the optional max_workers key of the config.
     """
+    generators = []
     for module_name, module_config in avlos_config["generators"].items():
         if "enabled" in module_config and True == module_config["enabled"]:
+            # Imported up front, rather than concurrently in the pool
             generator = import_module(".generators.{}".format(module_name), package="avlos")
-            generator.process(device_instance, module_config)
+            generators.append((generator, module_config))
+    with ThreadPoolExecutor(max_workers=avlos_config.get("max_workers")) as executor:
+        futures = [
+            executor.submit(generator.process, device_instance, module_config) for generator, module_config in generators
+        ]
+        # Errors are raised in config order
+        for future in futures:
+            future.result()
@@ -0,0 +1,103 @@
+"""
+On-disk cache of deserialized device specs. A cached spec is
+loaded without schema validation or enum synthesis.
+
+Cache files are pickles, so only cache directories under
+the control of the user should be used.
+"""
+
+import enum
+import io
+import os
+import pickle
+import tempfile
+
+import avlos
+from avlos.unit_field import get_registry
+
+
+def default_cache_dir():
+    """
+    Get the default cache directory, which can be overridden
+    with the AVLOS_CACHE_DIR environment variable
+    """
+    try:
+        return os.environ["AVLOS_CACHE_DIR"]
+    except KeyError:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return os.path.join(base, "avlos")
+
+
+def cache_path(cache_dir, hash_uint32):
+    """
+    Get the path of the cache file for a spec hash,
+    for the running avlos version
+    """
+    version = str(avlos.__version__).replace(os.sep, "_")
+    return os.path.join(cache_dir, "{:08x}-{}.pickle".format(hash_uint32, version))
+
+
+def load(cache_dir, hash_uint32):
+    """
+    Load a cached device object. Returns None if the spec
+    is not in the cache, or the cache file is unreadable.
+    """
+    try:
+        with open(cache_path(cache_dir, hash_uint32), "rb") as cache_file:
+            device_obj = pickle.load(cache_file)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Stale or corrupt cache file, the spec will be rebuilt
+        return None
+    if getattr(device_obj, "hash_uint32", None) != hash_uint32:
+        return None
+    return device_obj
+
+
+def store(cache_dir, device_obj):
+    """
+    Store a freshly deserialized device object in the cache.
+    The file is written atomically, so that concurrent
+    processes never read a partial file.
+    """
+    buffer = io.BytesIO()
+    _SpecPickler(buffer, pickle.HIGHEST_PROTOCOL).dump(device_obj)
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(buffer.getvalue())
+        os.replace(tmp_path, cache_path(cache_dir, device_obj.hash_uint32))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class _SpecPickler(pickle.Pickler):
+    """
+    Pickler that stores the enum and flag classes synthesized
+    from the spec, and Pint units, by value
+    """
+
+    def reducer_override(self, obj):
+        if isinstance(obj, type) and obj not in (enum.IntFlag, enum.IntEnum):
+            if issubclass(obj, enum.IntFlag):
+                return _make_enum, (enum.IntFlag, obj.__name__, _enum_members(obj))
+            if issubclass(obj, enum.IntEnum):
+                return _make_enum, (enum.IntEnum, obj.__name__, _enum_members(obj))
+        if isinstance(obj, get_registry().Unit):
+            return _make_unit, (str(obj),)
+        return NotImplemented
+
+
+def _enum_members(enum_class):
+    return [(name, member.value) for name, member in enum_class.__members__.items()]
+
+
+def _make_enum(base, name, members):
+    return base(name, members)
+
+
+def _make_unit(unit_string):
+    return get_registry().Unit(unit_string)
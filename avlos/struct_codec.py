@@ -0,0 +1,83 @@
+import struct
+
+from avlos.datatypes import DataType
+
+
+class StructCodec:
+    """
+    Reference little-endian data codec, matching the
+    byte layout of the generated C code. Values are
+    packed back to back without padding. A string may
+    only appear as the last value, and takes up the
+    rest of the payload.
+
+    A struct.Struct is compiled once for each dtype
+    signature and reused on every call.
+    """
+
+    encoding = "utf-8"
+
+    def __init__(self):
+        self._structs = {}
+
+    def get_struct(self, dtypes):
+        """
+        Get the precompiled struct for a tuple of dtypes,
+        excluding a trailing string, along with a flag
+        indicating whether a trailing string is present
+        """
+        try:
+            return self._structs[dtypes]
+        except KeyError:
+            has_str = len(dtypes) > 0 and dtypes[-1] is DataType.STR
+            fixed = dtypes[:-1] if has_str else dtypes
+            if DataType.STR in fixed:
+                raise ValueError("A string can only be the last value")
+            packer = struct.Struct("<" + "".join(dtype.struct_format for dtype in fixed))
+            self._structs[dtypes] = packer, has_str
+            return packer, has_str
+
+    def serialize(self, values, *dtypes):
+        """
+        Serialize values of the given dtypes to bytes
+        """
+        packer, has_str = self.get_struct(dtypes)
+        if has_str:
+            text = values[-1]
+            if isinstance(text, str):
+                text = text.encode(self.encoding)
+            return packer.pack(*values[:-1]) + bytes(text)
+        return packer.pack(*values)
+
+    def serialize_into(self, buffer, values, *dtypes):
+        """
+        Serialize values of the given dtypes into a
+        preallocated writable buffer, and return the
+        number of bytes written
+        """
+        packer, has_str = self.get_struct(dtypes)
+        if has_str:
+            text = values[-1]
+            if isinstance(text, str):
+                text = text.encode(self.encoding)
+            packer.pack_into(buffer, 0, *values[:-1])
+            end = packer.size + len(text)
+            if end > len(buffer):
+                raise ValueError("String does not fit in the buffer")
+            buffer[packer.size : end] = text
+            return end
+        packer.pack_into(buffer, 0, *values)
+        return packer.size
+
+    def deserialize(self, data, *dtypes):
+        """
+        Deserialize bytes, or any object supporting the
+        buffer protocol, to a tuple of values of the
+        given dtypes
+        """
+        packer, has_str = self.get_struct(dtypes)
+        values = packer.unpack_from(data)
+        if has_str:
+            text = bytes(data[packer.size :]).split(b"\0", 1)[0]
+            return values + (text.decode(self.encoding),)
+        return values
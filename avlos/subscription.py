@@ -0,0 +1,131 @@
+import time
+from collections import OrderedDict, deque
+from threading import Event, Thread
+
+from avlos.channel import unwrap_channel
+from avlos.locking import LockingChannel
+
+
+class Subscription:
+    """
+    Periodic reads of a set of endpoints, performed by a
+    background thread. All endpoints are read in a single
+    batch per period, so that a PipelinedChannel or a channel
+    overriding send_many/recv_many is used to its full extent.
+    Samples are kept in a ring buffer, and optionally passed
+    to a callback.
+
+    The thread shares the channel with the foreground, so the
+    channel must be a LockingChannel. Pending writes of an open
+    batch are left to the thread that opened it.
+    """
+
+    def __init__(self, node, endpoints, rate_hz, callback=None, buffer_size=1024):
+        """
+        Args:
+            node: The node that the endpoint paths are relative to
+            endpoints: List of (path, endpoint) tuples to read
+            rate_hz: The number of reads per second
+            callback: Optional callable, called from the subscription
+                      thread with each (timestamp, values) sample. Its
+                      errors are kept in last_error.
+            buffer_size: The max number of samples kept in the buffer
+        """
+        assert rate_hz > 0, "Rate must be positive"
+        self.node = node
+        self.paths = [path for path, _ in endpoints]
+        self.endpoints = [ep for _, ep in endpoints]
+        self.period = 1.0 / rate_hz
+        self.callback = callback
+        self.buffer = deque(maxlen=buffer_size)
+        self.missed = 0
+        self.last_error = None
+        self._stop_event = Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Start the subscription thread.
+
+        Raises:
+            TypeError: If the channel is not a LockingChannel
+        """
+        assert self._thread is None, "Subscription already started"
+        if not isinstance(unwrap_channel(self.node.channel), LockingChannel):
+            raise TypeError("Subscriptions require a LockingChannel, as the channel is shared between threads")
+        self._thread = Thread(target=self._run, name="avlos-subscription", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stop the subscription thread and wait for it to exit.
+
+        Args:
+            timeout: Optional time in seconds to wait for the thread
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def drain(self):
+        """
+        Remove and return all samples in the buffer.
+
+        Returns:
+            List of (timestamp, values) samples, oldest first. Values
+            are ordered dictionaries mapping paths to values.
+        """
+        samples = []
+        while True:
+            try:
+                samples.append(self.buffer.popleft())
+            except IndexError:
+                return samples
+
+    @property
+    def latest(self):
+        """
+        The most recent sample, or None if no sample was read yet.
+        """
+        try:
+            return self.buffer[-1]
+        except IndexError:
+            return None
+
+    def __enter__(self):
+        if self._thread is None:
+            self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        deadline = time.monotonic()
+        while not self._stop_event.is_set():
+            try:
+                values = self.node.read_endpoints(self.endpoints, flush=False)
+            except Exception as e:
+                # Keep polling through transient errors, e.g. timeouts
+                self.last_error = e
+            else:
+                sample = (time.time(), OrderedDict(zip(self.paths, values)))
+                self.buffer.append(sample)
+                if self.callback is not None:
+                    try:
+                        self.callback(sample)
+                    except Exception as e:
+                        # A failing callback does not stop the subscription
+                        self.last_error = e
+            deadline += self.period
+            now = time.monotonic()
+            if now > deadline:
+                # Skip the periods that were overrun
+                skipped = int((now - deadline) / self.period) + 1
+                self.missed += skipped
+                deadline += skipped * self.period
+            self._stop_event.wait(deadline - now)
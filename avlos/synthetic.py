@@ -0,0 +1,145 @@
+"""
+Synthesis of valid device specs of configurable size and
+shape, for exercising deserialization, validation and the
+generators at scale.
+"""
+
+import random
+
+NUMERIC_DTYPES = ("bool", "uint8", "int8", "uint16", "int16", "uint32", "int32", "float")
+UNITS = ("volt", "ampere", "ohm", "tick", "rad/s")
+KINDS = ("attribute", "enum", "bitmask", "function", "string")
+
+
+def synthesize_spec(depth=2, fan_out=4, endpoints=8, mix=None, seed=0, name="synth"):
+    """
+    Synthesize a device spec. Every node of the tree holds
+    `endpoints` endpoints, and nodes above the given depth
+    additionally hold `fan_out` child nodes. Node names are
+    unique across the tree, as the C++ generator emits a class
+    per node. The spec is deterministic for a given set of
+    arguments.
+
+    Args:
+        depth: The number of node levels below the root
+        fan_out: The number of child nodes of each inner node
+        endpoints: The number of endpoints of each node
+        mix: Dictionary of relative weights of the endpoint kinds,
+             "attribute", "enum", "bitmask", "function" and "string".
+             Kinds that are omitted are not generated. By default
+             all kinds are generated, mostly attributes.
+        seed: Seed of the random choice of endpoint kinds and types
+        name: The name of the root node
+
+    Returns:
+        The device spec, as it would be loaded from YAML
+    """
+    if mix is None:
+        mix = {"attribute": 5, "enum": 1, "bitmask": 1, "function": 2, "string": 1}
+    unknown = set(mix) - set(KINDS)
+    if unknown:
+        raise ValueError("Unknown endpoint kinds: {}".format(", ".join(sorted(unknown))))
+    kinds = [kind for kind in KINDS if mix.get(kind, 0) > 0]
+    if endpoints > 0 and not kinds:
+        raise ValueError("The endpoint mix has no positive weights")
+    weights = [mix[kind] for kind in kinds]
+    rng = random.Random(seed)
+    node_count = iter(range(1, spec_size(depth, fan_out, 0)[0]))
+
+    def make_node(node_name, level):
+        children = []
+        for index in range(endpoints):
+            kind = rng.choices(kinds, weights)[0]
+            children.append(_ENDPOINT_MAKERS[kind](rng, "{}{}".format(kind[:4], index), node_name))
+        if level < depth:
+            for _ in range(fan_out):
+                child_name = "node{}".format(next(node_count))
+                children.append(make_node(child_name, level + 1))
+        return {"name": node_name, "remote_attributes": children}
+
+    return make_node(name, 0)
+
+
+def spec_size(depth=2, fan_out=4, endpoints=8):
+    """
+    Compute the number of nodes and endpoints of a spec
+    synthesized with the given shape.
+
+    Returns:
+        Tuple of the number of nodes, including the root,
+        and the number of endpoints
+    """
+    nodes = sum(fan_out**level for level in range(depth + 1))
+    return nodes, nodes * endpoints
+
+
+def _c_name(node_name, name, suffix):
+    # Node names are unique, which keeps C names unique and short at any depth
+    return "_".join((node_name, name, suffix))
+
+
+def _make_attribute(rng, name, node_name):
+    spec = {
+        "name": name,
+        "dtype": rng.choice(NUMERIC_DTYPES),
+        "getter_name": _c_name(node_name, name, "get"),
+        "summary": "Synthetic attribute.",
+    }
+    if spec["dtype"] == "float":
+        spec["unit"] = rng.choice(UNITS)
+    if rng.random() < 0.5:
+        spec["setter_name"] = _c_name(node_name, name, "set")
+    if rng.random() < 0.25:
+        spec["meta"] = {"dynamic": True}
+    elif "setter_name" in spec and rng.random() < 0.5:
+        spec["meta"] = {"export": True}
+    return spec
+
+
+def _make_enum(rng, name, node_name):
+    return {
+        "name": name,
+        "options": ["OPTION{}".format(i) for i in range(rng.randint(2, 6))],
+        "getter_name": _c_name(node_name, name, "get"),
+        "setter_name": _c_name(node_name, name, "set"),
+        "summary": "Synthetic enum.",
+    }
+
+
+def _make_bitmask(rng, name, node_name):
+    return {
+        "name": name,
+        "flags": ["FLAG{}".format(i) for i in range(rng.randint(1, 8))],
+        "getter_name": _c_name(node_name, name, "get"),
+        "summary": "Synthetic bitmask.",
+        "meta": {"dynamic": True},
+    }
+
+
+def _make_function(rng, name, node_name):
+    return {
+        "name": name,
+        "dtype": rng.choice(("void", "float", "uint32")),
+        "caller_name": _c_name(node_name, name, "call"),
+        "arguments": [{"name": "arg{}".format(i), "dtype": rng.choice(NUMERIC_DTYPES)} for i in range(rng.randint(0, 2))],
+        "summary": "Synthetic function.",
+    }
+
+
+def _make_string(rng, name, node_name):
+    return {
+        "name": name,
+        "dtype": "string",
+        "getter_name": _c_name(node_name, name, "get"),
+        "setter_name": _c_name(node_name, name, "set"),
+        "summary": "Synthetic string.",
+    }
+
+
+_ENDPOINT_MAKERS = {
+    "attribute": _make_attribute,
+    "enum": _make_enum,
+    "bitmask": _make_bitmask,
+    "function": _make_function,
+    "string": _make_string,
+}
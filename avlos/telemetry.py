@@ -0,0 +1,67 @@
+"""
+Vectorized decoding of telemetry streams using NumPy.
+Requires the optional numpy dependency (pip install avlos[numpy]).
+"""
+
+import numpy as np
+
+from avlos import get_registry
+
+
+def frame_dtype(endpoints, frame_size=None):
+    """
+    Build a structured NumPy dtype describing one record of
+    telemetry, i.e. the values of endpoints packed back to
+    back, little-endian and without padding.
+
+    Args:
+        endpoints: List of endpoints with fixed-size datatypes
+        frame_size: Optional size in bytes of each record, if
+                    larger than the packed values (e.g. padded
+                    CAN frames)
+
+    Returns:
+        A numpy.dtype with one field per endpoint, named by full_name
+    """
+    names, formats, offsets = [], [], []
+    offset = 0
+    for ep in endpoints:
+        if ep.dtype.numpy_format is None:
+            raise ValueError(f"Endpoint '{ep.full_name}' has no fixed-size datatype")
+        names.append(ep.full_name)
+        formats.append(ep.dtype.numpy_format)
+        offsets.append(offset)
+        offset += ep.dtype.size
+    if frame_size is None:
+        frame_size = offset
+    elif frame_size < offset:
+        raise ValueError(f"Frame size {frame_size} is smaller than the packed values ({offset} bytes)")
+    return np.dtype({"names": names, "formats": formats, "offsets": offsets, "itemsize": frame_size})
+
+
+def decode_frames(endpoints, buffer, frame_size=None):
+    """
+    Decode a buffer of raw telemetry records into one array per
+    endpoint, in a single call. Units are attached once per
+    column rather than once per sample, unless the root node
+    is in raw values mode.
+
+    Args:
+        endpoints: List of endpoints making up each record
+        buffer: Object supporting the buffer protocol, containing
+                whole records
+        frame_size: Optional size in bytes of each record
+
+    Returns:
+        Dictionary mapping endpoint full names to arrays, wrapped
+        in a Pint Quantity for endpoints with a unit, as get_value
+        returns them
+    """
+    records = np.frombuffer(buffer, dtype=frame_dtype(endpoints, frame_size))
+    columns = {}
+    for ep in endpoints:
+        column = records[ep.full_name]
+        if ep.unit is not None and not ep.raw_values:
+            column = get_registry().Quantity(column, ep.unit)
+        columns[ep.full_name] = column
+    return columns
@@ -1,4 +1,5 @@
-import pint
+import os
+
 from marshmallow import ValidationError, fields
 
 _registry = None
@@ -6,15 +7,82 @@ _registry = None
 
 def get_registry():
     """
-    Get or create a Pint unit registry with custom units
+    Get or create a Pint unit registry with custom units.
+    Pint is only imported on first use. To make creating the
+    registry much faster on subsequent runs, set the
+    AVLOS_UNIT_CACHE_DIR environment variable to a folder
+    where Pint caches the parsed unit definitions, or to
+    ":auto:" for the user cache folder chosen by Pint.
     """
     global _registry
     if not _registry:
-        _registry = pint.UnitRegistry(autoconvert_offset_to_baseunit=True)
+        import pint
+
+        cache_folder = os.environ.get("AVLOS_UNIT_CACHE_DIR")
+        if cache_folder:
+            try:
+                _registry = pint.UnitRegistry(autoconvert_offset_to_baseunit=True, cache_folder=cache_folder)
+            except (TypeError, OSError):
+                # Pint version without definition caching, or cache folder not writable
+                pass
+        if _registry is None:
+            _registry = pint.UnitRegistry(autoconvert_offset_to_baseunit=True)
         _registry.define("tick = turn / 8192")
     return _registry
 
 
+_conversion_factors = {}
+
+
+def get_conversion_factor(src_unit, dst_unit):
+    """
+    Get the factor that converts magnitudes in src_unit to
+    magnitudes in dst_unit. Factors are computed once through
+    the registry and cached. Returns None if the conversion is
+    not a plain multiplication (e.g. offset units such as
+    degrees Celsius).
+    """
+    from pint.util import to_units_container
+
+    return _get_factor(to_units_container(src_unit), to_units_container(dst_unit))
+
+
+def _get_factor(src_units, dst_units):
+    # Keyed on pint units containers, which hash much
+    # faster than Unit objects
+    key = (src_units, dst_units)
+    try:
+        return _conversion_factors[key]
+    except KeyError:
+        quantity = get_registry().Quantity
+        if quantity(0, src_units).to(dst_units).magnitude != 0:
+            factor = None
+        else:
+            factor = quantity(1, src_units).to(dst_units).magnitude
+        _conversion_factors[key] = factor
+        return factor
+
+
+def to_magnitude(value, unit):
+    """
+    Get the magnitude of value expressed in unit, using the
+    cached conversion factors. Values without units are
+    returned as is.
+    """
+    try:
+        magnitude = value.magnitude
+    except AttributeError:
+        return value
+    from pint.util import to_units_container
+
+    factor = None if unit is None else _get_factor(to_units_container(value), to_units_container(unit))
+    if factor is None:
+        return value.to(unit).magnitude
+    if factor == 1:
+        return magnitude
+    return magnitude * factor
+
+
 class UnitField(fields.Field):
     """
     Marshmallow Field that serializes to a string
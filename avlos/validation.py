@@ -4,7 +4,10 @@ Validates C identifiers, detects conflicts, and ensures consistency.
 """
 
 import re
-from typing import List
+import warnings
+from dataclasses import dataclass
+from enum import Enum
+from typing import List, Optional, Tuple
 
 # C reserved words (C11 standard)
 C_RESERVED_WORDS = {
@@ -61,9 +64,65 @@ class ValidationError(Exception):
     pass
 
 
+class Severity(Enum):
+    """Severity of a validation diagnostic."""
+
+    ERROR = "error"
+    WARNING = "warning"
+
+
+@dataclass(frozen=True)
+class Diagnostic:
+    """
+    A single validation finding.
+
+    Attributes:
+        severity: ERROR for specs that cannot be generated, WARNING otherwise
+        code: The check that failed, one of "node-name", "getter-name",
+              "setter-name", "caller-name", "duplicate-ep-id" and
+              "function-name-collision"
+        path: Dotted path of the offending node, starting with the root name
+        message: Human-readable description
+    """
+
+    severity: Severity
+    code: str
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        return self.message
+
+
+def _check_c_identifier(name: str, context: str = "") -> Optional[Tuple[Severity, str]]:
+    """
+    Check a name against the C identifier rules.
+
+    Returns:
+        Tuple of severity and message, or None if the name is valid
+    """
+    ctx = f" ({context})" if context else ""
+    if not C_IDENTIFIER_PATTERN.match(name):
+        return (
+            Severity.ERROR,
+            f"Invalid C identifier '{name}'{ctx}. "
+            f"Must start with letter or underscore, contain only alphanumeric and underscore.",
+        )
+    if name in C_RESERVED_WORDS:
+        return Severity.ERROR, f"Invalid C identifier '{name}'{ctx}. '{name}' is a C reserved word."
+    if len(name) > 63:
+        # C99 requires at least 63 significant characters for identifiers
+        return (
+            Severity.WARNING,
+            f"Identifier '{name}'{ctx} is very long ({len(name)} chars). " f"Some compilers may truncate after 63 characters.",
+        )
+    return None
+
+
 def validate_c_identifier(name: str, context: str = "") -> None:
     """
-    Validate that a name is a valid C identifier.
+    Validate that a name is a valid C identifier. Very long
+    identifiers are reported with a warning.
 
     Args:
         name: Identifier to validate
@@ -72,49 +131,113 @@ def validate_c_identifier(name: str, context: str = "") -> None:
     Raises:
         ValidationError: If identifier is invalid
     """
-    if not C_IDENTIFIER_PATTERN.match(name):
-        ctx = f" ({context})" if context else ""
-        raise ValidationError(
-            f"Invalid C identifier '{name}'{ctx}. "
-            f"Must start with letter or underscore, contain only alphanumeric and underscore."
-        )
+    problem = _check_c_identifier(name, context)
+    if problem is None:
+        return
+    severity, message = problem
+    if severity is Severity.ERROR:
+        raise ValidationError(message)
+    warnings.warn(message, stacklevel=2)
 
-    if name in C_RESERVED_WORDS:
-        ctx = f" ({context})" if context else ""
-        raise ValidationError(f"Invalid C identifier '{name}'{ctx}. '{name}' is a C reserved word.")
 
-    if len(name) > 63:
-        # C99 requires at least 63 significant characters for identifiers
-        ctx = f" ({context})" if context else ""
-        print(
-            f"Warning: Identifier '{name}'{ctx} is very long ({len(name)} chars). "
-            f"Some compilers may truncate after 63 characters."
-        )
+class _Validator:
+    """
+    Visitor running all checks in a single walk of the tree,
+    visiting each node once. Names of nodes are built up
+    during the walk rather than looked up per node.
+    """
 
+    def __init__(self):
+        self.diagnostics: List[Diagnostic] = []
+        self.ep_ids = {}
+        self.function_names = {}
+
+    def run(self, instance) -> List[Diagnostic]:
+        self.visit(instance, instance.name, "")
+        return self.diagnostics
+
+    def visit(self, node, path: str, full_name: str) -> None:
+        # Node names become part of full_name which becomes C function name
+        # So they should be valid C identifier parts
+        self.check_identifier("node-name", node.name, f"node name at {path}", path)
+        if hasattr(node, "getter_name") or hasattr(node, "setter_name") or hasattr(node, "caller_name"):
+            self.visit_endpoint(node, path, full_name)
+        elif hasattr(node, "remote_attributes"):
+            for child in node.remote_attributes.values():
+                child_full_name = f"{full_name}.{child.name}" if full_name else child.name
+                self.visit(child, f"{path}.{child.name}", child_full_name)
 
-def validate_endpoint_ids(instance) -> List[str]:
+    def visit_endpoint(self, ep, path: str, full_name: str) -> None:
+        ep_id = ep.ep_id
+        if ep_id in self.ep_ids:
+            self.report(
+                Severity.ERROR,
+                "duplicate-ep-id",
+                path,
+                f"Duplicate endpoint ID {ep_id}: '{full_name}' and '{self.ep_ids[ep_id]}'",
+            )
+        else:
+            self.ep_ids[ep_id] = full_name
+
+        for kind in ("getter", "setter", "caller"):
+            function_name = getattr(ep, f"{kind}_name", None)
+            if function_name:
+                self.check_identifier(f"{kind}-name", function_name, f"{kind} for {full_name}", path)
+
+        # Endpoint functions are named: avlos_{full_name with dots replaced by underscores}
+        ep_func_name = "avlos_" + full_name.replace(".", "_")
+        if ep_func_name in self.function_names:
+            self.report(
+                Severity.ERROR,
+                "function-name-collision",
+                path,
+                f"Endpoint function name collision: '{ep_func_name}' "
+                f"generated from both '{full_name}' and '{self.function_names[ep_func_name]}'",
+            )
+        else:
+            self.function_names[ep_func_name] = full_name
+
+    def check_identifier(self, code: str, name: str, context: str, path: str) -> None:
+        problem = _check_c_identifier(name, context)
+        if problem is not None:
+            self.report(problem[0], code, path, problem[1])
+
+    def report(self, severity: Severity, code: str, path: str, message: str) -> None:
+        self.diagnostics.append(Diagnostic(severity, code, path, message))
+
+
+def validate(instance) -> List[Diagnostic]:
     """
-    Check for endpoint ID conflicts.
+    Run all validations in a single pass over the device tree.
 
     Args:
         instance: Root node to validate
 
     Returns:
-        List of error messages (empty if no conflicts)
+        List of diagnostics in tree order (empty if validation passes)
     """
-    from avlos.generators.filters import avlos_endpoints
+    return _Validator().run(instance)
 
-    errors = []
-    ep_id_map = {}
 
-    for ep in avlos_endpoints(instance):
-        ep_id = ep.ep_id
-        if ep_id in ep_id_map:
-            errors.append(f"Duplicate endpoint ID {ep_id}: " f"'{ep.full_name}' and '{ep_id_map[ep_id].full_name}'")
-        else:
-            ep_id_map[ep_id] = ep
+def _errors(instance, codes=None) -> List[str]:
+    return [
+        diagnostic.message
+        for diagnostic in validate(instance)
+        if diagnostic.severity is Severity.ERROR and (codes is None or diagnostic.code in codes)
+    ]
 
-    return errors
+
+def validate_endpoint_ids(instance) -> List[str]:
+    """
+    Check for endpoint ID conflicts.
+
+    Args:
+        instance: Root node to validate
+
+    Returns:
+        List of error messages (empty if no conflicts)
+    """
+    return _errors(instance, {"duplicate-ep-id"})
 
 
 def validate_function_names(instance) -> List[str]:
@@ -127,44 +250,7 @@ def validate_function_names(instance) -> List[str]:
     Returns:
         List of error messages (empty if no conflicts)
     """
-    from avlos.generators.filters import avlos_endpoints
-
-    errors = []
-
-    # Check getter/setter/caller names are valid C identifiers
-    for ep in avlos_endpoints(instance):
-        if hasattr(ep, "getter_name") and ep.getter_name:
-            try:
-                validate_c_identifier(ep.getter_name, f"getter for {ep.full_name}")
-            except ValidationError as e:
-                errors.append(str(e))
-
-        if hasattr(ep, "setter_name") and ep.setter_name:
-            try:
-                validate_c_identifier(ep.setter_name, f"setter for {ep.full_name}")
-            except ValidationError as e:
-                errors.append(str(e))
-
-        if hasattr(ep, "caller_name") and ep.caller_name:
-            try:
-                validate_c_identifier(ep.caller_name, f"caller for {ep.full_name}")
-            except ValidationError as e:
-                errors.append(str(e))
-
-    # Check for endpoint function name collisions
-    # (endpoint functions are named: avlos_{full_name with dots replaced by underscores})
-    endpoint_names = {}
-    for ep in avlos_endpoints(instance):
-        ep_func_name = "avlos_" + ep.full_name.replace(".", "_")
-        if ep_func_name in endpoint_names:
-            errors.append(
-                f"Endpoint function name collision: '{ep_func_name}' "
-                f"generated from both '{ep.full_name}' and '{endpoint_names[ep_func_name]}'"
-            )
-        else:
-            endpoint_names[ep_func_name] = ep.full_name
-
-    return errors
+    return _errors(instance, {"getter-name", "setter-name", "caller-name", "function-name-collision"})
 
 
 def validate_names(instance) -> List[str]:
@@ -177,25 +263,7 @@ def validate_names(instance) -> List[str]:
     Returns:
         List of error messages (empty if all valid)
     """
-    errors = []
-
-    def traverse_nodes(node, path=""):
-        # Validate node name
-        current_path = f"{path}.{node.name}" if path else node.name
-        try:
-            # Node names become part of full_name which becomes C function name
-            # So they should be valid C identifier parts
-            validate_c_identifier(node.name, f"node name at {current_path}")
-        except ValidationError as e:
-            errors.append(str(e))
-
-        # Recursively check children
-        if hasattr(node, "remote_attributes"):
-            for child in node.remote_attributes.values():
-                traverse_nodes(child, current_path)
-
-    traverse_nodes(instance)
-    return errors
+    return _errors(instance, {"node-name"})
 
 
 def validate_all(instance) -> List[str]:
@@ -208,11 +276,28 @@ def validate_all(instance) -> List[str]:
     Returns:
         List of all error messages (empty if validation passes)
     """
-    errors = []
+    return _errors(instance)
 
-    # Collect all validation errors
-    errors.extend(validate_names(instance))
-    errors.extend(validate_endpoint_ids(instance))
-    errors.extend(validate_function_names(instance))
 
-    return errors
+def validate_for_generation(instance) -> List[Diagnostic]:
+    """
+    Validate a device tree before code generation. Warnings
+    are issued with warnings.warn, so that callers may filter
+    or record them.
+
+    Args:
+        instance: Root node to validate
+
+    Returns:
+        List of the warning diagnostics
+
+    Raises:
+        ValidationError: Listing all errors, if any
+    """
+    diagnostics = validate(instance)
+    errors = [diagnostic for diagnostic in diagnostics if diagnostic.severity is Severity.ERROR]
+    if errors:
+        raise ValidationError("Validation failed:\n" + "\n".join(f"  - {err}" for err in errors))
+    for diagnostic in diagnostics:
+        warnings.warn(str(diagnostic), stacklevel=2)
+    return diagnostics
@@ -0,0 +1,70 @@
+import time
+
+
+class ValueCache:
+    """
+    Client-side cache of the responses of remote endpoints.
+    Endpoints without the dynamic meta flag are cached until
+    they are written or the cache is cleared. Dynamic endpoints
+    are cached for ttl seconds. Responses are cached as
+    received, so that they are decoded according to the
+    current raw_values mode.
+    """
+
+    def __init__(self, ttl=0.0):
+        """
+        Args:
+            ttl: The time in seconds that the values of dynamic
+                 endpoints are cached for. Zero disables caching
+                 of dynamic endpoints.
+        """
+        self.ttl = ttl
+        self._entries = {}
+
+    def get(self, endpoint):
+        """
+        Get the cached response of an endpoint.
+
+        Args:
+            endpoint: The remote endpoint object
+
+        Returns:
+            The cached response data, or None on a miss
+        """
+        try:
+            data, expiry = self._entries[endpoint.ep_id]
+        except KeyError:
+            return None
+        if expiry is not None and time.monotonic() >= expiry:
+            self._entries.pop(endpoint.ep_id, None)
+            return None
+        return data
+
+    def put(self, endpoint, data):
+        """
+        Cache the response of an endpoint.
+
+        Args:
+            endpoint: The remote endpoint object
+            data: The response data, as returned by the channel
+        """
+        if not endpoint.meta.get("dynamic", False):
+            self._entries[endpoint.ep_id] = (data, None)
+        elif self.ttl > 0:
+            self._entries[endpoint.ep_id] = (data, time.monotonic() + self.ttl)
+
+    def invalidate(self, endpoint=None):
+        """
+        Drop the cached response of an endpoint, or of all
+        endpoints if none is given.
+
+        Args:
+            endpoint: Optional remote endpoint object
+        """
+        if endpoint is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(endpoint.ep_id, None)
+
+    def __len__(self):
+        return len(self._entries)
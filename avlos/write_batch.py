@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from itertools import groupby
+
+from avlos.channel import BaseChannel
+from avlos.chunked import asend_chunks, send_chunks
+
+
+class WriteBatch:
+    """
+    Pending writes of a device, gathered while a batch is
+    open. Only the last write to each endpoint is kept, and
+    all writes are sent in a single burst on flush.
+    """
+
+    def __init__(self, root):
+        """
+        Args:
+            root: The root node of the device
+        """
+        self.root = root
+        self._writes = OrderedDict()
+
+    def add(self, endpoint, data):
+        """
+        Add a write, replacing any pending write to the same endpoint.
+
+        Args:
+            endpoint: The remote endpoint object
+            data: The serialized value, as accepted by the channel
+        """
+        if isinstance(data, memoryview):
+            # The endpoint's scratch buffer is reused, keep a copy
+            data = bytes(data)
+        # Keep the writes in the order of their last update
+        self._writes.pop(endpoint.ep_id, None)
+        self._writes[endpoint.ep_id] = (endpoint, data)
+
+    def flush(self):
+        """
+        Send all pending writes.
+        """
+        if not self._writes:
+            return
+        writes = list(self._writes.values())
+        self._writes.clear()
+        channel = self.root.channel
+        with self.root.transaction(*(endpoint.ep_id for endpoint, _ in writes)):
+            # Writes are sent in queue order, with each chunked write
+            # ending a burst of single frame writes
+            for chunked, group in groupby(writes, key=lambda write: write[0].chunked):
+                if chunked:
+                    for endpoint, data in group:
+                        send_chunks(channel, data, endpoint.ep_id)
+                elif isinstance(channel, BaseChannel):
+                    channel.send_many([(data, endpoint.ep_id) for endpoint, data in group])
+                else:
+                    for endpoint, data in group:
+                        channel.send(data, endpoint.ep_id)
+        self._invalidate(writes)
+
+    async def aflush(self):
+        """
+        Send all pending writes over an AsyncBaseChannel.
+        """
+        if not self._writes:
+            return
+        writes = list(self._writes.values())
+        self._writes.clear()
+        channel = self.root.channel
+        for chunked, group in groupby(writes, key=lambda write: write[0].chunked):
+            if chunked:
+                for endpoint, data in group:
+                    await asend_chunks(channel, data, endpoint.ep_id)
+            else:
+                await channel.send_many([(data, endpoint.ep_id) for endpoint, data in group])
+        self._invalidate(writes)
+
+    def _invalidate(self, writes):
+        cache = self.root.value_cache
+        if cache is not None:
+            for endpoint, _ in writes:
+                cache.invalidate(endpoint)
+
+    def discard(self):
+        """
+        Drop all pending writes.
+        """
+        self._writes.clear()
+
+    def __len__(self):
+        return len(self._writes)
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import pytest
+import yaml
+
+from avlos.deserializer import deserialize
+from avlos.synthetic import synthesize_spec
+from tests.dummy_channel import SeqLoopbackChannel
+
+REPO_ROOT = Path(__file__).parent.parent
+
+
+class LatencyChannel(SeqLoopbackChannel):
+    """
+    Loopback channel with an injected latency, whose endpoints
+    that were never written respond with zeros
+    """
+
+    def recv_seq(self, ep_id, seq, timeout=0.1):
+        try:
+            return super().recv_seq(ep_id, seq, timeout)
+        except TimeoutError:
+            return bytes(8) if seq == 0 else b""
+
+
+def load_spec(path):
+    with open(REPO_ROOT / path) as device_description:
+        return yaml.safe_load(device_description)
+
+
+@pytest.fixture(scope="session")
+def small_spec():
+    return load_spec("tests/definition/good_device.yaml")
+
+
+@pytest.fixture(scope="session")
+def large_spec():
+    return synthesize_spec(depth=3, fan_out=4, endpoints=8)
+
+
+@pytest.fixture
+def device(small_spec):
+    device = deserialize(small_spec)
+    device.set_channel(LatencyChannel())
+    return device
+
+
+@pytest.fixture
+def slow_device(small_spec):
+    device = deserialize(small_spec)
+    device.set_channel(LatencyChannel(latency=0.0001))
+    return device
@@ -0,0 +1,22 @@
+from avlos.deserializer import deserialize
+
+
+def test_deserialize_small(benchmark, small_spec):
+    benchmark(deserialize, small_spec)
+
+
+def test_deserialize_large(benchmark, large_spec):
+    benchmark(deserialize, large_spec)
+
+
+def test_deserialize_small_unvalidated(benchmark, small_spec):
+    benchmark(deserialize, small_spec, validate=False)
+
+
+def test_deserialize_large_unvalidated(benchmark, large_spec):
+    benchmark(deserialize, large_spec, validate=False)
+
+
+def test_deserialize_large_cached(benchmark, large_spec, tmp_path):
+    deserialize(large_spec, cache_dir=str(tmp_path))
+    benchmark(deserialize, large_spec, cache_dir=str(tmp_path))
@@ -0,0 +1,51 @@
+import json
+
+from avlos.json_codec import AvlosEncoder
+
+
+def test_get_value(benchmark, device):
+    benchmark(device.motor.remote_attributes["R"].get_value)
+
+
+def test_set_value(benchmark, device):
+    benchmark(device.motor.remote_attributes["R"].set_value, 0.5)
+
+
+def test_get_enum(benchmark, device):
+    benchmark(device.controller.remote_attributes["mode"].get_value)
+
+
+def test_get_string(benchmark, device):
+    nickname = device.remote_attributes["nickname"]
+    nickname.set_value("a much longer device name")
+    benchmark(nickname.get_value)
+
+
+def test_call_function(benchmark, device):
+    benchmark(device.controller.set_pos_vel_setpoints, 1.0, 2.0)
+
+
+def test_call_void_function(benchmark, device):
+    benchmark(device.move_to, 1.0)
+
+
+def test_get_value_latency(benchmark, slow_device):
+    benchmark(slow_device.motor.remote_attributes["R"].get_value)
+
+
+def test_read_many_latency(benchmark, slow_device):
+    paths = ["motor.R", "motor.L", "encoder.bandwidth", "encoder.position_estimate", "Vbus"]
+    benchmark(slow_device.read_many, paths)
+
+
+def test_str_dump(benchmark, device):
+    benchmark(str, device)
+
+
+def test_export_values(benchmark, device):
+    benchmark(device.export_values)
+
+
+def test_import_values(benchmark, device):
+    values = json.loads(json.dumps(device.export_values(), cls=AvlosEncoder))
+    benchmark(device.import_values, values)
@@ -0,0 +1,114 @@
+import math
+import time
+
+import pytest
+
+from avlos.deserializer import deserialize
+from avlos.generators import generator_c, generator_cpp
+from avlos.incremental import MANIFEST_NAME
+from avlos.synthetic import spec_size, synthesize_spec
+from avlos.validation import validate_all
+
+# Shapes growing in width, with a fixed depth, and in depth, with a single node per level
+WIDE_SHAPES = [dict(depth=2, fan_out=4, endpoints=endpoints) for endpoints in (8, 16, 32, 64)]
+DEEP_SHAPES = [dict(depth=depth, fan_out=1, endpoints=8) for depth in (8, 16, 32, 64)]
+
+# Max growth exponent of time against endpoint count. Linear
+# operations measure close to 1, quadratic ones close to 2.
+MAX_EXPONENT = 1.5
+
+
+def c_config(path):
+    return {
+        "paths": {
+            "output_enums": str(path / "enums.h"),
+            "output_header": str(path / "device.h"),
+            "output_impl": str(path / "device.c"),
+        }
+    }
+
+
+def cpp_config(path):
+    return {
+        "paths": {
+            "output_helpers": str(path / "helpers.hpp"),
+            "output_header": str(path / "device.hpp"),
+            "output_impl": str(path / "device.cpp"),
+        }
+    }
+
+
+def forget_outputs(path):
+    """
+    Remove the manifests of the incremental writer, so that
+    every run renders all files
+    """
+    for manifest in path.rglob(MANIFEST_NAME):
+        manifest.unlink()
+
+
+def generate(generator, device, config, path):
+    forget_outputs(path)
+    generator.process(device, config)
+
+
+def operations(tmp_path):
+    return {
+        "deserialize": lambda spec, device: deserialize(spec),
+        "deserialize_unvalidated": lambda spec, device: deserialize(spec, validate=False),
+        "validate_all": lambda spec, device: validate_all(device),
+        "generator_c": lambda spec, device: generate(generator_c, device, c_config(tmp_path), tmp_path),
+        "generator_cpp": lambda spec, device: generate(generator_cpp, device, cpp_config(tmp_path), tmp_path),
+    }
+
+
+def best_time(func, repeat=5):
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def growth_exponent(sizes, times):
+    """
+    Least squares slope of log(time) against log(size)
+    """
+    log_sizes = [math.log(size) for size in sizes]
+    log_times = [math.log(t) for t in times]
+    mean_size = sum(log_sizes) / len(log_sizes)
+    mean_time = sum(log_times) / len(log_times)
+    covariance = sum((s - mean_size) * (t - mean_time) for s, t in zip(log_sizes, log_times))
+    return covariance / sum((s - mean_size) ** 2 for s in log_sizes)
+
+
+@pytest.mark.parametrize(
+    "operation", ["deserialize", "deserialize_unvalidated", "validate_all", "generator_c", "generator_cpp"]
+)
+@pytest.mark.parametrize(
+    "shape", WIDE_SHAPES + DEEP_SHAPES, ids=lambda shape: "d{depth}-f{fan_out}-e{endpoints}".format(**shape)
+)
+def test_scaling(benchmark, tmp_path, operation, shape):
+    benchmark.group = operation
+    benchmark.extra_info["endpoints"] = spec_size(**shape)[1]
+    spec = synthesize_spec(**shape)
+    device = deserialize(spec)
+    func = operations(tmp_path)[operation]
+    benchmark(func, spec, device)
+
+
+@pytest.mark.parametrize(
+    "operation", ["deserialize", "deserialize_unvalidated", "validate_all", "generator_c", "generator_cpp"]
+)
+@pytest.mark.parametrize("shapes", [WIDE_SHAPES, DEEP_SHAPES], ids=["wide", "deep"])
+def test_complexity(tmp_path, operation, shapes):
+    func = operations(tmp_path)[operation]
+    sizes, times = [], []
+    for shape in shapes:
+        spec = synthesize_spec(**shape)
+        device = deserialize(spec)
+        sizes.append(spec_size(**shape)[1])
+        times.append(best_time(lambda: func(spec, device)))
+    exponent = growth_exponent(sizes, times)
+    assert exponent < MAX_EXPONENT, "{} grows as n^{:.2f} over {} endpoints".format(operation, exponent, sizes)
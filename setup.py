@@ -27,6 +27,6 @@ setup(
     python_requires=">=3.9",
     setup_requires=["setuptools_scm"],
     install_requires=["marshmallow", "pyyaml", "pint", "docopt", "jinja2"],
-    extras_require={"dev": ["rstcheck"]},
+    extras_require={"dev": ["rstcheck", "pytest-benchmark"], "numpy": ["numpy"]},
     entry_points={"console_scripts": ["avlos=avlos.cli:run_cli"]},
 )
@@ -1,3 +1,10 @@
+import asyncio
+import time
+
+from avlos.channel import AsyncBaseChannel, BaseChannel
+from avlos.struct_codec import StructCodec
+
+
 class DummyChannel:
     """
     Dummy channel class
@@ -38,3 +45,92 @@ class DummyCodec:
 
     def deserialize(self, data, *args):
         return data
+
+
+class ListCodec:
+    """
+    CODEC class passing values as lists
+    """
+
+    def serialize(self, values, *args):
+        return list(values)
+
+    def deserialize(self, data, *args):
+        return data
+
+
+class SeqLoopbackChannel(BaseChannel):
+    """
+    Loopback channel with 8 byte frames and chunked transfers,
+    that returns the frames sent to each endpoint by sequence
+    number after an optional latency, and records the frames
+    sent
+    """
+
+    chunked_transfers = True
+    max_packet_size = 8
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.frames = {}
+        self.sent = []
+
+    def send(self, data, ep_id):
+        self.send_seq(data, ep_id, 0)
+
+    def send_seq(self, data, ep_id, seq):
+        self.sent.append((ep_id, seq, bytes(data)))
+        if len(data) > 0 or seq > 0:
+            self.frames[(ep_id, seq)] = bytes(data)
+
+    def recv(self, ep_id, timeout=0.1):
+        return self.recv_seq(ep_id, 0, timeout)
+
+    def recv_seq(self, ep_id, seq, timeout=0.1):
+        if self.latency > 0:
+            time.sleep(self.latency)
+        try:
+            return self.frames[(ep_id, seq)]
+        except KeyError:
+            raise TimeoutError
+
+    @property
+    def serializer(self):
+        return StructCodec()
+
+
+class AsyncSeqLoopbackChannel(AsyncBaseChannel):
+    """
+    Async counterpart of SeqLoopbackChannel, that yields
+    to the event loop on every transfer
+    """
+
+    chunked_transfers = True
+    max_packet_size = 8
+
+    def __init__(self):
+        self.frames = {}
+        self.sent = []
+
+    async def send(self, data, ep_id):
+        await self.send_seq(data, ep_id, 0)
+
+    async def send_seq(self, data, ep_id, seq):
+        await asyncio.sleep(0)
+        self.sent.append((ep_id, seq, bytes(data)))
+        if len(data) > 0 or seq > 0:
+            self.frames[(ep_id, seq)] = bytes(data)
+
+    async def recv(self, ep_id, timeout=0.1):
+        return await self.recv_seq(ep_id, 0, timeout)
+
+    async def recv_seq(self, ep_id, seq, timeout=0.1):
+        await asyncio.sleep(0)
+        try:
+            return self.frames[(ep_id, seq)]
+        except KeyError:
+            raise TimeoutError
+
+    @property
+    def serializer(self):
+        return StructCodec()
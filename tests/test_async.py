@@ -0,0 +1,122 @@
+import asyncio
+import importlib.resources
+import unittest
+
+import yaml
+
+from avlos.channel import AsyncBaseChannel
+from avlos.deserializer import deserialize
+from avlos.struct_codec import StructCodec
+from avlos.unit_field import get_registry
+from tests.dummy_channel import AsyncSeqLoopbackChannel, DummyCodec
+
+_reg = get_registry()
+
+
+class AsyncDummyChannel(AsyncBaseChannel):
+    """
+    Async counterpart of DummyChannel that yields
+    to the event loop on every transfer
+    """
+
+    def __init__(self, value=0):
+        self.value = value
+        self.sent = []
+
+    async def send(self, data, ep_id):
+        await asyncio.sleep(0)
+        self.sent.append((data, ep_id))
+
+    async def recv(self, ep_id, timeout=0.1):
+        await asyncio.sleep(0)
+        return [self.value]
+
+    @property
+    def serializer(self):
+        return DummyCodec()
+
+
+def load_device():
+    def_path_str = str(importlib.resources.files("tests").joinpath("definition/good_device.yaml"))
+    with open(def_path_str) as device_description:
+        return deserialize(yaml.safe_load(device_description))
+
+
+class TestAsync(unittest.IsolatedAsyncioTestCase):
+    async def test_aget_value(self):
+        obj = load_device()
+        obj._channel = AsyncDummyChannel(12.0)
+        self.assertEqual(12.0 * _reg("volt"), await obj.remote_attributes["Vbus"].aget_value())
+
+    async def test_aset_value(self):
+        obj = load_device()
+        obj._channel = AsyncDummyChannel()
+        await obj.motor.remote_attributes["R"].aset_value(2 * _reg("ohm"))
+        await obj.controller.remote_attributes["mode"].aset_value("CLOSED_LOOP")
+        self.assertEqual(2, obj._channel.sent[0][0])
+        self.assertEqual(1, obj._channel.sent[1][0])
+
+    async def test_acall(self):
+        obj = load_device()
+        obj._channel = AsyncDummyChannel(100.0)
+        self.assertEqual(100 * _reg("tick"), await obj.controller.remote_attributes["set_pos_vel_setpoints"].acall(0, 0))
+        self.assertIsNone(await obj.remote_attributes["move_to"].acall(1 * _reg("turn")))
+        self.assertEqual(8192, obj._channel.sent[-1][0])
+
+    async def test_aread(self):
+        obj = load_device()
+        obj._channel = AsyncDummyChannel(1)
+        self.assertEqual([1 * _reg("volt"), 1 * _reg("ohm")], await obj.aread(["Vbus", "motor.R"]))
+
+    async def test_many_devices(self):
+        devices = [load_device() for _ in range(10)]
+        for i, device in enumerate(devices):
+            device._channel = AsyncDummyChannel(i)
+        values = await asyncio.gather(*[device.remote_attributes["sn"].aget_value() for device in devices])
+        self.assertEqual(list(range(10)), values)
+
+    async def test_value_cache(self):
+        obj = load_device()
+        obj._channel = AsyncSeqLoopbackChannel()
+        obj.enable_cache()
+        r = obj.motor.remote_attributes["R"]
+        await r.aset_value(2 * _reg("ohm"))
+        self.assertEqual(2 * _reg("ohm"), await r.aget_value())
+        self.assertEqual([2 * _reg("ohm")], await obj.aread(["motor.R"]))
+        await r.aset_value(3 * _reg("ohm"))
+        self.assertEqual(3 * _reg("ohm"), await r.aget_value())
+        await obj.remote_attributes["reset"].acall()
+        self.assertEqual(3 * _reg("ohm"), await r.aget_value())
+        requests = [ep_id for ep_id, _, data in obj._channel.sent if ep_id == r.ep_id and not data]
+        # Read after each write and after the reset
+        self.assertEqual(3, len(requests))
+
+    async def test_abatch(self):
+        obj = load_device()
+        obj._channel = AsyncSeqLoopbackChannel()
+        r = obj.motor.remote_attributes["R"]
+        async with obj.abatch():
+            await r.aset_value(2 * _reg("ohm"))
+            await r.aset_value(3 * _reg("ohm"))
+            self.assertEqual([], obj._channel.sent)
+            # Pending writes are flushed before reads
+            self.assertEqual(3 * _reg("ohm"), await r.aget_value())
+            await obj.motor.remote_attributes["L"].aset_value(1 * _reg("henry"))
+        self.assertEqual(
+            [r.ep_id, r.ep_id, obj.motor.remote_attributes["L"].ep_id],
+            [ep_id for ep_id, _, _ in obj._channel.sent],
+        )
+
+    async def test_chunked_string(self):
+        obj = load_device()
+        obj._channel = AsyncSeqLoopbackChannel()
+        nickname = obj.remote_attributes["nickname"]
+        self.assertTrue(nickname.chunked)
+        await nickname.aset_value("a much longer device name")
+        self.assertEqual(4, len([key for key in obj._channel.frames if key[0] == nickname.ep_id]))
+        self.assertEqual("a much longer device name", await nickname.aget_value())
+        await obj.motor.remote_attributes["R"].aset_value(2 * _reg("ohm"))
+        self.assertEqual(
+            [2 * _reg("ohm"), "a much longer device name", 2 * _reg("ohm")],
+            await obj.aread(["motor.R", "nickname", "motor.R"]),
+        )
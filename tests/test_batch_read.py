@@ -0,0 +1,86 @@
+import importlib.resources
+import unittest
+
+import yaml
+
+from avlos.channel import BaseChannel
+from avlos.deserializer import deserialize
+from avlos.unit_field import get_registry
+from tests.dummy_channel import DummyChannel, DummyCodec
+
+_reg = get_registry()
+
+
+class RecordingChannel(BaseChannel):
+    """
+    Channel that replies with a constant value and
+    records the order of operations
+    """
+
+    def __init__(self):
+        self.log = []
+
+    def send(self, data, ep_id):
+        self.log.append(("send", ep_id))
+
+    def recv(self, ep_id, timeout=0.1):
+        self.log.append(("recv", ep_id))
+        return [1]
+
+    def send_many(self, requests):
+        self.log.append(("send_many", len(requests)))
+        super().send_many(requests)
+
+    @property
+    def serializer(self):
+        return DummyCodec()
+
+
+class TestBatchRead(unittest.TestCase):
+    def setUp(self):
+        def_path_str = str(importlib.resources.files("tests").joinpath("definition/good_device.yaml"))
+        with open(def_path_str) as device_description:
+            self.obj = deserialize(yaml.safe_load(device_description))
+
+    def test_read_many_sends_before_receiving(self):
+        self.obj._channel = RecordingChannel()
+        values = self.obj.read_many(["Vbus", "motor.R"])
+        vbus = self.obj.remote_attributes["Vbus"]
+        r = self.obj.motor.remote_attributes["R"]
+        self.assertEqual([1 * _reg("volt"), 1 * _reg("ohm")], values)
+        self.assertEqual(
+            [("send_many", 2), ("send", vbus.ep_id), ("send", r.ep_id), ("recv", vbus.ep_id), ("recv", r.ep_id)],
+            self.obj._channel.log,
+        )
+
+    def test_read_many_duck_typed_channel(self):
+        self.obj._channel = DummyChannel(5)
+        self.assertEqual([5 * _reg("volt"), 5 * _reg("ohm")], self.obj.read_many(["Vbus", "motor.R"]))
+
+    def test_read_many_unknown_path(self):
+        self.obj._channel = RecordingChannel()
+        with self.assertRaises(AttributeError):
+            self.obj.read_many(["motor.foo"])
+
+    def test_snapshot(self):
+        self.obj._channel = RecordingChannel()
+        snapshot = self.obj.snapshot()
+        self.assertIn("Vbus", snapshot)
+        self.assertIn("motor.R", snapshot)
+        self.assertIn("controller.mode", snapshot)
+        self.assertNotIn("reset", snapshot)
+        self.assertEqual(1, sum(1 for op in self.obj._channel.log if op[0] == "send_many"))
+        self.assertEqual(len(snapshot), sum(1 for op in self.obj._channel.log if op[0] == "recv"))
+
+    def test_str_dump_single_batch(self):
+        self.obj._channel = RecordingChannel()
+        dump = str(self.obj)
+        self.assertEqual(1, sum(1 for op in self.obj._channel.log if op[0] == "send_many"))
+        self.assertIn("Vbus [float]", dump)
+
+    def test_export_single_batch(self):
+        self.obj._channel = RecordingChannel()
+        values = self.obj.export_values()
+        self.assertEqual(1, sum(1 for op in self.obj._channel.log if op[0] == "send_many"))
+        self.assertIn("motor", values)
+        self.assertIn("R", values["motor"])
@@ -0,0 +1,93 @@
+import importlib.resources
+import unittest
+
+import yaml
+
+from avlos.channel import BaseChannel
+from avlos.chunked import MAX_CHUNKS, recv_chunks, send_chunks, split_chunks
+from avlos.deserializer import deserialize
+from avlos.struct_codec import StructCodec
+from tests.dummy_channel import DummyChannel, SeqLoopbackChannel
+
+
+class TestChunked(unittest.TestCase):
+    def setUp(self):
+        def_path_str = str(importlib.resources.files("tests").joinpath("definition/good_device.yaml"))
+        with open(def_path_str) as device_description:
+            self.obj = deserialize(yaml.safe_load(device_description))
+        self.channel = SeqLoopbackChannel()
+        self.obj._channel = self.channel
+        self.nickname = self.obj.remote_attributes["nickname"]
+
+    def test_split(self):
+        self.assertEqual([b"abc"], [bytes(c) for c in split_chunks(b"abc", 8)])
+        self.assertEqual([b"abcdefgh", b""], [bytes(c) for c in split_chunks(b"abcdefgh", 8)])
+        self.assertEqual([b"abcdefgh", b"ij"], [bytes(c) for c in split_chunks(b"abcdefghij", 8)])
+        with self.assertRaises(ValueError):
+            split_chunks(bytes(8 * MAX_CHUNKS), 8)
+
+    def test_roundtrip(self):
+        for payload in [b"abc", b"abcdefgh", bytes(range(100))]:
+            send_chunks(self.channel, payload, 5)
+            self.assertEqual(payload, recv_chunks(self.channel, 5))
+
+    def test_long_string(self):
+        self.assertTrue(self.nickname.chunked)
+        self.obj.nickname = "a much longer device name"
+        frames = [(seq, data) for ep_id, seq, data in self.channel.sent if ep_id == self.nickname.ep_id]
+        self.assertEqual([0, 1, 2, 3], [seq for seq, _ in frames])
+        self.assertEqual(b"e\0", frames[-1][1])
+        self.assertEqual("a much longer device name", self.obj.nickname)
+
+    def test_short_string_single_frame(self):
+        self.obj.nickname = "tm1"
+        self.assertEqual([(self.nickname.ep_id, 0, b"tm1\0")], self.channel.sent)
+        self.assertEqual("tm1", self.obj.nickname)
+
+    def test_batch(self):
+        with self.obj.batch():
+            self.obj.nickname = "first"
+            self.obj.nickname = "a much longer device name"
+        self.assertEqual("a much longer device name", self.obj.nickname)
+
+    def test_batch_order(self):
+        r = self.obj.motor.remote_attributes["R"]
+        inductance = self.obj.motor.remote_attributes["L"]
+        with self.obj.batch():
+            self.obj.motor.R = 1
+            self.obj.nickname = "a much longer device name"
+            self.obj.motor.L = 2
+        self.assertEqual(
+            [r.ep_id] + [self.nickname.ep_id] * 4 + [inductance.ep_id],
+            [ep_id for ep_id, _, _ in self.channel.sent],
+        )
+
+    def test_read_many(self):
+        self.obj.nickname = "a much longer device name"
+        self.obj.motor.R = 2
+        self.obj.motor.L = 3
+        self.channel.sent.clear()
+        self.assertEqual(
+            [2, "a much longer device name", 3],
+            [getattr(value, "magnitude", value) for value in self.obj.read_many(["motor.R", "nickname", "motor.L"])],
+        )
+
+    def test_not_chunked_channel(self):
+        class SingleFrameChannel(SeqLoopbackChannel):
+            chunked_transfers = False
+
+        channel = SingleFrameChannel()
+        self.obj.set_channel(channel)
+        self.assertFalse(self.nickname.chunked)
+        # A string filling a whole frame is sent as is, and its
+        # response does not wait for a terminating frame
+        self.obj.nickname = "tinymovr"
+        self.assertEqual([(self.nickname.ep_id, 0, b"tinymovr")], channel.sent)
+        self.assertEqual("tinymovr", self.obj.nickname)
+
+    def test_not_chunked(self):
+        self.assertFalse(self.obj.motor.remote_attributes["R"].chunked)
+        with open(str(importlib.resources.files("tests").joinpath("definition/good_device.yaml"))) as device_description:
+            obj = deserialize(yaml.safe_load(device_description))
+        obj._channel = DummyChannel()
+        self.assertFalse(obj.remote_attributes["nickname"].chunked)
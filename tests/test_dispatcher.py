@@ -0,0 +1,174 @@
+import importlib.resources
+import queue
+import threading
+import unittest
+
+import yaml
+
+from avlos.channel import BaseChannel
+from avlos.chunked import split_chunks
+from avlos.deserializer import deserialize
+from avlos.dispatcher import DispatchingChannel
+from avlos.struct_codec import StructCodec
+from avlos.unit_field import get_registry
+from tests.dummy_channel import DummyCodec, SeqLoopbackChannel
+
+_reg = get_registry()
+
+
+class BusChannel(BaseChannel):
+    """
+    Channel delivering frames from a shared bus queue,
+    in the order they were put on the bus
+    """
+
+    def __init__(self):
+        self.bus = queue.Queue()
+        self.sent = []
+
+    def send(self, data, ep_id):
+        self.sent.append(ep_id)
+
+    def recv_frame(self, timeout=0.1):
+        try:
+            return self.bus.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    @property
+    def serializer(self):
+        return DummyCodec()
+
+
+class StructBusChannel(SeqLoopbackChannel):
+    """
+    Loopback channel with 8 byte frames, recording the frames
+    sent and their sequence numbers, that delivers frames from
+    a shared bus queue
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.bus = queue.Queue()
+
+    recv_frame = BusChannel.recv_frame
+
+
+class TestDispatcher(unittest.TestCase):
+    def setUp(self):
+        def_path_str = str(importlib.resources.files("tests").joinpath("definition/good_device.yaml"))
+        with open(def_path_str) as device_description:
+            self.obj = deserialize(yaml.safe_load(device_description))
+        self.bus = BusChannel()
+        self.channel = DispatchingChannel(self.bus, self.obj)
+        self.obj._channel = self.channel
+        self.vbus = self.obj.remote_attributes["Vbus"]
+        self.r = self.obj.motor.remote_attributes["R"]
+
+    def test_out_of_order_responses(self):
+        self.channel.send([], self.vbus.ep_id)
+        self.channel.send([], self.r.ep_id)
+        self.bus.bus.put((self.r.ep_id, [2.0]))
+        self.bus.bus.put((self.vbus.ep_id, [1.0]))
+        self.assertEqual([1.0], self.channel.recv(self.vbus.ep_id))
+        self.assertEqual([2.0], self.channel.recv(self.r.ep_id))
+
+    def test_requests_in_flight_to_same_endpoint(self):
+        self.channel.send([], self.vbus.ep_id)
+        self.bus.bus.put((self.vbus.ep_id, [12.0]))
+        self.channel.poll()
+        self.channel.send([], self.vbus.ep_id)
+        self.bus.bus.put((self.vbus.ep_id, [24.0]))
+        self.assertEqual(12.0 * _reg("volt"), self.vbus.decode_value(self.channel.recv(self.vbus.ep_id)))
+        self.assertEqual(24.0 * _reg("volt"), self.vbus.decode_value(self.channel.recv(self.vbus.ep_id)))
+
+    def test_stale_frames_not_returned(self):
+        heard = []
+        self.channel.add_listener(self.vbus.ep_id, heard.append)
+        # A request times out, and its reply arrives late
+        self.channel.send([], self.vbus.ep_id)
+        with self.assertRaises(TimeoutError):
+            self.channel.recv(self.vbus.ep_id, timeout=0.01)
+        self.bus.bus.put((self.vbus.ep_id, [1.0]))
+        # Frames streamed to the listener
+        for value in (2.0, 3.0, 4.0):
+            self.bus.bus.put((self.vbus.ep_id, [value]))
+        for _ in range(4):
+            self.channel.poll()
+        self.assertEqual([[1.0], [2.0], [3.0], [4.0]], heard)
+        self.bus.bus.put((self.vbus.ep_id, [99.0]))
+        self.assertEqual(99.0 * _reg("volt"), self.obj.Vbus)
+
+    def test_concurrent_readers(self):
+        eps = [self.vbus, self.r, self.obj.motor.remote_attributes["L"]]
+        results = {}
+
+        def reader(ep):
+            results[ep.ep_id] = self.channel.recv(ep.ep_id, timeout=2.0)
+
+        threads = [threading.Thread(target=reader, args=(ep,)) for ep in eps]
+        for thread in threads:
+            thread.start()
+        for ep in reversed(eps):
+            self.bus.bus.put((ep.ep_id, [ep.ep_id]))
+        for thread in threads:
+            thread.join()
+        self.assertEqual({ep.ep_id: [ep.ep_id] for ep in eps}, results)
+
+    def test_listeners_and_unsolicited(self):
+        heard = []
+        unsolicited = []
+        self.channel.add_listener(self.vbus.ep_id, heard.append)
+        self.channel.add_unsolicited_handler(lambda ep_id, data: unsolicited.append(ep_id))
+        self.bus.bus.put((self.vbus.ep_id, [1.0]))
+        self.bus.bus.put((0x7FF, [0]))
+        self.channel.poll()
+        self.channel.poll()
+        self.assertEqual([[1.0]], heard)
+        self.assertEqual([0x7FF], unsolicited)
+
+    def test_listener_called_without_lock(self):
+        results = []
+
+        def reader():
+            results.append(self.channel.recv(self.r.ep_id, timeout=1.0))
+
+        def callback(data):
+            # Blocks unless the dispatcher is free while calling back
+            self.bus.bus.put((self.r.ep_id, [2.0]))
+            thread = threading.Thread(target=reader)
+            thread.start()
+            thread.join(1.0)
+
+        self.channel.add_listener(self.vbus.ep_id, callback)
+        self.bus.bus.put((self.vbus.ep_id, [1.0]))
+        self.channel.poll()
+        self.assertEqual([[2.0]], results)
+
+    def test_timeout(self):
+        with self.assertRaises(TimeoutError):
+            self.channel.recv(self.vbus.ep_id, timeout=0.01)
+
+    def test_chunked_string(self):
+        bus = StructBusChannel()
+        self.obj._channel = DispatchingChannel(bus, self.obj)
+        nickname = self.obj.remote_attributes["nickname"]
+        self.assertTrue(nickname.chunked)
+        self.obj.nickname = "a much longer device name"
+        self.assertEqual([0, 1, 2, 3], [seq for _, seq, _ in bus.sent])
+        self.assertEqual(b"a much longer device name\0", b"".join(data for _, _, data in bus.sent))
+        for chunk in split_chunks(b"another long device name\0", 8):
+            bus.bus.put((nickname.ep_id, bytes(chunk)))
+        self.assertEqual("another long device name", self.obj.nickname)
+
+    def test_chunked_reply_polled_between_frames(self):
+        bus = StructBusChannel()
+        channel = DispatchingChannel(bus, self.obj)
+        ep_id = self.obj.remote_attributes["nickname"].ep_id
+        channel.send([], ep_id)
+        for chunk in (b"abcdefgh", b"ij"):
+            bus.bus.put((ep_id, chunk))
+        self.assertEqual(b"abcdefgh", channel.recv_seq(ep_id, 0))
+        # Another thread drives listeners before the next frame is read
+        channel.poll()
+        self.assertEqual(b"ij", channel.recv_seq(ep_id, 1))
@@ -0,0 +1,54 @@
+import importlib.resources
+import unittest
+
+import yaml
+
+from avlos.deserializer import deserialize
+from avlos.generators.filters import avlos_bitmask_eps, avlos_endpoints, avlos_enum_eps
+
+
+class TestEndpointIndex(unittest.TestCase):
+    def setUp(self):
+        def_path_str = str(importlib.resources.files("tests").joinpath("definition/good_device.yaml"))
+        with open(def_path_str) as device_description:
+            self.obj = deserialize(yaml.safe_load(device_description))
+
+    def test_lookup_by_ep_id(self):
+        index = self.obj.endpoint_index
+        for ep in index.endpoints:
+            self.assertIs(ep, index.by_ep_id[ep.ep_id])
+        self.assertEqual(list(range(len(index))), [ep.ep_id for ep in index])
+
+    def test_lookup_by_name(self):
+        index = self.obj.endpoint_index
+        self.assertIs(self.obj.motor.remote_attributes["R"], index.by_name["motor.R"])
+        self.assertIs(self.obj.controller.remote_attributes["mode"], index.by_name["controller.mode"])
+        self.assertNotIn("motor", index.by_name)
+
+    def test_per_kind_lists(self):
+        index = self.obj.endpoint_index
+        self.assertEqual(["controller.mode"], [ep.full_name for ep in index.enums])
+        self.assertEqual(["errors", "motor.errors"], [ep.full_name for ep in index.bitmasks])
+        self.assertIn("reset", [ep.full_name for ep in index.functions])
+        self.assertNotIn("Vbus", [ep.full_name for ep in index.functions])
+
+    def test_immutable_and_cached(self):
+        index = self.obj.endpoint_index
+        self.assertIs(index, self.obj.endpoint_index)
+        with self.assertRaises(TypeError):
+            index.by_ep_id[1000] = None
+
+    def test_filters_match_tree_walk(self):
+        walked = avlos_endpoints(self.obj.motor)
+        self.assertEqual(["motor.R", "motor.L", "motor.errors"], [ep.full_name for ep in walked])
+        self.assertEqual(list(self.obj.endpoint_index.endpoints), avlos_endpoints(self.obj))
+        self.assertEqual(list(self.obj.endpoint_index.enums), avlos_enum_eps(self.obj))
+        self.assertEqual(list(self.obj.endpoint_index.bitmasks), avlos_bitmask_eps(self.obj))
+
+    def test_resolve_uses_index(self):
+        self.assertIs(self.obj.endpoint_index.by_name["motor.R"], self.obj.resolve("motor.R"))
+        self.assertIs(self.obj.remote_attributes["motor"], self.obj.resolve("motor"))
+
+    def test_pickle_drops_index(self):
+        self.obj.endpoint_index
+        self.assertNotIn("endpoint_index", self.obj.__getstate__())
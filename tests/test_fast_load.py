@@ -0,0 +1,81 @@
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+from avlos.definitions import RemoteNode
+from avlos.deserializer import deserialize
+
+REPO_ROOT = Path(__file__).parent.parent
+
+SPECS = [
+    REPO_ROOT / "tests" / "definition" / "good_device.yaml",
+    REPO_ROOT / "tests" / "definition" / "obsolete_device.yaml",
+    REPO_ROOT / "example" / "device.yaml",
+]
+
+ENDPOINT_FIELDS = [
+    "name",
+    "summary",
+    "full_name",
+    "ep_id",
+    "dtype",
+    "unit",
+    "getter_name",
+    "setter_name",
+    "caller_name",
+    "func_attr",
+    "rst_target",
+    "export",
+    "meta",
+]
+
+
+class TestFastLoad(unittest.TestCase):
+    """
+    Differential tests comparing the schema-free loader
+    against the marshmallow schema
+    """
+
+    def assert_same_tree(self, expected, actual):
+        self.assertIs(type(expected), type(actual))
+        if isinstance(expected, RemoteNode):
+            self.assertEqual(expected.name, actual.name)
+            self.assertEqual(expected.summary, actual.summary)
+            self.assertEqual(list(expected.remote_attributes), list(actual.remote_attributes))
+            for key, child in expected.remote_attributes.items():
+                self.assertIs(actual, actual.remote_attributes[key]._parent)
+                self.assert_same_tree(child, actual.remote_attributes[key])
+            return
+        for field in ENDPOINT_FIELDS:
+            self.assertEqual(getattr(expected, field, None), getattr(actual, field, None), field)
+        for field in ["options", "bitmask"]:
+            expected_enum = getattr(expected, field, None)
+            if expected_enum is not None:
+                actual_enum = getattr(actual, field)
+                self.assertEqual(expected_enum.__name__, actual_enum.__name__)
+                self.assertEqual(
+                    [(k, v.value) for k, v in expected_enum.__members__.items()],
+                    [(k, v.value) for k, v in actual_enum.__members__.items()],
+                )
+        for expected_arg, actual_arg in zip(getattr(expected, "arguments", []), getattr(actual, "arguments", [])):
+            self.assertEqual(vars(expected_arg), vars(actual_arg))
+
+    def test_differential(self):
+        for spec in SPECS:
+            with self.subTest(spec=spec.name):
+                with open(spec) as device_description:
+                    description = yaml.safe_load(device_description)
+                expected = deserialize(description)
+                actual = deserialize(description, validate=False)
+                self.assert_same_tree(expected, actual)
+                self.assertEqual(expected.hash_string, actual.hash_string)
+                self.assertEqual(expected.hash_uint32, actual.hash_uint32)
+
+    def test_fast_load_skips_schema(self):
+        with open(SPECS[0]) as device_description:
+            description = yaml.safe_load(device_description)
+        with mock.patch("avlos.definitions.RootNodeSchema.load", side_effect=AssertionError):
+            device = deserialize(description, validate=False)
+        self.assertEqual("motor.R", device.motor.remote_attributes["R"].full_name)
@@ -0,0 +1,98 @@
+import importlib.resources
+import unittest
+
+import yaml
+
+from avlos.deserializer import deserialize
+from avlos.fleet import Fleet
+from avlos.unit_field import get_registry
+from tests.dummy_channel import DummyCodec
+
+_reg = get_registry()
+
+
+class MemoryChannel:
+    """
+    Channel holding the last value written to each endpoint
+    """
+
+    def __init__(self):
+        self.values = {}
+
+    def send(self, data, ep_id):
+        if data != []:
+            self.values[ep_id] = data
+
+    def recv(self, ep_id):
+        return [self.values.get(ep_id, 0)]
+
+    @property
+    def serializer(self):
+        return DummyCodec()
+
+
+class TestFleet(unittest.TestCase):
+    def setUp(self):
+        def_path_str = str(importlib.resources.files("tests").joinpath("definition/good_device.yaml"))
+        with open(def_path_str) as device_description:
+            self.spec = deserialize(yaml.safe_load(device_description))
+        self.channels = {node_id: MemoryChannel() for node_id in range(1, 5)}
+        self.fleet = Fleet(self.spec, self.channels)
+
+    def test_devices_share_spec(self):
+        self.assertEqual(4, len(self.fleet))
+        first, second = self.fleet[1], self.fleet[2]
+        self.assertIsNot(first, second)
+        self.assertIsNot(first.motor, second.motor)
+        r1 = first.motor.remote_attributes["R"]
+        r2 = second.motor.remote_attributes["R"]
+        self.assertIsNot(r1, r2)
+        self.assertIs(r1.dtype, r2.dtype)
+        self.assertIs(r1.unit, r2.unit)
+        self.assertIs(first.controller.remote_attributes["mode"].options, second.controller.remote_attributes["mode"].options)
+        self.assertEqual("motor.R", r2.full_name)
+        self.assertIs(second, r2.root)
+        self.assertIs(self.channels[2], r2.channel)
+        self.assertIs(second.endpoint_index.by_name["motor.R"], r2)
+
+    def test_per_device_channel(self):
+        self.fleet[1].motor.R = 0.5
+        self.fleet[2].motor.R = 0.25
+        self.assertEqual(0.5 * _reg("ohm"), self.fleet[1].motor.R)
+        self.assertEqual(0.25 * _reg("ohm"), self.fleet[2].motor.R)
+
+    def test_fan_out(self):
+        self.fleet.write("motor.R", {1: 0.1, 2: 0.2, 3: 0.3, 4: 0.4})
+        values = self.fleet.read("motor.R")
+        self.assertEqual([1, 2, 3, 4], list(values))
+        self.assertEqual([0.1, 0.2, 0.3, 0.4], [value.magnitude for value in values.values()])
+        self.fleet.write("motor.R", 1 * _reg("ohm"))
+        self.assertEqual({key: 1 * _reg("ohm") for key in self.channels}, dict(self.fleet.read("motor.R")))
+
+    def test_fan_out_batch_and_cache(self):
+        self.fleet[1].enable_cache()
+        self.fleet.write("motor.R", 0.5)
+        self.fleet.read("motor.R")
+        self.channels[1].values.clear()
+        self.channels[2].values.clear()
+        self.assertEqual([0.5, 0, 0.5, 0.5], [value.magnitude for value in self.fleet.read("motor.R").values()])
+        with self.fleet[2].batch():
+            self.fleet.write("motor.R", 0.25)
+            self.assertNotIn(self.fleet[2].motor.remote_attributes["R"].ep_id, self.channels[2].values)
+        self.assertEqual([0.25] * 4, [value.magnitude for value in self.fleet.read("motor.R").values()])
+
+    def test_clone_unbound(self):
+        self.fleet[1].enable_cache()
+        self.fleet[1].motor.R
+        device = self.fleet.add(5, MemoryChannel())
+        self.assertIsNone(device.value_cache)
+        self.assertIsNone(self.spec.value_cache)
+        self.assertNotIn("channel", self.spec.motor.remote_attributes["R"].__dict__)
+
+    def test_add_remove(self):
+        self.fleet.remove(4)
+        self.assertNotIn(4, self.fleet)
+        device = self.fleet.add(5, MemoryChannel())
+        self.assertIs(device, self.fleet[5])
+        self.assertEqual([1, 2, 3, 5], list(self.fleet))
+        self.assertIsNone(self.spec._channel)
@@ -0,0 +1,133 @@
+import importlib.resources
+import os
+import stat
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import yaml
+
+import avlos.generators.generator_cpp as generator_cpp
+from avlos.deserializer import deserialize
+from avlos.formatting import clang_format_path, format_c_code, format_c_source, format_c_sources, format_files
+
+# Stand-in for clang-format, that appends a marker to the formatted code,
+# fails for code containing "bad", and logs its calls
+FAKE_CLANG_FORMAT = """#!{python}
+import sys
+
+MARKER = "// formatted\\n"
+with open({log!r}, "a") as log:
+    log.write(" ".join(sys.argv[1:]) + "\\n")
+paths = [arg for arg in sys.argv[1:] if not arg.startswith("-")]
+if "-i" not in sys.argv:
+    source = sys.stdin.read()
+    if "bad" in source:
+        sys.exit(1)
+    sys.stdout.write(source + MARKER)
+    sys.exit(0)
+sources = {{}}
+for path in paths:
+    with open(path) as f:
+        sources[path] = f.read()
+if any("bad" in source for source in sources.values()):
+    sys.exit(1)
+for path, source in sources.items():
+    with open(path, "w") as f:
+        f.write(source + MARKER)
+"""
+
+
+class TestFormatting(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.out = self.tmp_dir.name
+        bin_dir = os.path.join(self.out, "bin")
+        os.mkdir(bin_dir)
+        self.log = os.path.join(self.out, "calls.log")
+        tool = os.path.join(bin_dir, "clang-format")
+        with open(tool, "w") as tool_file:
+            tool_file.write(FAKE_CLANG_FORMAT.format(python=sys.executable, log=self.log))
+        os.chmod(tool, os.stat(tool).st_mode | stat.S_IEXEC)
+        self.path_patch = mock.patch.dict(os.environ, {"PATH": bin_dir})
+        self.path_patch.start()
+        clang_format_path.cache_clear()
+
+    def tearDown(self):
+        self.path_patch.stop()
+        clang_format_path.cache_clear()
+        self.tmp_dir.cleanup()
+
+    def calls(self):
+        try:
+            with open(self.log) as log:
+                return log.read().splitlines()
+        except FileNotFoundError:
+            return []
+
+    def write(self, name, content):
+        path = os.path.join(self.out, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_discovery_cached(self):
+        self.assertTrue(clang_format_path().endswith("clang-format"))
+        with mock.patch("shutil.which") as which:
+            clang_format_path()
+            which.assert_not_called()
+
+    def test_format_files_batched(self):
+        paths = [self.write("file{}.c".format(i), "int a;\n") for i in range(10)]
+        results = format_files(paths, max_workers=3)
+        self.assertEqual(results, {path: True for path in paths})
+        self.assertEqual(len(self.calls()), 3)
+        for path in paths:
+            with open(path) as f:
+                self.assertEqual(f.read(), "int a;\n// formatted\n")
+
+    def test_format_files_failure(self):
+        good = self.write("good.c", "int a;\n")
+        bad = self.write("bad.c", "bad\n")
+        self.assertEqual(format_files([good, bad], max_workers=1), {good: True, bad: False})
+        self.assertTrue(format_c_code(good))
+        self.assertFalse(format_c_code(bad))
+
+    def test_format_sources(self):
+        sources = {
+            os.path.join(self.out, "a", "device.h"): "int a;\n",
+            os.path.join(self.out, "b", "device.h"): "int b;\n",
+            os.path.join(self.out, "c.c"): "bad\n",
+        }
+        formatted = format_c_sources(sources, max_workers=1)
+        self.assertEqual(formatted[os.path.join(self.out, "a", "device.h")], "int a;\n// formatted\n")
+        self.assertEqual(formatted[os.path.join(self.out, "b", "device.h")], "int b;\n// formatted\n")
+        self.assertIsNone(formatted[os.path.join(self.out, "c.c")])
+        # Nothing is written to the output paths
+        self.assertFalse(os.path.exists(os.path.join(self.out, "a")))
+        self.assertEqual(format_c_source("int a;\n", "x.c"), "int a;\n// formatted\n")
+
+    def test_generator_formats_in_batches(self):
+        def_path_str = str(importlib.resources.files("tests").joinpath("definition/good_device.yaml"))
+        with open(def_path_str) as device_desc_stream:
+            obj = deserialize(yaml.safe_load(device_desc_stream))
+        config = {
+            "paths": {
+                "output_helpers": os.path.join(self.out, "cpp", "tm_helpers.hpp"),
+                "output_header": os.path.join(self.out, "cpp", "device.hpp"),
+                "output_impl": os.path.join(self.out, "cpp", "device.cpp"),
+            },
+            "max_workers": 2,
+        }
+        generator_cpp.process(obj, config)
+        outputs = [name for name in os.listdir(os.path.join(self.out, "cpp")) if not name.startswith(".")]
+        self.assertEqual(len(outputs), 9)
+        self.assertEqual(len(self.calls()), 2)
+        for name in outputs:
+            with open(os.path.join(self.out, "cpp", name)) as f:
+                self.assertTrue(f.read().endswith("// formatted\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
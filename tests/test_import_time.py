@@ -0,0 +1,45 @@
+"""
+Import-time regression tests. Heavy dependencies must only be
+loaded once they are actually needed.
+"""
+
+import subprocess
+import sys
+import unittest
+
+HEAVY_MODULES = ["pint", "marshmallow", "jinja2", "pkg_resources", "setuptools_scm"]
+
+# Generous bound, to catch regressions without flaking on slow machines
+MAX_IMPORT_SECONDS = 0.5
+
+
+def run_python(code):
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+class TestImportTime(unittest.TestCase):
+    def assert_not_loaded(self, module):
+        code = "import sys, {}; print(','.join(m for m in {!r} if m in sys.modules))".format(module, HEAVY_MODULES)
+        self.assertEqual("", run_python(code))
+
+    def test_import_avlos_is_light(self):
+        self.assert_not_loaded("avlos")
+
+    def test_import_cli_is_light(self):
+        self.assert_not_loaded("avlos.cli")
+
+    def test_cli_defers_url_support(self):
+        code = "import sys, avlos.cli; print('urllib.request' in sys.modules)"
+        self.assertEqual("False", run_python(code))
+
+    def test_import_channel_is_light(self):
+        self.assert_not_loaded("avlos.channel")
+
+    def test_registry_is_lazy(self):
+        code = "import sys, avlos; avlos.get_registry(); print('pint' in sys.modules)"
+        self.assertEqual("True", run_python(code))
+
+    def test_import_time(self):
+        code = "import time; t = time.perf_counter(); import avlos.cli; print(time.perf_counter() - t)"
+        self.assertLess(float(run_python(code)), MAX_IMPORT_SECONDS)
@@ -0,0 +1,179 @@
+import importlib.resources
+import json
+import os
+import tempfile
+import unittest
+
+import yaml
+
+import avlos.generators.generator_c as generator_c
+import avlos.generators.generator_cpp as generator_cpp
+from avlos.deserializer import deserialize
+from avlos.incremental import MANIFEST_NAME, IncrementalWriter, write_if_changed
+from avlos.processor import process_with_config_object
+
+
+def load_device():
+    def_path_str = str(importlib.resources.files("tests").joinpath("definition/good_device.yaml"))
+    with open(def_path_str) as device_desc_stream:
+        return deserialize(yaml.safe_load(device_desc_stream))
+
+
+class TestIncremental(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.out = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def c_config(self):
+        return {
+            "paths": {
+                "output_enums": os.path.join(self.out, "tm_enums.h"),
+                "output_header": os.path.join(self.out, "test.h"),
+                "output_impl": os.path.join(self.out, "test.c"),
+            },
+            "header_includes": ["tm_enums.h"],
+        }
+
+    def cpp_config(self):
+        return {
+            "paths": {
+                "output_helpers": os.path.join(self.out, "cpp", "tm_helpers.hpp"),
+                "output_header": os.path.join(self.out, "cpp", "device.hpp"),
+                "output_impl": os.path.join(self.out, "cpp", "device.cpp"),
+            },
+            "header_includes": ["string"],
+        }
+
+    def output_files(self):
+        files = []
+        for directory, _, names in os.walk(self.out):
+            files.extend(os.path.join(directory, name) for name in names if name != MANIFEST_NAME)
+        return sorted(files)
+
+    def age_outputs(self):
+        # Backdate outputs, so that any rewrite shows in the mtime
+        for path in self.output_files():
+            os.utime(path, ns=(0, 0))
+
+    def test_write_if_changed(self):
+        path = os.path.join(self.out, "sub", "file.h")
+        self.assertTrue(write_if_changed(path, "a\n"))
+        os.utime(path, ns=(0, 0))
+        self.assertFalse(write_if_changed(path, "a\n"))
+        self.assertEqual(os.stat(path).st_mtime_ns, 0)
+        self.assertTrue(write_if_changed(path, "b\n"))
+        with open(path) as f:
+            self.assertEqual(f.read(), "b\n")
+
+    def test_unchanged_outputs_skipped(self):
+        generator_c.process(load_device(), self.c_config())
+        generator_cpp.process(load_device(), self.cpp_config())
+        files = self.output_files()
+        self.assertEqual(len(files), 12)
+        self.assertTrue(os.path.exists(os.path.join(self.out, MANIFEST_NAME)))
+        self.assertTrue(os.path.exists(os.path.join(self.out, "cpp", MANIFEST_NAME)))
+        self.age_outputs()
+
+        generator_c.process(load_device(), self.c_config())
+        generator_cpp.process(load_device(), self.cpp_config())
+        for path in files:
+            self.assertEqual(os.stat(path).st_mtime_ns, 0, path)
+
+    def test_writer_skips_rendering(self):
+        device = load_device()
+        template = generator_c.get_env().get_template("tm_enums.h.jinja")
+        path = os.path.join(self.out, "tm_enums.h")
+        writer = IncrementalWriter(device, self.c_config())
+        self.assertTrue(writer.render(path, template, instance=device))
+        writer.close()
+        writer = IncrementalWriter(device, self.c_config())
+        self.assertFalse(writer.render(path, template, instance=None))
+        self.assertEqual(writer.skipped, [path])
+
+    def test_config_change_regenerates(self):
+        generator_c.process(load_device(), self.c_config())
+        self.age_outputs()
+        config = self.c_config()
+        config["header_includes"] = ["other.h"]
+        generator_c.process(load_device(), config)
+        header = os.path.join(self.out, "test.h")
+        self.assertNotEqual(os.stat(header).st_mtime_ns, 0)
+        with open(header) as f:
+            self.assertIn("other.h", f.read())
+        # Outputs that render the same are not rewritten
+        self.assertEqual(os.stat(os.path.join(self.out, "tm_enums.h")).st_mtime_ns, 0)
+
+    def test_spec_change_regenerates(self):
+        generator_c.process(load_device(), self.c_config())
+        self.age_outputs()
+        device = load_device()
+        device.hash_string = "0x0"
+        device.hash_uint32 = 0
+        generator_c.process(device, self.c_config())
+        with open(os.path.join(self.out, "test.h")) as f:
+            self.assertIn("avlos_proto_hash = 0;", f.read())
+
+    def test_edited_output_regenerates(self):
+        generator_c.process(load_device(), self.c_config())
+        impl = os.path.join(self.out, "test.c")
+        with open(impl) as f:
+            content = f.read()
+        with open(impl, "w") as f:
+            f.write("edited")
+        generator_c.process(load_device(), self.c_config())
+        with open(impl) as f:
+            self.assertEqual(f.read(), content)
+
+    def manifest(self, *path):
+        with open(os.path.join(self.out, *path, MANIFEST_NAME)) as manifest_file:
+            return json.load(manifest_file)
+
+    def test_shared_directory(self):
+        cpp_config = self.cpp_config()
+        cpp_config["paths"] = {
+            name: os.path.join(self.out, os.path.basename(path)) for name, path in cpp_config["paths"].items()
+        }
+        config = {
+            "max_workers": 2,
+            "generators": {
+                "generator_c": dict(self.c_config(), enabled=True),
+                "generator_cpp": dict(cpp_config, enabled=True),
+            },
+        }
+        process_with_config_object(load_device(), config)
+        manifest = self.manifest()
+        self.assertEqual(sorted(manifest), sorted(os.path.basename(path) for path in self.output_files()))
+        self.assertEqual({"generator_c", "generator_cpp"}, {entry["generator"] for entry in manifest.values()})
+        self.age_outputs()
+
+        process_with_config_object(load_device(), config)
+        self.assertEqual(manifest, self.manifest())
+        for path in self.output_files():
+            self.assertEqual(os.stat(path).st_mtime_ns, 0, path)
+
+    def test_stale_entries_dropped(self):
+        device = load_device()
+        template = generator_c.get_env().get_template("tm_enums.h.jinja")
+        first = os.path.join(self.out, "first.h")
+        second = os.path.join(self.out, "second.h")
+        other = IncrementalWriter(device, self.c_config(), "other")
+        other.render(os.path.join(self.out, "other.h"), template, instance=device)
+        writer = IncrementalWriter(device, self.c_config(), "test")
+        writer.render(first, template, instance=device)
+        writer.render(second, template, instance=device)
+        # Closed in any order, the writers keep each other's entries
+        writer.close()
+        other.close()
+        self.assertEqual(["first.h", "other.h", "second.h"], sorted(self.manifest()))
+
+        writer = IncrementalWriter(device, self.c_config(), "test")
+        writer.render(first, template, instance=device)
+        writer.close()
+        self.assertEqual(["first.h", "other.h"], sorted(self.manifest()))
+
+
+if __name__ == "__main__":
+    unittest.main()
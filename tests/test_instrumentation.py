@@ -0,0 +1,140 @@
+import asyncio
+import importlib.resources
+import unittest
+
+import yaml
+
+from avlos.channel import BaseChannel
+from avlos.deserializer import deserialize
+from avlos.instrumentation import AsyncInstrumentedChannel, InstrumentedChannel
+from avlos.pipeline import PipelinedChannel
+from avlos.struct_codec import StructCodec
+from tests.dummy_channel import DummyChannel
+from tests.test_async import AsyncDummyChannel
+
+
+class LoopbackChannel(BaseChannel):
+    """
+    Channel that stores the last payload sent to each endpoint
+    and returns it on receive, timing out if there is none
+    """
+
+    def __init__(self):
+        self.payloads = {}
+
+    def send(self, data, ep_id):
+        if len(data) > 0:
+            self.payloads[ep_id] = bytes(data)
+
+    def recv(self, ep_id, timeout=0.1):
+        try:
+            return self.payloads[ep_id]
+        except KeyError:
+            raise TimeoutError
+
+    @property
+    def serializer(self):
+        return StructCodec()
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        def_path_str = str(importlib.resources.files("tests").joinpath("definition/good_device.yaml"))
+        with open(def_path_str) as device_description:
+            self.obj = deserialize(yaml.safe_load(device_description))
+        self.channel = LoopbackChannel()
+        self.obj._channel = self.channel
+        self.r = self.obj.motor.remote_attributes["R"]
+
+    def test_off_by_default(self):
+        self.obj.motor.R = 0.5
+        self.obj.motor.R
+        self.assertIs(self.channel, self.r.channel)
+        self.assertNotIn("decode_value", self.r.__dict__)
+
+    def test_counts_and_timings(self):
+        instrumentation = self.obj.instrument()
+        self.assertIsInstance(self.r.channel, InstrumentedChannel)
+        self.obj.motor.R = 0.5
+        self.obj.motor.R
+        self.obj.motor.R
+        stats = instrumentation.to_dict()[self.r.ep_id]
+        self.assertEqual("motor.R", stats["name"])
+        self.assertEqual(3, stats["requests"])
+        self.assertEqual(2, stats["responses"])
+        self.assertEqual(4, stats["bytes_sent"])
+        self.assertEqual(8, stats["bytes_received"])
+        self.assertEqual(1, stats["serialize_count"])
+        self.assertEqual(2, stats["deserialize_count"])
+        self.assertEqual(2, sum(stats["latency_buckets"].values()))
+        self.assertGreater(stats["deserialize_seconds"], 0)
+
+    def test_timeouts(self):
+        instrumentation = self.obj.instrument()
+        with self.assertRaises(TimeoutError):
+            self.obj.motor.L
+        stats = instrumentation.to_dict()[self.obj.motor.remote_attributes["L"].ep_id]
+        self.assertEqual(1, stats["timeouts"])
+        self.assertEqual(0, stats["responses"])
+
+    def test_batch_and_function(self):
+        instrumentation = self.obj.instrument()
+        self.obj.motor.R = 0.5
+        self.obj.read_many(["motor.R"])
+        self.obj.controller.set_pos_vel_setpoints(1.0, 2.0)
+        stats = instrumentation.to_dict()
+        self.assertEqual(1, stats[self.r.ep_id]["responses"])
+        self.assertEqual(1, stats[self.obj.controller.set_pos_vel_setpoints.ep_id]["serialize_count"])
+
+    def test_prometheus(self):
+        instrumentation = self.obj.instrument()
+        self.obj.motor.R = 0.5
+        self.obj.motor.R
+        text = instrumentation.to_prometheus()
+        labels = 'ep_id="{}",name="motor.R"'.format(self.r.ep_id)
+        self.assertIn("# TYPE avlos_requests_total counter", text)
+        self.assertIn("avlos_requests_total{" + labels + "} 2", text)
+        self.assertIn("avlos_response_latency_seconds_bucket{" + labels + ',le="+Inf"} 1', text)
+        self.assertIn("avlos_response_latency_seconds_count{" + labels + "} 1", text)
+
+    def test_detach(self):
+        instrumentation = self.obj.instrument()
+        self.obj.motor.R = 0.5
+        instrumentation.detach()
+        self.assertIs(self.channel, self.r.channel)
+        self.assertNotIn("encode_value", self.r.__dict__)
+        self.obj.motor.R = 0.25
+        self.assertEqual(1, instrumentation.to_dict()[self.r.ep_id]["requests"])
+
+    def test_duck_typed_channel(self):
+        self.obj._channel = DummyChannel(1.0)
+        instrumentation = self.obj.instrument()
+        self.obj.motor.R
+        self.obj.read_many(["motor.R", "Vbus"])
+        self.assertEqual(2, instrumentation.to_dict()[self.r.ep_id]["responses"])
+
+    def test_async_channel(self):
+        self.obj._channel = AsyncDummyChannel(12.0)
+        instrumentation = self.obj.instrument()
+        self.assertIsInstance(self.r.channel, AsyncInstrumentedChannel)
+
+        async def run():
+            await self.r.aget_value()
+            await self.r.aset_value(0.5)
+            return await self.obj.aread(["motor.R", "Vbus"])
+
+        asyncio.run(run())
+        stats = instrumentation.to_dict()[self.r.ep_id]
+        self.assertEqual(3, stats["requests"])
+        self.assertEqual(2, stats["responses"])
+        instrumentation.detach()
+        self.assertIsInstance(self.r.channel, AsyncDummyChannel)
+
+    def test_wrapped_channel_attributes(self):
+        pipeline = PipelinedChannel(self.channel)
+        self.obj._channel = pipeline
+        self.obj.instrument()
+        self.obj.motor.R = 0.5
+        future = self.r.channel.submit([], self.r.ep_id, decode=self.r.decode_value)
+        self.assertEqual(0.5, future.result().magnitude)
+        self.assertIs(pipeline._lock, self.r.channel._lock)
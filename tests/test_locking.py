@@ -0,0 +1,163 @@
+import importlib.resources
+import struct
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import yaml
+
+from avlos.channel import BaseChannel
+from avlos.deserializer import deserialize
+from avlos.locking import LockingChannel
+from avlos.struct_codec import StructCodec
+from tests.dummy_channel import DummyCodec, SeqLoopbackChannel
+
+
+class SlowChannel(BaseChannel):
+    """
+    Channel answering each request after a delay, that
+    records requests sent to an endpoint that is still
+    awaiting its response
+    """
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.pending = {}
+        self.interleaved = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def send(self, data, ep_id):
+        with self.lock:
+            if ep_id in self.pending:
+                self.interleaved.append(ep_id)
+            self.pending[ep_id] = [ep_id]
+
+    def recv(self, ep_id, timeout=0.1):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+            return self.pending.pop(ep_id)
+
+    @property
+    def serializer(self):
+        return DummyCodec()
+
+
+class EchoChannel(BaseChannel):
+    """
+    Channel receiving into the scratch buffers of the
+    endpoints, after a delay. Read requests are answered
+    with the endpoint ID as a float, function calls with
+    the sum of their two float arguments.
+    """
+
+    max_packet_size = 8
+
+    def __init__(self, delay=0.001):
+        self.delay = delay
+        self.requests = {}
+
+    def send(self, data, ep_id):
+        self.requests[ep_id] = bytes(data)
+
+    def recv_into(self, ep_id, buffer, timeout=0.1):
+        request = self.requests.pop(ep_id)
+        time.sleep(self.delay)
+        if request:
+            value = sum(struct.unpack("<ff", request))
+        else:
+            value = float(ep_id)
+        buffer[:4] = struct.pack("<f", value)
+        return 4
+
+    def recv(self, ep_id, timeout=0.1):
+        buffer = bytearray(self.max_packet_size)
+        return bytes(buffer[: self.recv_into(ep_id, buffer, timeout)])
+
+    @property
+    def serializer(self):
+        return StructCodec()
+
+
+class TestLockingChannel(unittest.TestCase):
+    def setUp(self):
+        def_path_str = str(importlib.resources.files("tests").joinpath("definition/good_device.yaml"))
+        with open(def_path_str) as device_description:
+            self.obj = deserialize(yaml.safe_load(device_description))
+        self.slow = SlowChannel()
+        self.obj._channel = LockingChannel(self.slow)
+
+    def test_same_endpoint_serialized(self):
+        vbus = self.obj.remote_attributes["Vbus"]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda _: vbus.get_value(), range(8)))
+        self.assertEqual([], self.slow.interleaved)
+        self.assertEqual(1, self.slow.max_in_flight)
+
+    def test_independent_endpoints_parallel(self):
+        eps = [self.obj.remote_attributes["Vbus"], self.obj.motor.remote_attributes["R"]]
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(lambda ep: [ep.get_value() for _ in range(4)], eps))
+        self.assertEqual([], self.slow.interleaved)
+        self.assertEqual(2, self.slow.max_in_flight)
+
+    def test_overlapping_batches(self):
+        vbus = self.obj.remote_attributes["Vbus"]
+        r = self.obj.motor.remote_attributes["R"]
+        batches = [[vbus, r], [r, vbus]] * 4
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(self.obj.read_endpoints, batches))
+        self.assertEqual([], self.slow.interleaved)
+
+    def test_transaction_keys(self):
+        channel = self.obj._channel
+        self.assertIs(channel.lock("tx"), channel.lock("tx"))
+        with channel.transaction("tx", 1):
+            with channel.transaction(1):
+                pass
+
+    def test_scratch_buffers_shared_between_threads(self):
+        self.obj.set_channel(LockingChannel(EchoChannel()))
+        eps = [
+            self.obj.remote_attributes["Vbus"],
+            self.obj.motor.remote_attributes["R"],
+            self.obj.motor.remote_attributes["L"],
+            self.obj.encoder.remote_attributes["bandwidth"],
+        ]
+        self.assertIsNotNone(eps[0].scratch_buffer)
+        expected = [ep.ep_id for ep in eps]
+
+        def read(_):
+            return [ep.get_value().magnitude for ep in eps]
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            for values in pool.map(read, range(16)):
+                self.assertEqual(expected, values)
+
+        setpoints = self.obj.controller.remote_attributes["set_pos_vel_setpoints"]
+        self.assertIsNotNone(setpoints.scratch_buffer)
+
+        def call(i):
+            return setpoints(float(i), 0.5).magnitude
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            self.assertEqual([i + 0.5 for i in range(32)], list(pool.map(call, range(32))))
+
+    def test_chunked_roundtrip(self):
+        loopback = SeqLoopbackChannel()
+        self.obj.set_channel(LockingChannel(loopback))
+        nickname = self.obj.remote_attributes["nickname"]
+        self.assertTrue(nickname.chunked)
+        self.obj.nickname = "a much longer device name"
+        self.assertEqual([0, 1, 2, 3], [seq for ep_id, seq, _ in loopback.sent if ep_id == nickname.ep_id])
+        self.assertEqual("a much longer device name", self.obj.nickname)
+
+
+if __name__ == "__main__":
+    unittest.main()
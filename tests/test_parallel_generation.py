@@ -0,0 +1,89 @@
+import filecmp
+import os
+import tempfile
+import unittest
+
+import avlos.generators.generator_cpp as generator_cpp
+from avlos.deserializer import deserialize
+from avlos.processor import process_with_config_object
+from avlos.synthetic import synthesize_spec
+from avlos.validation import ValidationError
+
+
+def make_config(out, max_workers=None):
+    return {
+        "max_workers": max_workers,
+        "generators": {
+            "generator_c": {
+                "enabled": True,
+                "paths": {
+                    "output_enums": os.path.join(out, "c", "tm_enums.h"),
+                    "output_header": os.path.join(out, "c", "device.h"),
+                    "output_impl": os.path.join(out, "c", "device.c"),
+                },
+                "impl_includes": ["device.h"],
+                "max_workers": max_workers,
+            },
+            "generator_cpp": {
+                "enabled": True,
+                "paths": {
+                    "output_helpers": os.path.join(out, "cpp", "tm_helpers.hpp"),
+                    "output_header": os.path.join(out, "cpp", "device.hpp"),
+                    "output_impl": os.path.join(out, "cpp", "device.cpp"),
+                },
+                "impl_includes": ["string"],
+                "max_workers": max_workers,
+            },
+            "generator_rst": {"enabled": True, "paths": {"output_file": os.path.join(out, "docs", "device.rst")}},
+            "generator_dbc": {"enabled": False, "paths": {"output_file": os.path.join(out, "device.dbc")}},
+        },
+    }
+
+
+class TestParallelGeneration(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.out = self.tmp_dir.name
+        self.device = deserialize(synthesize_spec(depth=2, fan_out=3, endpoints=6))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_deterministic_output(self):
+        serial = os.path.join(self.out, "serial")
+        parallel = os.path.join(self.out, "parallel")
+        process_with_config_object(self.device, make_config(serial, max_workers=1))
+        process_with_config_object(self.device, make_config(parallel, max_workers=8))
+        for subdir in ("c", "cpp", "docs"):
+            comparison = filecmp.dircmp(os.path.join(serial, subdir), os.path.join(parallel, subdir))
+            self.assertTrue(comparison.left_list)
+            # Manifests record absolute config paths, and so differ
+            self.assertEqual([name for name in comparison.diff_files if not name.startswith(".")], [])
+            self.assertEqual(comparison.left_only + comparison.right_only, [])
+        self.assertFalse(os.path.exists(os.path.join(serial, "device.dbc")))
+
+    def test_node_files(self):
+        config = make_config(self.out)
+        process_with_config_object(self.device, config)
+        cpp_files = set(os.listdir(os.path.join(self.out, "cpp")))
+        # Helpers, device header and implementation, and a header and implementation per node
+        self.assertEqual(len([name for name in cpp_files if not name.startswith(".")]), 3 + 2 * 12)
+        self.assertIn("node12.hpp", cpp_files)
+        self.assertIn("node12.cpp", cpp_files)
+
+    def test_config_not_modified(self):
+        config = make_config(self.out)
+        generator_cpp.process(self.device, config["generators"]["generator_cpp"])
+        generator_cpp.process(self.device, config["generators"]["generator_cpp"])
+        self.assertEqual(config["generators"]["generator_cpp"]["impl_includes"], ["string"])
+        with open(os.path.join(self.out, "cpp", "device.cpp")) as impl_file:
+            self.assertEqual(impl_file.read().count("#include <device.hpp>"), 1)
+
+    def test_errors_propagate(self):
+        device = deserialize(synthesize_spec(depth=0, endpoints=2, name="bad-name"))
+        with self.assertRaises(ValidationError):
+            process_with_config_object(device, make_config(self.out))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+import importlib.resources
+import struct
+import unittest
+
+import yaml
+
+from avlos.channel import BaseChannel
+from avlos.chunked import split_chunks
+from avlos.deserializer import deserialize
+from avlos.pipeline import PipelinedChannel
+from avlos.struct_codec import StructCodec
+from avlos.unit_field import get_registry
+from tests.dummy_channel import DummyCodec
+
+_reg = get_registry()
+
+
+class SeqLoopbackChannel(BaseChannel):
+    """
+    Channel that answers each request with its sequence
+    number and tracks the number of requests in flight
+    """
+
+    def __init__(self):
+        self.responses = {}
+        self.max_in_flight = 0
+
+    def send(self, data, ep_id):
+        self.send_seq(data, ep_id, 0)
+
+    def recv(self, ep_id, timeout=0.1):
+        return self.recv_seq(ep_id, 0, timeout)
+
+    def send_seq(self, data, ep_id, seq):
+        self.responses[(ep_id, seq)] = [seq]
+        self.max_in_flight = max(self.max_in_flight, len(self.responses))
+
+    def recv_seq(self, ep_id, seq, timeout=0.1):
+        try:
+            return self.responses.pop((ep_id, seq))
+        except KeyError:
+            raise TimeoutError
+
+    @property
+    def serializer(self):
+        return DummyCodec()
+
+
+class StringDeviceChannel(BaseChannel):
+    """
+    Channel emulating a device with 8 byte frames, that stores
+    the chunked string written to string_ep_id and replies with
+    it in chunks, and answers requests to other endpoints with
+    their sequence number as a float
+    """
+
+    chunked_transfers = True
+    max_packet_size = 8
+
+    def __init__(self, string_ep_id):
+        self.string_ep_id = string_ep_id
+        self.value = b"\0"
+        self.incoming = bytearray()
+        self.responses = {}
+
+    def send(self, data, ep_id):
+        self.send_seq(data, ep_id, 0)
+
+    def recv(self, ep_id, timeout=0.1):
+        return self.recv_seq(ep_id, 0, timeout)
+
+    def send_seq(self, data, ep_id, seq):
+        if ep_id != self.string_ep_id:
+            self.responses[(ep_id, seq)] = struct.pack("<f", seq)
+        elif seq == 0 and len(data) == 0:
+            for index, chunk in enumerate(split_chunks(self.value, self.max_packet_size)):
+                self.responses[(ep_id, index)] = bytes(chunk)
+        else:
+            if seq == 0:
+                self.incoming = bytearray()
+            self.incoming += data
+            if len(data) < self.max_packet_size:
+                self.value = bytes(self.incoming)
+
+    def recv_seq(self, ep_id, seq, timeout=0.1):
+        try:
+            return self.responses.pop((ep_id, seq))
+        except KeyError:
+            raise TimeoutError
+
+    @property
+    def serializer(self):
+        return StructCodec()
+
+
+class TestPipeline(unittest.TestCase):
+    def test_futures_matched_by_seq(self):
+        pipeline = PipelinedChannel(SeqLoopbackChannel(), window=4)
+        futures = [pipeline.submit([], 3) for _ in range(10)]
+        self.assertEqual(list(range(10)), [f.result()[0] for f in futures])
+
+    def test_window_bounds_in_flight(self):
+        channel = SeqLoopbackChannel()
+        pipeline = PipelinedChannel(channel, window=3)
+        futures = [pipeline.submit([], ep_id) for ep_id in range(20)]
+        self.assertEqual(3, len(pipeline._in_flight))
+        pipeline.flush()
+        self.assertTrue(all(f.done() for f in futures))
+        self.assertEqual(3, channel.max_in_flight)
+
+    def test_seq_wraps_around(self):
+        pipeline = PipelinedChannel(SeqLoopbackChannel(), window=2, seq_size=2)
+        futures = [pipeline.submit([], 1) for _ in range(6)]
+        self.assertEqual([0, 1, 2, 3, 0, 1], [f.result()[0] for f in futures])
+
+    def test_no_response_resolves_immediately(self):
+        pipeline = PipelinedChannel(SeqLoopbackChannel())
+        future = pipeline.submit([1], 1, expect_response=False)
+        self.assertTrue(future.done())
+        self.assertIsNone(future.result())
+
+    def test_timeout_sets_exception(self):
+        channel = SeqLoopbackChannel()
+        pipeline = PipelinedChannel(channel)
+        future = pipeline.submit([], 1)
+        channel.responses.clear()
+        self.assertIsInstance(future.exception(), TimeoutError)
+
+    def test_timed_out_request_discarded(self):
+        channel = SeqLoopbackChannel()
+        pipeline = PipelinedChannel(channel)
+        pipeline.send_many([([], 1)])
+        channel.responses.clear()
+        pipeline.flush()
+        self.assertEqual({}, dict(pipeline._pending))
+        with self.assertRaises(TimeoutError):
+            pipeline.recv_many([1])
+        pipeline.send_many([([], 1)])
+        self.assertEqual([[1]], pipeline.recv_many([1]))
+
+    def test_failed_send_discards_batch(self):
+        class FailingChannel(SeqLoopbackChannel):
+            def send_seq(self, data, ep_id, seq):
+                if ep_id == 2:
+                    raise OSError
+                super().send_seq(data, ep_id, seq)
+
+        pipeline = PipelinedChannel(FailingChannel())
+        with self.assertRaises(OSError):
+            pipeline.send_many([([], 1), ([], 2)])
+        self.assertEqual({}, dict(pipeline._pending))
+        pipeline.send_many([([], 1)])
+        self.assertEqual([[2]], pipeline.recv_many([1]))
+
+    def test_cancelled_request(self):
+        channel = SeqLoopbackChannel()
+        pipeline = PipelinedChannel(channel)
+        self.assertTrue(pipeline.submit([], 1).cancel())
+        pipeline.flush()
+        self.assertEqual({}, channel.responses)
+
+    def test_decode(self):
+        pipeline = PipelinedChannel(SeqLoopbackChannel())
+        future = pipeline.submit([], 1, decode=lambda data: data[0] * 10)
+        self.assertEqual(0, future.result())
+        future = pipeline.submit([], 1, decode=lambda data: data[0] * 10)
+        self.assertEqual(10, future.result())
+
+    def test_remote_node_read_many(self):
+        def_path_str = str(importlib.resources.files("tests").joinpath("definition/good_device.yaml"))
+        with open(def_path_str) as device_description:
+            obj = deserialize(yaml.safe_load(device_description))
+        channel = SeqLoopbackChannel()
+        obj._channel = PipelinedChannel(channel, window=2)
+        values = obj.read_many(["Vbus", "motor.R", "motor.L"])
+        self.assertEqual([0 * _reg("volt"), 1 * _reg("ohm"), 2 * _reg("henry")], values)
+        self.assertEqual(2, channel.max_in_flight)
+
+    def test_chunked_string(self):
+        def_path_str = str(importlib.resources.files("tests").joinpath("definition/good_device.yaml"))
+        with open(def_path_str) as device_description:
+            obj = deserialize(yaml.safe_load(device_description))
+        channel = StringDeviceChannel(obj.remote_attributes["nickname"].ep_id)
+        obj._channel = PipelinedChannel(channel, window=2)
+        self.assertTrue(obj.remote_attributes["nickname"].chunked)
+        obj.nickname = "a much longer device name"
+        self.assertEqual("a much longer device name", obj.nickname)
+        values = obj.read_many(["motor.R", "nickname", "motor.L"])
+        self.assertEqual("a much longer device name", values[1])
+        self.assertEqual({}, channel.responses)
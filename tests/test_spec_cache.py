@@ -0,0 +1,67 @@
+import importlib.resources
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import yaml
+
+from avlos import spec_cache
+from avlos.deserializer import deserialize
+from avlos.unit_field import get_registry
+from tests.dummy_channel import DummyChannel
+
+_reg = get_registry()
+
+
+class TestSpecCache(unittest.TestCase):
+    def setUp(self):
+        def_path_str = str(importlib.resources.files("tests").joinpath("definition/good_device.yaml"))
+        with open(def_path_str) as device_description:
+            self.description = yaml.safe_load(device_description)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_warm_load_skips_schema(self):
+        cold = deserialize(self.description, cache_dir=self.cache_dir)
+        self.assertTrue(os.path.exists(spec_cache.cache_path(self.cache_dir, cold.hash_uint32)))
+        with mock.patch("avlos.definitions.RootNodeSchema.load", side_effect=AssertionError):
+            warm = deserialize(self.description, cache_dir=self.cache_dir)
+        self.assertEqual(cold.hash_string, warm.hash_string)
+        self.assertEqual(cold.hash_uint32, warm.hash_uint32)
+
+    def test_warm_load_equivalent(self):
+        deserialize(self.description, cache_dir=self.cache_dir)
+        obj = deserialize(self.description, cache_dir=self.cache_dir)
+        obj._channel = DummyChannel(1)
+        self.assertEqual(1 * _reg("volt"), obj.Vbus)
+        self.assertEqual(1 * _reg("tick"), obj.controller.set_pos_vel_setpoints(0, 0))
+        mode = obj.controller.remote_attributes["mode"]
+        self.assertEqual(["IDLE", "CLOSED_LOOP"], list(mode.options.__members__))
+        self.assertEqual(mode.options.CLOSED_LOOP, obj.controller.mode)
+        errors = obj.remote_attributes["errors"]
+        self.assertEqual(deserialize(self.description).errors.bitmask.__members__.keys(), errors.bitmask.__members__.keys())
+        self.assertEqual(obj, obj.motor.remote_attributes["R"].root)
+        self.assertEqual("motor.R", obj.motor.remote_attributes["R"].full_name)
+        self.assertEqual(True, obj.reset.meta["reload_data"])
+
+    def test_corrupt_cache_is_rebuilt(self):
+        obj = deserialize(self.description, cache_dir=self.cache_dir)
+        with open(spec_cache.cache_path(self.cache_dir, obj.hash_uint32), "wb") as cache_file:
+            cache_file.write(b"garbage")
+        self.assertEqual(obj.hash_string, deserialize(self.description, cache_dir=self.cache_dir).hash_string)
+
+    def test_no_cache_by_default(self):
+        with mock.patch("avlos.spec_cache.store") as store:
+            deserialize(self.description)
+        store.assert_not_called()
+
+    def test_key_includes_version(self):
+        with mock.patch("avlos.__version__", "1.0"):
+            path_a = spec_cache.cache_path(self.cache_dir, 1)
+        with mock.patch("avlos.__version__", "2.0"):
+            path_b = spec_cache.cache_path(self.cache_dir, 1)
+        self.assertNotEqual(path_a, path_b)
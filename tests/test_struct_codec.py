@@ -0,0 +1,149 @@
+import importlib.resources
+import struct
+import unittest
+
+import yaml
+
+from avlos.channel import BaseChannel
+from avlos.datatypes import DataType
+from avlos.deserializer import deserialize
+from avlos.struct_codec import StructCodec
+from avlos.unit_field import get_registry
+
+_reg = get_registry()
+
+
+class LoopbackChannel(BaseChannel):
+    """
+    Channel that stores the last payload sent to each
+    endpoint and returns it on receive
+    """
+
+    def __init__(self):
+        self.payloads = {}
+
+    def send(self, data, ep_id):
+        if len(data) > 0:
+            self.payloads[ep_id] = data
+
+    def recv(self, ep_id, timeout=0.1):
+        return self.payloads[ep_id]
+
+    @property
+    def serializer(self):
+        return StructCodec()
+
+
+class BufferLoopbackChannel(LoopbackChannel):
+    """
+    Loopback channel receiving into caller supplied buffers
+    """
+
+    max_packet_size = 8
+
+    def __init__(self):
+        super().__init__()
+        self.recv_into_calls = []
+
+    def send(self, data, ep_id):
+        # The data may be a view of a reused buffer
+        super().send(bytes(data), ep_id)
+
+    def recv_into(self, ep_id, buffer, timeout=0.1):
+        self.recv_into_calls.append(ep_id)
+        data = self.payloads[ep_id]
+        buffer[: len(data)] = data
+        return len(data)
+
+
+class TestStructCodec(unittest.TestCase):
+    def test_roundtrip_all_types(self):
+        codec = StructCodec()
+        samples = {
+            DataType.BOOL: True,
+            DataType.INT8: -5,
+            DataType.UINT8: 250,
+            DataType.INT16: -300,
+            DataType.UINT16: 60000,
+            DataType.INT32: -70000,
+            DataType.UINT32: 4000000000,
+            DataType.INT64: -(2**40),
+            DataType.UINT64: 2**63,
+            DataType.FLOAT: 1.5,
+            DataType.DOUBLE: 1e-300,
+        }
+        for dtype, value in samples.items():
+            data = codec.serialize([value], dtype)
+            self.assertEqual(dtype.size, len(data))
+            self.assertEqual((value,), codec.deserialize(data, dtype))
+
+    def test_little_endian(self):
+        codec = StructCodec()
+        self.assertEqual(b"\x01\x02\x03\x04", codec.serialize([0x04030201], DataType.UINT32))
+
+    def test_multiple_values(self):
+        codec = StructCodec()
+        data = codec.serialize([1.0, -2], DataType.FLOAT, DataType.INT16)
+        self.assertEqual(struct.pack("<fh", 1.0, -2), data)
+        self.assertEqual((1.0, -2), codec.deserialize(data, DataType.FLOAT, DataType.INT16))
+
+    def test_string(self):
+        codec = StructCodec()
+        data = codec.serialize(["tinymovr"], DataType.STR)
+        self.assertEqual(b"tinymovr", data)
+        self.assertEqual(("tinymovr",), codec.deserialize(data + b"\0\0", DataType.STR))
+        data = codec.serialize([3, "ab"], DataType.UINT8, DataType.STR)
+        self.assertEqual((3, "ab"), codec.deserialize(data, DataType.UINT8, DataType.STR))
+        with self.assertRaises(ValueError):
+            codec.serialize(["ab", 3], DataType.STR, DataType.UINT8)
+
+    def test_struct_cached(self):
+        codec = StructCodec()
+        packer, _ = codec.get_struct((DataType.FLOAT, DataType.FLOAT))
+        codec.serialize([1.0, 2.0], DataType.FLOAT, DataType.FLOAT)
+        self.assertIs(packer, codec.get_struct((DataType.FLOAT, DataType.FLOAT))[0])
+
+    def test_remote_objects(self):
+        def_path_str = str(importlib.resources.files("tests").joinpath("definition/good_device.yaml"))
+        with open(def_path_str) as device_description:
+            obj = deserialize(yaml.safe_load(device_description))
+        obj._channel = LoopbackChannel()
+        obj.motor.R = 0.5 * _reg("ohm")
+        self.assertEqual(0.5 * _reg("ohm"), obj.motor.R)
+        obj.nickname = "tm1"
+        self.assertEqual("tm1", obj.nickname)
+        obj.controller.mode = "CLOSED_LOOP"
+        self.assertEqual(obj.controller.remote_attributes["mode"].options.CLOSED_LOOP, obj.controller.mode)
+        func = obj.controller.remote_attributes["set_pos_vel_setpoints"]
+        self.assertEqual((DataType.FLOAT, DataType.FLOAT), func.arg_dtypes)
+        func(1.0, 2.0)
+        self.assertEqual(struct.pack("<ff", 1.0, 2.0), obj._channel.payloads[func.ep_id])
+
+    def test_serialize_into(self):
+        codec = StructCodec()
+        buffer = bytearray(8)
+        size = codec.serialize_into(buffer, [1.0, -2], DataType.FLOAT, DataType.INT16)
+        self.assertEqual(struct.pack("<fh", 1.0, -2), buffer[:size])
+        size = codec.serialize_into(buffer, [3, "ab"], DataType.UINT8, DataType.STR)
+        self.assertEqual((3, "ab"), codec.deserialize(memoryview(buffer)[:size], DataType.UINT8, DataType.STR))
+        with self.assertRaises(ValueError):
+            codec.serialize_into(buffer, ["too long for it"], DataType.STR)
+
+    def test_scratch_buffers(self):
+        def_path_str = str(importlib.resources.files("tests").joinpath("definition/good_device.yaml"))
+        with open(def_path_str) as device_description:
+            obj = deserialize(yaml.safe_load(device_description))
+        obj._channel = BufferLoopbackChannel()
+        r = obj.motor.remote_attributes["R"]
+        obj.motor.R = 0.5 * _reg("ohm")
+        buffer = r.scratch_buffer
+        self.assertEqual(8, len(buffer))
+        self.assertEqual(0.5 * _reg("ohm"), obj.motor.R)
+        obj.motor.R = 0.25 * _reg("ohm")
+        self.assertEqual(0.25 * _reg("ohm"), obj.motor.R)
+        self.assertIs(buffer, r.scratch_buffer)
+        self.assertEqual([r.ep_id] * 2, obj._channel.recv_into_calls)
+        obj.nickname = "tm1"
+        self.assertEqual("tm1", obj.nickname)
+        obj.controller.set_pos_vel_setpoints(1.0, 2.0)
+        self.assertEqual(struct.pack("<ff", 1.0, 2.0), obj._channel.payloads[obj.controller.set_pos_vel_setpoints.ep_id])
@@ -0,0 +1,149 @@
+import importlib.resources
+import threading
+import time
+import unittest
+
+import yaml
+
+from avlos.channel import BaseChannel, unwrap_channel
+from avlos.deserializer import deserialize
+from avlos.instrumentation import Instrumentation
+from avlos.locking import LockingChannel
+from avlos.subscription import Subscription
+from tests.dummy_channel import DummyChannel, DummyCodec
+
+
+class StoreChannel(BaseChannel):
+    """
+    Channel holding the last value written to each endpoint,
+    that records the endpoints written to
+    """
+
+    def __init__(self, value=1):
+        self.value = value
+        self.values = {}
+        self.writes = []
+
+    def send(self, data, ep_id):
+        if data != []:
+            self.values[ep_id] = data
+            self.writes.append(ep_id)
+
+    def recv(self, ep_id, timeout=0.1):
+        return [self.values.get(ep_id, self.value)]
+
+    @property
+    def serializer(self):
+        return DummyCodec()
+
+
+class TestSubscription(unittest.TestCase):
+    def setUp(self):
+        def_path_str = str(importlib.resources.files("tests").joinpath("definition/good_device.yaml"))
+        with open(def_path_str) as device_description:
+            self.obj = deserialize(yaml.safe_load(device_description))
+        self.store = StoreChannel()
+        self.obj._channel = LockingChannel(self.store)
+
+    def test_dynamic_endpoints_by_default(self):
+        with self.obj.subscribe(rate_hz=1000) as subscription:
+            self.assertEqual(["errors", "Vbus", "encoder.position_estimate"], subscription.paths)
+
+    def test_samples_buffered(self):
+        samples = []
+        received = threading.Event()
+
+        def callback(sample):
+            samples.append(sample)
+            if len(samples) >= 3:
+                received.set()
+
+        with self.obj.subscribe(["Vbus", "motor.R"], rate_hz=200, callback=callback, buffer_size=2) as subscription:
+            self.assertTrue(received.wait(2.0))
+        self.assertFalse(subscription.running)
+        self.assertEqual(["Vbus", "motor.R"], list(samples[0][1]))
+        buffered = subscription.drain()
+        self.assertEqual(2, len(buffered))
+        self.assertEqual(samples[-2:], buffered)
+        self.assertEqual([], subscription.drain())
+
+    def test_errors_do_not_stop(self):
+        class FailingChannel(StoreChannel):
+            def recv(self, ep_id, timeout=0.1):
+                raise TimeoutError
+
+        self.obj._channel = LockingChannel(FailingChannel())
+        with self.obj.subscribe(["Vbus"], rate_hz=200) as subscription:
+            time.sleep(0.05)
+            self.assertTrue(subscription.running)
+        self.assertIsInstance(subscription.last_error, TimeoutError)
+        self.assertIsNone(subscription.latest)
+
+    def test_callback_errors_do_not_stop(self):
+        calls = []
+
+        def callback(sample):
+            calls.append(sample)
+            raise ValueError
+
+        with self.obj.subscribe(["Vbus"], rate_hz=200, callback=callback) as subscription:
+            deadline = time.monotonic() + 2.0
+            while len(calls) < 2 and time.monotonic() < deadline:
+                time.sleep(0.005)
+            self.assertTrue(subscription.running)
+        self.assertGreaterEqual(len(calls), 2)
+        self.assertIsInstance(subscription.last_error, ValueError)
+
+    def test_wrapped_locking_channel(self):
+        instrumentation = Instrumentation()
+        instrumentation.attach(self.obj)
+        with self.obj.subscribe(["Vbus"], rate_hz=200) as subscription:
+            self.assertTrue(subscription.running)
+        instrumentation.detach()
+
+        class Wrapper(BaseChannel):
+            def __init__(self, inner):
+                self.inner = inner
+
+        self.assertIs(self.store, unwrap_channel(Wrapper(Wrapper(self.store))))
+        self.setUp()
+        self.obj._channel = Wrapper(LockingChannel(self.store))
+        with Subscription(self.obj, [], 200) as subscription:
+            self.assertTrue(subscription.running)
+        self.setUp()
+        self.obj._channel = Wrapper(self.store)
+        with self.assertRaises(TypeError):
+            Subscription(self.obj, [], 200).start()
+
+    def test_invalid_rate(self):
+        with self.assertRaises(AssertionError):
+            Subscription(self.obj, [], 0)
+
+    def test_requires_locking_channel(self):
+        self.obj._channel = DummyChannel(1)
+        with self.assertRaises(TypeError):
+            self.obj.subscribe(["Vbus"])
+
+    def test_concurrent_reads_and_batch(self):
+        r = self.obj.motor.remote_attributes["R"]
+        with self.obj.subscribe(["Vbus", "motor.R"], rate_hz=1000) as subscription:
+
+            def reader():
+                for _ in range(50):
+                    self.assertEqual(1, self.obj.motor.L.magnitude)
+
+            threads = [threading.Thread(target=reader) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            with self.obj.batch():
+                self.obj.motor.R = 5
+                subscription.drain()
+                deadline = time.monotonic() + 2.0
+                while len(subscription.buffer) < 3 and time.monotonic() < deadline:
+                    time.sleep(0.005)
+                self.assertEqual([], self.store.writes)
+                self.assertEqual(1, subscription.latest[1]["motor.R"].magnitude)
+            self.assertEqual([r.ep_id], self.store.writes)
+        self.assertIsNone(subscription.last_error)
@@ -0,0 +1,46 @@
+import unittest
+
+from avlos.definitions import RemoteBitmask, RemoteEnum, RemoteFunction
+from avlos.deserializer import deserialize
+from avlos.generators.filters import avlos_endpoints
+from avlos.synthetic import spec_size, synthesize_spec
+from avlos.validation import validate_all
+
+
+class TestSynthetic(unittest.TestCase):
+    def test_size(self):
+        spec = synthesize_spec(depth=2, fan_out=3, endpoints=5)
+        device = deserialize(spec)
+        nodes, endpoints = spec_size(depth=2, fan_out=3, endpoints=5)
+        self.assertEqual(nodes, 13)
+        self.assertEqual(len(list(avlos_endpoints(device))), endpoints)
+
+    def test_valid(self):
+        device = deserialize(synthesize_spec(depth=3, fan_out=2, endpoints=10))
+        self.assertEqual(validate_all(device), [])
+
+    def test_unvalidated_load_matches(self):
+        spec = synthesize_spec(depth=2, fan_out=2, endpoints=6)
+        validated = [ep.full_name for ep in avlos_endpoints(deserialize(spec))]
+        unvalidated = [ep.full_name for ep in avlos_endpoints(deserialize(spec, validate=False))]
+        self.assertEqual(validated, unvalidated)
+
+    def test_deterministic(self):
+        self.assertEqual(synthesize_spec(seed=3), synthesize_spec(seed=3))
+        self.assertNotEqual(synthesize_spec(seed=3), synthesize_spec(seed=4))
+
+    def test_mix(self):
+        device = deserialize(synthesize_spec(depth=1, fan_out=2, endpoints=6, mix={"enum": 1, "function": 1}))
+        for ep in avlos_endpoints(device):
+            self.assertIsInstance(ep, (RemoteEnum, RemoteFunction))
+        device = deserialize(synthesize_spec(depth=0, endpoints=4, mix={"bitmask": 1}))
+        for ep in avlos_endpoints(device):
+            self.assertIsInstance(ep, RemoteBitmask)
+        with self.assertRaises(ValueError):
+            synthesize_spec(mix={"register": 1})
+        with self.assertRaises(ValueError):
+            synthesize_spec(mix={"enum": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import importlib.resources
+import struct
+import unittest
+
+import yaml
+
+from avlos.deserializer import deserialize
+from avlos.unit_field import get_registry
+
+try:
+    import numpy as np
+
+    from avlos.telemetry import decode_frames, frame_dtype
+except ImportError:
+    np = None
+
+_reg = get_registry()
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestTelemetry(unittest.TestCase):
+    def setUp(self):
+        def_path_str = str(importlib.resources.files("tests").joinpath("definition/good_device.yaml"))
+        with open(def_path_str) as device_description:
+            obj = deserialize(yaml.safe_load(device_description))
+        self.obj = obj
+        self.vbus = obj.remote_attributes["Vbus"]
+        self.mode = obj.controller.remote_attributes["mode"]
+        self.sn = obj.remote_attributes["sn"]
+
+    def test_frame_dtype(self):
+        dtype = frame_dtype([self.vbus, self.mode, self.sn])
+        self.assertEqual(9, dtype.itemsize)
+        self.assertEqual(["Vbus", "controller.mode", "sn"], list(dtype.names))
+        self.assertEqual(16, frame_dtype([self.vbus], frame_size=16).itemsize)
+        with self.assertRaises(ValueError):
+            frame_dtype([self.vbus, self.sn], frame_size=4)
+
+    def test_decode_frames(self):
+        samples = [(12.0 + i, i % 2, 1000 + i) for i in range(100)]
+        buffer = b"".join(struct.pack("<fBI", *sample) for sample in samples)
+        columns = decode_frames([self.vbus, self.mode, self.sn], buffer)
+        vbus = columns["Vbus"]
+        self.assertEqual(_reg("volt").units, vbus.units)
+        np.testing.assert_array_equal([s[0] for s in samples], vbus.magnitude)
+        np.testing.assert_array_equal([s[1] for s in samples], columns["controller.mode"])
+        np.testing.assert_array_equal([s[2] for s in samples], columns["sn"])
+
+    def test_decode_padded_frames(self):
+        buffer = b"".join(struct.pack("<f4x", float(i)) for i in range(10))
+        columns = decode_frames([self.vbus], buffer, frame_size=8)
+        np.testing.assert_array_equal(np.arange(10, dtype=np.float32), columns["Vbus"].magnitude)
+
+    def test_raw_values(self):
+        self.obj.raw_values = True
+        buffer = b"".join(struct.pack("<f", float(i)) for i in range(10))
+        vbus = decode_frames([self.vbus], buffer)["Vbus"]
+        self.assertIsInstance(vbus, np.ndarray)
+        np.testing.assert_array_equal(np.arange(10, dtype=np.float32), vbus)
@@ -0,0 +1,58 @@
+import importlib.resources
+import os
+import unittest
+from unittest import mock
+
+import pint
+import yaml
+
+import avlos.unit_field
+from avlos.deserializer import deserialize
+from avlos.unit_field import get_conversion_factor, get_registry, to_magnitude
+from tests.dummy_channel import DummyChannel
+
+_reg = get_registry()
+
+
+class TestUnitConversion(unittest.TestCase):
+    def test_conversion_factor(self):
+        self.assertEqual(8192, get_conversion_factor(_reg.Unit("turn"), _reg.Unit("tick")))
+        self.assertEqual(1, get_conversion_factor(_reg.Unit("volt"), _reg.Unit("volt")))
+        self.assertAlmostEqual(1e-3, get_conversion_factor(_reg.Unit("millivolt"), _reg.Unit("volt")))
+
+    def test_offset_units_not_cached_as_factor(self):
+        self.assertIsNone(get_conversion_factor(_reg.Unit("degC"), _reg.Unit("kelvin")))
+        self.assertAlmostEqual(274.15, to_magnitude(1 * _reg("degC"), _reg.Unit("kelvin")))
+
+    def test_to_magnitude(self):
+        self.assertEqual(8192, to_magnitude(1 * _reg("turn"), _reg.Unit("tick")))
+        self.assertEqual(-100, to_magnitude(-100, _reg.Unit("tick")))
+        self.assertEqual(5, to_magnitude(5 * _reg("ohm"), _reg.Unit("ohm")))
+        self.assertAlmostEqual(0.002, to_magnitude(2 * _reg("millivolt"), _reg.Unit("volt")))
+        with self.assertRaises(Exception):
+            to_magnitude(1 * _reg("volt"), _reg.Unit("ohm"))
+
+    def test_registry_cache_opt_in(self):
+        with mock.patch("avlos.unit_field._registry", None), mock.patch("pint.UnitRegistry") as registry:
+            with mock.patch.dict(os.environ):
+                os.environ.pop("AVLOS_UNIT_CACHE_DIR", None)
+                avlos.unit_field.get_registry()
+            registry.assert_called_once_with(autoconvert_offset_to_baseunit=True)
+        with mock.patch("avlos.unit_field._registry", None), mock.patch("pint.UnitRegistry") as registry:
+            with mock.patch.dict(os.environ, AVLOS_UNIT_CACHE_DIR="/tmp/units"):
+                avlos.unit_field.get_registry()
+            registry.assert_called_once_with(autoconvert_offset_to_baseunit=True, cache_folder="/tmp/units")
+        self.assertIsInstance(get_registry(), pint.UnitRegistry)
+
+    def test_raw_values_mode(self):
+        def_path_str = str(importlib.resources.files("tests").joinpath("definition/good_device.yaml"))
+        with open(def_path_str) as device_description:
+            obj = deserialize(yaml.safe_load(device_description))
+        obj._channel = DummyChannel(12.0)
+        self.assertEqual(12.0 * _reg("volt"), obj.Vbus)
+        obj.raw_values = True
+        self.assertEqual(12.0, obj.Vbus)
+        self.assertNotIsInstance(obj.Vbus, _reg.Quantity)
+        self.assertNotIsInstance(obj.controller.set_pos_vel_setpoints(0, 0), _reg.Quantity)
+        obj.raw_values = False
+        self.assertEqual(12.0 * _reg("tick"), obj.controller.set_pos_vel_setpoints(0, 0))
@@ -9,10 +9,14 @@ import yaml
 from avlos.deserializer import deserialize
 from avlos.validation import (
     C_RESERVED_WORDS,
+    Diagnostic,
+    Severity,
     ValidationError,
+    validate,
     validate_all,
     validate_c_identifier,
     validate_endpoint_ids,
+    validate_for_generation,
     validate_function_names,
     validate_names,
 )
@@ -82,8 +86,9 @@ class TestValidation(unittest.TestCase):
         """Test that very long identifiers generate warnings."""
         # 64+ character identifier (C99 requires at least 63 significant chars)
         long_name = "a" * 70
-        # Should not raise, but might print warning
-        validate_c_identifier(long_name)
+        # Should not raise, but warns
+        with self.assertWarns(UserWarning):
+            validate_c_identifier(long_name)
 
     def test_valid_device_passes_all_validation(self):
         """Test that good_device.yaml passes all validations."""
@@ -252,6 +257,76 @@ class TestValidation(unittest.TestCase):
         # - reserved word setter name (return)
         self.assertTrue(len(errors) >= 4, f"Should collect multiple errors, got {len(errors)}: {errors}")
 
+    def test_structured_diagnostics(self):
+        """Test that validate reports severity, check and path of each finding."""
+        yaml_content = """
+        name: test_device
+        remote_attributes:
+          - name: motor
+            remote_attributes:
+              - name: R
+                summary: Resistance
+                dtype: float
+                getter_name: invalid-getter
+                setter_name: %s
+        """ % ("s" * 70)
+
+        obj = deserialize(yaml.safe_load(yaml_content))
+        diagnostics = validate(obj)
+
+        self.assertEqual(len(diagnostics), 2)
+        error, warning = diagnostics
+        self.assertIsInstance(error, Diagnostic)
+        self.assertEqual(error.severity, Severity.ERROR)
+        self.assertEqual(error.code, "getter-name")
+        self.assertEqual(error.path, "test_device.motor.R")
+        self.assertIn("invalid-getter", str(error))
+        self.assertEqual(warning.severity, Severity.WARNING)
+        self.assertEqual(warning.code, "setter-name")
+        self.assertIn("very long", warning.message)
+        # Warnings are not errors
+        self.assertEqual(validate_all(obj), [error.message])
+
+    def test_generation_warnings(self):
+        """Test that validate_for_generation issues and returns warnings instead of printing them."""
+        yaml_content = """
+        name: test_device
+        remote_attributes:
+          - name: R
+            summary: Resistance
+            dtype: float
+            getter_name: %s
+        """ % ("g" * 70)
+
+        obj = deserialize(yaml.safe_load(yaml_content))
+        with self.assertWarnsRegex(UserWarning, "very long"):
+            diagnostics = validate_for_generation(obj)
+        self.assertEqual(["getter-name"], [diagnostic.code for diagnostic in diagnostics])
+        self.assertEqual(Severity.WARNING, diagnostics[0].severity)
+
+    def test_single_pass(self):
+        """Test that validation visits each node exactly once."""
+        import importlib.resources
+        from unittest import mock
+
+        from avlos.validation import _Validator
+
+        def_path_str = str(importlib.resources.files("tests").joinpath("definition/good_device.yaml"))
+
+        with open(def_path_str) as device_desc_stream:
+            obj = deserialize(yaml.safe_load(device_desc_stream))
+
+        nodes = 0
+        stack = [obj]
+        while stack:
+            node = stack.pop()
+            nodes += 1
+            stack.extend(getattr(node, "remote_attributes", {}).values())
+
+        with mock.patch.object(_Validator, "visit", autospec=True, side_effect=_Validator.visit) as visit:
+            validate_all(obj)
+        self.assertEqual(visit.call_count, nodes)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,98 @@
+import importlib.resources
+import time
+import unittest
+
+import yaml
+
+from avlos.deserializer import deserialize
+from avlos.unit_field import get_registry
+from tests.dummy_channel import ListCodec
+
+_reg = get_registry()
+
+
+class CountingChannel:
+    """
+    Channel holding the last value written to each endpoint,
+    that counts the responses it receives
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.reads = 0
+
+    def send(self, data, ep_id):
+        if data:
+            self.values[ep_id] = data
+
+    def recv(self, ep_id):
+        self.reads += 1
+        return self.values.get(ep_id, [1])
+
+    @property
+    def serializer(self):
+        return ListCodec()
+
+
+class TestValueCache(unittest.TestCase):
+    def setUp(self):
+        def_path_str = str(importlib.resources.files("tests").joinpath("definition/good_device.yaml"))
+        with open(def_path_str) as device_description:
+            self.obj = deserialize(yaml.safe_load(device_description))
+        self.channel = CountingChannel()
+        self.obj._channel = self.channel
+
+    def test_disabled_by_default(self):
+        self.obj.sn
+        self.obj.sn
+        self.assertEqual(2, self.channel.reads)
+
+    def test_static_values_cached(self):
+        self.obj.enable_cache()
+        self.assertEqual(1, self.obj.sn)
+        self.assertEqual(1, self.obj.sn)
+        self.assertEqual(1, self.channel.reads)
+        self.obj.Vbus
+        self.obj.Vbus
+        self.assertEqual(3, self.channel.reads)
+
+    def test_write_invalidates(self):
+        self.obj.enable_cache()
+        self.assertEqual(1 * _reg("ohm"), self.obj.motor.R)
+        self.obj.motor.R = 2
+        self.assertEqual(2 * _reg("ohm"), self.obj.motor.R)
+        self.assertEqual(2, self.channel.reads)
+
+    def test_dynamic_ttl(self):
+        self.obj.enable_cache(ttl=0.05)
+        self.obj.Vbus
+        self.obj.Vbus
+        self.assertEqual(1, self.channel.reads)
+        time.sleep(0.06)
+        self.obj.Vbus
+        self.assertEqual(2, self.channel.reads)
+
+    def test_reload_data_clears(self):
+        self.obj.enable_cache()
+        self.obj.sn
+        self.obj.reset()
+        self.obj.sn
+        self.assertEqual(2, self.channel.reads)
+
+    def test_batch_read_uses_cache(self):
+        self.obj.enable_cache()
+        self.obj.sn
+        values = self.obj.read_many(["sn", "motor.R", "Vbus"])
+        self.assertEqual([1, 1 * _reg("ohm"), 1 * _reg("volt")], values)
+        self.assertEqual(3, self.channel.reads)
+        self.obj.read_many(["sn", "motor.R", "Vbus"])
+        self.assertEqual(4, self.channel.reads)
+
+    def test_disable_and_pickle(self):
+        self.obj.enable_cache()
+        self.obj.sn
+        self.assertNotIn("value_cache", self.obj.__getstate__())
+        self.obj.disable_cache()
+        self.assertIsNone(self.obj.value_cache)
+        self.obj.sn
+        self.assertEqual(2, self.channel.reads)
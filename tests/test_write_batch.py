@@ -0,0 +1,89 @@
+import importlib.resources
+import unittest
+
+import yaml
+
+from avlos.channel import BaseChannel
+from avlos.deserializer import deserialize
+from avlos.unit_field import get_registry
+from tests.dummy_channel import ListCodec
+
+
+class BurstChannel(BaseChannel):
+    """
+    Channel holding the last value written to each endpoint,
+    that records every send operation
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.sends = []
+
+    def send(self, data, ep_id):
+        self.sends.append([(data, ep_id)])
+        if data:
+            self.values[ep_id] = data
+
+    def send_many(self, requests):
+        requests = list(requests)
+        self.sends.append(requests)
+        for data, ep_id in requests:
+            if data:
+                self.values[ep_id] = data
+
+    def recv(self, ep_id, timeout=0.1):
+        return self.values.get(ep_id, [0])
+
+    @property
+    def serializer(self):
+        return ListCodec()
+
+
+class TestWriteBatch(unittest.TestCase):
+    def setUp(self):
+        def_path_str = str(importlib.resources.files("tests").joinpath("definition/good_device.yaml"))
+        with open(def_path_str) as device_description:
+            self.obj = deserialize(yaml.safe_load(device_description))
+        self.channel = BurstChannel()
+        self.obj._channel = self.channel
+        self.r = self.obj.motor.remote_attributes["R"]
+        self.inductance = self.obj.motor.remote_attributes["L"]
+
+    def test_coalesced_burst(self):
+        with self.obj.batch() as batch:
+            self.obj.motor.R = 1
+            self.obj.motor.L = 2
+            self.obj.motor.R = 3
+            self.assertEqual([], self.channel.sends)
+            self.assertEqual(2, len(batch))
+        self.assertEqual([[([2], self.inductance.ep_id), ([3], self.r.ep_id)]], self.channel.sends)
+        self.assertIsNone(self.obj.write_batch)
+
+    def test_flush_before_read(self):
+        with self.obj.batch():
+            self.obj.motor.R = 1
+            self.assertEqual(1 * get_registry()("ohm"), self.obj.motor.R)
+            self.obj.motor.R = 2
+        self.assertEqual([[([1], self.r.ep_id)], [([], self.r.ep_id)], [([2], self.r.ep_id)]], self.channel.sends)
+
+    def test_flush_before_call(self):
+        with self.obj.batch():
+            self.obj.motor.R = 1
+            self.obj.reset()
+        self.assertEqual([[([1], self.r.ep_id)], [([], self.obj.remote_attributes["reset"].ep_id)]], self.channel.sends)
+
+    def test_nested(self):
+        with self.obj.batch() as outer:
+            with self.obj.motor.root.batch() as inner:
+                self.obj.motor.R = 1
+            self.assertIs(outer, inner)
+            self.assertEqual([], self.channel.sends)
+        self.assertEqual(1, len(self.channel.sends))
+
+    def test_discarded_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.obj.batch():
+                self.obj.motor.R = 1
+                raise RuntimeError
+        self.assertEqual([], self.channel.sends)
+        self.assertIsNone(self.obj.write_batch)